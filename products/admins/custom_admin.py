@@ -2,8 +2,8 @@ from typing import Optional
 from urllib.parse import parse_qs
 from django.core.exceptions import FieldError
 from django.contrib.admin import AdminSite
-from django.contrib.sites.models import Site
 from products.constants import IGNORED_MODELS
+from products.utils.sites import all_sites
 
 
 __all__ = ["SiteAwareAdminSite"]
@@ -65,7 +65,7 @@ class SiteAwareAdminSite(AdminSite):
             request.session["current_site_id"] = site_id
 
         context["current_site_id"] = request.session.get("current_site_id")
-        context["site_list"] = Site.objects.all().order_by("id")
+        context["site_list"] = all_sites()
         context["admin_ns"] = self.name
         return context
 
@@ -3,11 +3,10 @@ from django.utils.html import format_html
 from django.http import JsonResponse, HttpResponseNotAllowed
 from django.shortcuts import get_object_or_404
 from django.urls import path
-from django.core.files.storage import default_storage
 
 from products.forms import PollForm
 from products.models import Poll, PollOption
-from products.utils.images import save_upload_as_webp
+from products.utils.images import delete_stored_file, save_upload_as_webp
 
 
 class PollOptionInline(admin.TabularInline):
@@ -70,10 +69,7 @@ class PollAdmin(admin.ModelAdmin):
             poll.save(update_fields=["image"])
 
             if old and old != name:
-                try:
-                    default_storage.delete(old)
-                except Exception:
-                    pass
+                delete_stored_file(old)
 
             return JsonResponse({"success": True, "url": getattr(poll.image, "url", "")})
         except Exception as e:
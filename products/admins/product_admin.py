@@ -2,7 +2,6 @@ from typing import cast
 from urllib.parse import parse_qs
 
 from django.contrib import admin
-from django.contrib.sites.models import Site
 from django.db import transaction
 from django.forms.models import model_to_dict
 from django.http import JsonResponse
@@ -17,6 +16,7 @@ from products.forms import ProductForm
 from products.models import Product, Category, FAQ, Poll, PollOption
 from products.utils.images import save_upload_as_webp
 from products.utils.slug import unique_slug
+from products.utils.sites import get_site_by_id, first_site, default_site
 from products.constants import PRODUCT_DUPLICATE_EXCLUDE_FIELDS
 from .product_fieldsets import PRODUCT_FIELDSETS
 from .product_inlines import FAQInline, PollInline
@@ -142,7 +142,7 @@ class ProductAdmin(AjaxAdminMixin, admin.ModelAdmin):
         obj = cast(Product, obj)
         if not change:
             sid = self._current_site_id(request)
-            obj.site = Site.objects.get(id=sid) if sid else Site.objects.first()
+            obj.site = get_site_by_id(sid) if sid else first_site()
 
         if "is_active_toggle" in request.POST:
             obj.is_active = "is_active" in request.POST
@@ -193,7 +193,7 @@ class ProductAdmin(AjaxAdminMixin, admin.ModelAdmin):
         return queryset, use_distinct
 
     def get_products(self, request, product_type):
-        current_site_id = self._current_site_id(request) or Site.objects.get_current().id
+        current_site_id = self._current_site_id(request) or default_site().id
         data = [{"id": p.id, "title": p.title} for p in
                 Product.objects.filter(type=product_type, site_id=current_site_id)]
         return JsonResponse(data, safe=False)
@@ -202,7 +202,7 @@ class ProductAdmin(AjaxAdminMixin, admin.ModelAdmin):
         term = request.GET.get("term", "")
         product_type = request.GET.get("type")
         selected_ids = request.GET.getlist("selected[]")
-        current_site_id = self._current_site_id(request) or Site.objects.get_current().id
+        current_site_id = self._current_site_id(request) or default_site().id
 
         qs = Product.objects.filter(site_id=current_site_id)
         if product_type:
@@ -253,7 +253,11 @@ class ProductAdmin(AjaxAdminMixin, admin.ModelAdmin):
             return self._err("Both fields required", status=400)
 
         if pk:
-            FAQ.objects.filter(pk=pk).update(question=q, answer=a)
+            # save(), а не update(): сигналы сбрасывают кэш API
+            faq = FAQ.objects.filter(pk=pk).first()
+            if faq:
+                faq.question, faq.answer = q, a
+                faq.save(update_fields=["question", "answer"])
             return self._ok(id=pk)
 
         product_id = request.GET.get("product_id")
@@ -41,5 +41,6 @@ def build_product_admin_urls(admin_view, views):
         path("parse-steam/", admin_view(steam_parser.parse_steam_view), name="products_product_parse_steam"),
         path("parse-steam/start/", admin_view(steam_parser.parse_steam_start), name="products_product_parse_steam_start"),
         path("parse-steam/status/<str:job_id>/", admin_view(steam_parser.parse_steam_status), name="products_product_parse_steam_status"),
+        path("parse-steam/events/<str:job_id>/", admin_view(steam_parser.parse_steam_events), name="products_product_parse_steam_events"),
         path("parse-steam/cancel/<str:job_id>/", admin_view(steam_parser.parse_steam_cancel), name="products_product_parse_steam_cancel"),
     ]
@@ -1,6 +1,5 @@
 from django import forms
 from django.contrib import admin
-from django.core.files.storage import default_storage
 from django.db import models
 from django.db.models.fields.files import FieldFile
 from django.forms.models import BaseInlineFormSet
@@ -9,7 +8,7 @@ from django.utils.html import format_html
 
 from products.forms import FAQInlineForm, PollForm
 from products.models import FAQ, Poll
-from products.utils.images import save_upload_as_webp
+from products.utils.images import delete_stored_file, save_upload_as_webp
 
 
 class FAQInline(admin.TabularInline):
@@ -61,10 +60,7 @@ class PollInlineFormSet(BaseInlineFormSet):
             obj.image = name
 
         if old_name and old_name != getattr(getattr(obj, "image", None), "name", None):
-            try:
-                default_storage.delete(old_name)
-            except Exception:
-                pass
+            delete_stored_file(old_name)
         return True
 
     def save_new(self, form, commit=True):
@@ -0,0 +1,95 @@
+import hashlib
+
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from products.services import api_cache
+from products.utils.sites import current_site
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.md5("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+    return f'W/"{digest}"'
+
+
+class SiteCachedResponseMixin:
+    """
+    Кэширует ответы GET по (site, path, нормализованные query-параметры).
+    Ключ включает версию сайта, которую сбрасывают сигналы (products/signals.py),
+    поэтому при попадании в кэш ORM не трогаем вообще.
+
+    Плюс conditional GET: get_validators() даёт (etag, last_modified) одним
+    индексным запросом; совпавший If-None-Match/If-Modified-Since → 304 без сериализации.
+    Валидаторы хранятся рядом с закэшированным ответом.
+    """
+
+    def get_cache_site_id(self, request):
+        return current_site(request).id
+
+    def get_cache_variant(self, request) -> str:
+        renderer = getattr(request, "accepted_renderer", None)
+        return getattr(renderer, "format", "")
+
+    def get_validators(self, request):
+        """(etag, last_modified: datetime | None) или None — вью решает, как их посчитать."""
+        return None
+
+    def representation_tag(self, request) -> str:
+        """Часть ETag, различающая представления одного ресурса (?fields=, формат…)."""
+        return f"{self.get_cache_variant(request)}|{request.path}?{api_cache.normalized_query(request)}"
+
+    @staticmethod
+    def _not_modified(request, validators):
+        if not validators:
+            return None
+        etag, last_modified = validators
+        return get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=int(last_modified.timestamp()) if last_modified else None,
+        )
+
+    @staticmethod
+    def _with_validators(response, validators):
+        if validators:
+            etag, last_modified = validators
+            if etag:
+                response.headers["ETag"] = etag
+            if last_modified:
+                response.headers["Last-Modified"] = http_date(last_modified.timestamp())
+        return response
+
+    def get(self, request, *args, **kwargs):
+        key = None
+        if api_cache.timeout():
+            key = api_cache.response_key(
+                request, self.get_cache_site_id(request), variant=self.get_cache_variant(request),
+            )
+            cached = api_cache.get_response(key)
+            if cached is not None:
+                kind, payload, validators = cached
+                response = self._not_modified(request, validators)
+                if response is None:
+                    if kind == "raw":
+                        response = HttpResponse(payload, content_type="application/json")
+                    else:
+                        response = Response(payload)
+                return self._with_validators(response, validators)
+
+        validators = self.get_validators(request)
+        response = self._not_modified(request, validators)
+        if response is not None:
+            return self._with_validators(response, validators)
+
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == 200:
+            self._with_validators(response, validators)
+            if key:
+                if isinstance(response, Response):
+                    api_cache.set_response(key, ("data", response.data, validators))
+                else:
+                    # уже готовые JSON-байты (например, склеенные карточки продуктов)
+                    api_cache.set_response(key, ("raw", response.content, validators))
+        return response
@@ -0,0 +1,47 @@
+from rest_framework.exceptions import ValidationError
+
+from .querysets import serializer_field_names
+
+
+class SparseFieldsetViewMixin:
+    """
+    ?fields=a,b,c — отдать только эти поля; ?omit=a,b — все, кроме этих.
+    Набор полей уходит и в сериалайзер (SparseFieldsetMixin), и в QueryPlan:
+    незапрошенные колонки не выбираются, незапрошенные связи не префетчатся.
+    """
+
+    fields_query_param = "fields"
+    omit_query_param = "omit"
+
+    @staticmethod
+    def _split(raw: str | None) -> list[str]:
+        return [name.strip() for name in (raw or "").split(",") if name.strip()]
+
+    def get_sparse_fields(self) -> frozenset | None:
+        if hasattr(self, "_sparse_fields"):
+            return self._sparse_fields
+
+        params = self.request.query_params
+        requested = self._split(params.get(self.fields_query_param))
+        omitted = self._split(params.get(self.omit_query_param))
+        if not requested and not omitted:
+            self._sparse_fields = None
+            return None
+
+        available = serializer_field_names(self.get_serializer_class())
+        unknown = sorted(set(requested + omitted) - set(available))
+        if unknown:
+            raise ValidationError({"fields": [f"Unknown field(s): {', '.join(unknown)}"]})
+
+        selected = set(requested) if requested else set(available)
+        self._sparse_fields = frozenset(selected - set(omitted))
+        return self._sparse_fields
+
+    def get_query_fields(self):
+        """Поля для QueryPlan; вью может добавить служебные (например, поля сортировки)."""
+        return self.get_sparse_fields()
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["fields"] = self.get_sparse_fields()
+        return context
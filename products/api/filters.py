@@ -0,0 +1,32 @@
+from rest_framework import filters
+
+from products.services import search
+
+
+class ProductSearchFilter(filters.SearchFilter):
+    """
+    ?search= через полнотекстовый индекс (products/services/search.py) с ранжированием.
+    Если индекс недоступен на текущей БД — стандартный icontains по search_fields.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        searched = search.apply(queryset, " ".join(terms))
+        if searched is None:
+            return super().filter_queryset(request, queryset, view)
+        return searched
+
+
+class ProductOrderingFilter(filters.OrderingFilter):
+    """Без явного ?ordering= результаты поиска сортируются по релевантности."""
+
+    rank_field = "search_rank"
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        explicit = request.query_params.get(self.ordering_param)
+        if not explicit and self.rank_field in queryset.query.annotations:
+            return [f"-{self.rank_field}", *(ordering or [])]
+        return ordering
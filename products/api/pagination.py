@@ -0,0 +1,186 @@
+import base64
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param, remove_query_param
+
+from products.services import api_cache
+from products.utils.sites import current_site
+
+
+class ProductKeysetPagination(BasePagination):
+    """
+    Keyset (cursor) пагинация: WHERE (field, id) > (value, last_id) вместо OFFSET
+    и без COUNT(*). Страница стоит одинаково на любой глубине.
+    Курсор — base64(JSON) с позицией последнего (или первого) элемента страницы.
+    """
+
+    cursor_query_param = "cursor"
+    mode_query_param = "pagination"
+    page_size_query_param = "page_size"
+    total_query_param = "with_total"
+    ordering_query_param = "ordering"
+    max_page_size = 100
+    tiebreaker = "id"
+    invalid_cursor_message = "Invalid cursor"
+    ranked_search_message = (
+        "?search= без ?ordering= сортируется по релевантности, а курсор её не держит: "
+        "передайте ?ordering= или используйте постраничную пагинацию"
+    )
+
+    # параметры, не влияющие на набор строк (исключаются из ключа приблизительного total)
+    non_filter_params = ("cursor", "pagination", "page_size", "with_total", "ordering", "page")
+
+    @classmethod
+    def is_requested(cls, request) -> bool:
+        params = request.query_params
+        return cls.cursor_query_param in params or params.get(cls.mode_query_param) == "cursor"
+
+    # ───────── cursor encoding ─────────
+    @staticmethod
+    def _encode(position: dict) -> str:
+        raw = json.dumps(position, separators=(",", ":"), default=str)
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+    def _decode(self, encoded: str) -> dict | None:
+        if not encoded:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            if not isinstance(position, dict) or "id" not in position:
+                raise ValueError
+            return position
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    # ───────── ordering ─────────
+    def get_ordering(self, request, view) -> tuple[str, bool]:
+        """(поле, по убыванию?) — первое допустимое поле из ?ordering= или ordering вью."""
+        allowed = set(getattr(view, "ordering_fields", None) or [])
+        requested = request.query_params.get(self.ordering_query_param, "")
+        for term in [t.strip() for t in requested.split(",") if t.strip()]:
+            if term.lstrip("-") in allowed:
+                return term.lstrip("-"), term.startswith("-")
+        default = (getattr(view, "ordering", None) or ["-id"])[0]
+        return default.lstrip("-"), default.startswith("-")
+
+    def get_page_size(self, request) -> int:
+        page_size = api_settings.PAGE_SIZE
+        raw = request.query_params.get(self.page_size_query_param)
+        if raw and raw.isdigit() and int(raw) > 0:
+            page_size = min(int(raw), self.max_page_size)
+        return page_size
+
+    @staticmethod
+    def _value(item, name):
+        return item[name] if isinstance(item, dict) else getattr(item, name)
+
+    def _position_of(self, item, reverse: bool) -> dict:
+        value = self._value(item, self.field)
+        return {
+            "v": value.isoformat() if hasattr(value, "isoformat") else value,
+            "id": self._value(item, self.tiebreaker),
+            "r": int(reverse),
+        }
+
+    def _after(self, position, descending: bool) -> Q:
+        model_field = self.queryset_model._meta.get_field(self.field)
+        value = model_field.to_python(position.get("v"))
+        op = "lt" if descending else "gt"
+        return (
+            Q(**{f"{self.field}__{op}": value})
+            | Q(**{self.field: value, f"{self.tiebreaker}__{op}": position["id"]})
+        )
+
+    # ───────── BasePagination API ─────────
+    def paginate_queryset(self, queryset, request, view=None):
+        # курсор — позиция в (field, id); ранг поиска (ProductOrderingFilter) так не выразить,
+        # и молча подменить порядок значило бы отдать результаты поиска без ранжирования
+        params = request.query_params
+        if params.get(api_settings.SEARCH_PARAM) and not params.get(self.ordering_query_param):
+            raise ValidationError({self.mode_query_param: [self.ranked_search_message]})
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.field, self.descending = self.get_ordering(request, view)
+        self.queryset_model = queryset.model
+
+        position = self._decode(request.query_params.get(self.cursor_query_param))
+        self.reverse = bool(position and position.get("r"))
+
+        self.total = None
+        if request.query_params.get(self.total_query_param) in ("1", "true", "yes"):
+            self.total = self.approximate_total(queryset, request)
+
+        # при движении назад идём в обратном порядке и разворачиваем результат
+        descending = self.descending != self.reverse
+        prefix = "-" if descending else ""
+        qs = queryset.order_by(f"{prefix}{self.field}", f"{prefix}{self.tiebreaker}")
+        if position:
+            qs = qs.filter(self._after(position, descending))
+
+        rows = list(qs[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if self.reverse:
+            rows.reverse()
+
+        self.has_next = has_more if not self.reverse else True
+        self.has_previous = bool(position) if not self.reverse else has_more
+        self.page = rows
+        return rows
+
+    def approximate_total(self, queryset, request) -> int:
+        """
+        Приблизительный total: COUNT(*) кэшируется на сайт + комбинацию фильтров
+        и живёт API_APPROX_COUNT_TIMEOUT секунд, независимо от курсора.
+        """
+        params = {
+            key: request.query_params.getlist(key)
+            for key in request.query_params.keys()
+            if key not in self.non_filter_params
+        }
+        return api_cache.approx_count(
+            queryset, site_id=current_site(request).id, params=params,
+        )
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        cursor = self._encode(self._position_of(self.page[-1], reverse=False))
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, cursor)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        url = self.request.build_absolute_uri()
+        if not self.page:
+            return remove_query_param(url, self.cursor_query_param)
+        cursor = self._encode(self._position_of(self.page[0], reverse=True))
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        payload = {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+        }
+        if self.total is not None:
+            payload["count"] = self.total
+        payload["results"] = data
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "count": {"type": "integer"},
+                "results": schema,
+            },
+        }
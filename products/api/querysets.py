@@ -0,0 +1,126 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+from products.models import Product
+from .serializers import ProductListSerializer, ProductDetailSerializer, BestProductMiniSerializer
+
+DISPLAY_SOURCE_RE = re.compile(r"get_(\w+)_display")
+
+
+@dataclass(frozen=True)
+class QueryPlan:
+    """
+    Что сериалайзер реально читает из БД:
+      only — собственные колонки (и колонки select_related-моделей через «__»),
+      select_related — FK, сериализуемые вложенно,
+      prefetch — (lookup, model, QueryPlan) для many-связей.
+    """
+    only: tuple[str, ...]
+    select_related: tuple[str, ...]
+    prefetch: tuple[tuple, ...]
+
+    def apply(self, queryset):
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch:
+            queryset = queryset.prefetch_related(*(
+                Prefetch(lookup, queryset=plan.apply(model._default_manager.all()))
+                for lookup, model, plan in self.prefetch
+            ))
+        return queryset.only(*self.only)
+
+
+def _model_field(model, name):
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+
+
+@lru_cache(maxsize=None)
+def query_plan(serializer_class, fields: frozenset | None = None) -> QueryPlan:
+    """
+    Выводит QueryPlan из полей сериалайзера. Для SerializerMethodField источники
+    берутся из Meta.method_field_sources ({"logo": ("logo_file", "logo_url")});
+    «fk__колонка» у вложенного many-сериалайзера — колонка родителя.
+    fields — подмножество полей верхнего уровня (None — все).
+    """
+    serializer = serializer_class()
+    model = serializer.Meta.model
+    hints = getattr(serializer.Meta, "method_field_sources", {})
+
+    only = {model._meta.pk.name}
+    select_related = []
+    prefetch = []
+
+    for name, field in serializer.fields.items():
+        if fields is not None and name not in fields:
+            continue
+
+        if isinstance(field, serializers.SerializerMethodField):
+            only.update(hints.get(name, ()))
+            continue
+
+        source = field.source.split(".")[0]
+        match = DISPLAY_SOURCE_RE.fullmatch(source)
+        if match:
+            source = match.group(1)
+        model_field = _model_field(model, source)
+        if model_field is None:
+            continue
+
+        if isinstance(field, serializers.ListSerializer):
+            sub = query_plan(type(field.child))
+            if model_field.one_to_many:
+                # FK обратно на родителя — иначе Django догрузит его отдельным запросом на строку.
+                # Колонки родителя, которые читает ребёнок («product__polls_title»), — в only родителя:
+                # prefetch подставляет ребёнку уже загруженный экземпляр родителя
+                parent = f"{model_field.field.name}__"
+                only.update(n.removeprefix(parent) for n in sub.only if n.startswith(parent))
+                sub = QueryPlan(
+                    tuple(n for n in sub.only if not n.startswith(parent)) + (model_field.field.name,),
+                    sub.select_related, sub.prefetch,
+                )
+            prefetch.append((source, model_field.related_model, sub))
+        elif isinstance(field, serializers.BaseSerializer):
+            sub = query_plan(type(field))
+            only.add(source)
+            only.update(f"{source}__{n}" for n in sub.only)
+            select_related.append(source)
+            select_related.extend(f"{source}__{n}" for n in sub.select_related)
+        elif model_field.concrete:
+            only.add(source)
+
+    return QueryPlan(tuple(sorted(only)), tuple(select_related), tuple(prefetch))
+
+
+@lru_cache(maxsize=None)
+def serializer_field_names(serializer_class) -> tuple[str, ...]:
+    return tuple(serializer_class().fields.keys())
+
+
+# Профили выборки продуктов: по одному на сериалайзер
+PRODUCT_QUERY_PROFILES = {
+    "list": ProductListSerializer,
+    "detail": ProductDetailSerializer,
+    "mini": BestProductMiniSerializer,
+}
+
+# Сколько SQL-запросов допустимо на эндпоинт (products/tests/test_query_budgets.py)
+QUERY_BUDGETS = {
+    "list": 3,  # ETag + COUNT + страница
+    "list_cursor": 2,  # ETag + страница
+    "detail": 6,  # ETag + продукт + faqs + polls + options + best_products
+    "batch": 6,  # то же, что detail, на любое число продуктов
+    "batch_polls": 4,  # ?fields=polls: ETag + продукты + polls + options
+}
+
+
+def product_queryset(profile: str, fields=None):
+    plan = query_plan(PRODUCT_QUERY_PROFILES[profile], frozenset(fields) if fields is not None else None)
+    return plan.apply(Product.objects.filter(is_active=True))
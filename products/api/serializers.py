@@ -5,6 +5,18 @@ from products.models import (
     Product, Category, Author, FAQ, Poll, PollOption, Comment
 )
 
+class SparseFieldsetMixin:
+    """context["fields"] — набор полей верхнего уровня, которые нужно отдать (None — все)."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = self.context.get("fields")
+        if selected is not None:
+            for name in list(self.fields):
+                if name not in selected:
+                    self.fields.pop(name)
+
+
 class CategorySerializer(serializers.ModelSerializer):
     type_display = serializers.CharField(source="get_type_display", read_only=True)
 
@@ -39,6 +51,8 @@ class PollSerializer(serializers.ModelSerializer):
     class Meta:
         model = Poll
         fields = ["id", "title", "question", "image", "options"]
+        # polls_title — колонка родителя: query_plan добавит её в only продукта
+        method_field_sources = {"title": ("product__polls_title",), "image": ("image",)}
 
     def get_title(self, obj):
         return getattr(obj.product, "polls_title", "") or ""
@@ -57,6 +71,7 @@ class BestProductMiniSerializer(serializers.ModelSerializer):
     class Meta:
         model = Product
         fields = ["id", "title", "slug", "type", "logo"]
+        method_field_sources = {"logo": ("logo_file", "logo_url")}
 
     def get_logo(self, obj):
         return obj.get_logo()
@@ -77,7 +92,7 @@ class CommentSerializer(serializers.ModelSerializer):
         read_only_fields = ['status', 'created_at']
 
 
-class ProductListSerializer(serializers.ModelSerializer):
+class ProductListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     logo = serializers.SerializerMethodField()
     category = CategorySerializer(read_only=True)
     author = AuthorSerializer(read_only=True)
@@ -91,12 +106,13 @@ class ProductListSerializer(serializers.ModelSerializer):
             "rating", "rating_1", "rating_2", "rating_3", "rating_4",
             "created_at", "is_active",
         ]
+        method_field_sources = {"logo": ("logo_file", "logo_url")}
 
     def get_logo(self, obj):
         return obj.get_logo()
 
 
-class ProductDetailSerializer(serializers.ModelSerializer):
+class ProductDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
     author = AuthorSerializer(read_only=True)
     faqs = FAQSerializer(many=True, read_only=True)
@@ -126,6 +142,11 @@ class ProductDetailSerializer(serializers.ModelSerializer):
             "polls_title",
             "faqs", "polls", "best_products",
         ]
+        method_field_sources = {
+            "logo": ("logo_file", "logo_url"),
+            "pros_list": ("pros",),
+            "cons_list": ("cons",),
+        }
 
     def get_logo(self, obj):
         request = self.context.get("request")
@@ -1,26 +1,32 @@
-from rest_framework import generics, filters
+from django.conf import settings
+from django.db.models import Q, Max, Count
+from django.http import HttpResponse
+from rest_framework import generics
+from rest_framework.renderers import JSONRenderer
 from rest_framework.decorators import api_view
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.reverse import reverse
 from django_filters.rest_framework import DjangoFilterBackend, FilterSet, NumberFilter, CharFilter
-from django.contrib.sites.shortcuts import get_current_site  # ✅
 
 from products.models import Product, Comment
 from .serializers import (
     ProductListSerializer, ProductDetailSerializer, CommentSerializer
 )
-from products.utils.sites import resolve_site_by_host
-
-
-def get_queryset(self):
-    site = resolve_site_by_host(self.request)
-    return product_base_qs().filter(site=site).only(*PRODUCT_LIST_ONLY)
+from products.utils.sites import current_site
+from products.services import product_cards
+from .cache_mixins import SiteCachedResponseMixin, make_etag
+from .pagination import ProductKeysetPagination
+from .filters import ProductSearchFilter, ProductOrderingFilter
+from .querysets import product_queryset
+from .fieldsets import SparseFieldsetViewMixin
 
 
 @api_view(['GET'])
 def api_root(request, format=None):
     return Response({
         'products': reverse('api_Product_list', request=request, format=format),
+        'products_batch': reverse('api_Product_batch', request=request, format=format),
         'comments': reverse('api_comment_create', request=request, format=format),
     })
 
@@ -29,7 +35,7 @@ def api_root(request, format=None):
 # Фильтры для списка продуктов
 # ────────────────────────────────
 class ProductFilter(FilterSet):
-    type = CharFilter(field_name="type", lookup_expr="iexact")
+    type = CharFilter(method="filter_type")
     category = NumberFilter(field_name="category_id", lookup_expr="exact")
     rating_min = NumberFilter(field_name="rating", lookup_expr="gte")
     rating_max = NumberFilter(field_name="rating", lookup_expr="lte")
@@ -38,51 +44,141 @@ class ProductFilter(FilterSet):
         model = Product
         fields = ["type", "category", "is_active"]
 
+    def filter_type(self, queryset, name, value):
+        # типы хранятся в нижнем регистре: exact вместо iexact, чтобы работал индекс
+        return queryset.filter(type=value.lower())
 
-# Базовый оптимизированный queryset
-def product_base_qs():
-    return (
-        Product.objects.filter(is_active=True)
-        .select_related("category", "author")
-        .prefetch_related("faqs", "polls__options", "best_products")
-    )
 
-PRODUCT_LIST_ONLY = [
-    # собственные поля
-    "id", "title", "slug", "type", "created_at", "is_active",
-    "rating", "rating_1", "rating_2", "rating_3", "rating_4",
-    "logo_file", "logo_url",
+def site_catalog_validators(view, request):
+    """ETag набора продуктов сайта: max(updated_at) + count (count ловит удаления)."""
+    state = Product.objects.filter(site=current_site(request)).aggregate(
+        last=Max("updated_at"), total=Count("id"),
+    )
+    return make_etag(view.representation_tag(request), state["last"], state["total"]), None
 
-    # FK сами по себе тоже нужны при .only + select_related
-    "category", "author",
 
-    # поля связанных моделей, которые сериалайзер читает
-    "category__id", "category__name", "category__type",
-    "author__id", "author__name",
-]
+# Базовый оптимизированный queryset (детальный профиль)
+def product_base_qs(fields=None):
+    return product_queryset("detail", fields=fields)
 
 
-class ProductListAPIView(generics.ListAPIView):
+class ProductListAPIView(SiteCachedResponseMixin, SparseFieldsetViewMixin, generics.ListAPIView):
     serializer_class = ProductListSerializer
 
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, ProductSearchFilter, ProductOrderingFilter]
     filterset_class = ProductFilter
     search_fields = ["title", "review_headline", "seo_title", "seo_description"]
     ordering_fields = ["created_at", "rating", "title"]
     ordering = ["-created_at"]
 
     def get_queryset(self):
-        current_site = get_current_site(self.request)
-        return product_base_qs().filter(site=current_site).only(*PRODUCT_LIST_ONLY)
+        return product_queryset("list", fields=self.get_query_fields()).filter(site=current_site(self.request))
+
+    def get_query_fields(self):
+        fields = self.get_sparse_fields()
+        # поля сортировки нужны keyset-курсору, даже если их не просили в ответе
+        return fields | set(self.ordering_fields) if fields is not None else None
+
+    def get_validators(self, request):
+        return site_catalog_validators(self, request)
+
+    def list(self, request, *args, **kwargs):
+        # JSON-клиентам отдаём склеенные готовые карточки (ProductCard) без моделей и сериалайзера;
+        # карточка — это полный набор полей, поэтому ?fields=/?omit= идут обычным путём
+        if not isinstance(request.accepted_renderer, JSONRenderer) or self.get_sparse_fields() is not None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = queryset.values(*product_cards.ROW_FIELDS, *self.ordering_fields)
+        page = self.paginate_queryset(rows)
+        if page is None:
+            return HttpResponse(product_cards.render_list({}, product_cards.payloads_for(list(rows))),
+                                content_type="application/json")
+
+        envelope = self.get_paginated_response([]).data
+        body = product_cards.render_list(envelope, product_cards.payloads_for(page))
+        return HttpResponse(body, content_type="application/json")
+
+    @property
+    def paginator(self):
+        # ?cursor=… или ?pagination=cursor → keyset-пагинация без COUNT(*) и OFFSET
+        if not hasattr(self, "_paginator"):
+            if ProductKeysetPagination.is_requested(self.request):
+                self._paginator = ProductKeysetPagination()
+            else:
+                self._paginator = self.pagination_class() if self.pagination_class else None
+        return self._paginator
+
+
+class ProductDetailAPIView(SiteCachedResponseMixin, SparseFieldsetViewMixin, generics.RetrieveAPIView):
+    serializer_class = ProductDetailSerializer
+    lookup_field = "slug"
+
+    def get_queryset(self):
+        return product_base_qs(fields=self.get_query_fields()).filter(site=current_site(self.request))
+
+    def get_validators(self, request):
+        # один запрос по уникальному индексу (slug, site)
+        row = (
+            Product.objects.filter(site=current_site(request), slug=self.kwargs[self.lookup_field], is_active=True)
+            .values_list("id", "updated_at")
+            .first()
+        )
+        if not row:
+            return None
+        product_id, updated_at = row
+        return make_etag(self.representation_tag(request), product_id, updated_at.isoformat()), updated_at
+
+
+MAX_ID = 2 ** 63 - 1  # BigAutoField: больше — ошибка БД (500), а не 400
 
 
-class ProductDetailAPIView(generics.RetrieveAPIView):
+class ProductBatchView(SparseFieldsetViewMixin, generics.GenericAPIView):
+    """
+    /api/products/batch/?slugs=a,b,c (или ?ids=1,2,3) — много продуктов одним набором запросов
+    (те же префетчи, что у детальной страницы). Ответ: {"results": {slug: …}, "missing": […]}.
+    """
     serializer_class = ProductDetailSerializer
-    lookup_field = "slug"
+    pagination_class = None
+
+    @staticmethod
+    def _split(raw):
+        return list(dict.fromkeys(x.strip() for x in (raw or "").split(",") if x.strip()))
+
+    def get_query_fields(self):
+        fields = self.get_sparse_fields()
+        return fields | {"id", "slug"} if fields is not None else None
 
     def get_queryset(self):
-        current_site = get_current_site(self.request)
-        return product_base_qs().filter(site=current_site)
+        return product_base_qs(fields=self.get_query_fields()).filter(site=current_site(self.request))
+
+    def get(self, request, *args, **kwargs):
+        slugs = self._split(request.query_params.get("slugs"))
+        ids = self._split(request.query_params.get("ids"))
+        if not slugs and not ids:
+            raise ValidationError({"slugs": ["Передайте ?slugs=a,b или ?ids=1,2"]})
+        if any(not (x.isascii() and x.isdigit()) or int(x) > MAX_ID for x in ids):
+            raise ValidationError({"ids": [f"ID должны быть целыми числами от 0 до {MAX_ID}"]})
+        max_size = getattr(settings, "PRODUCT_BATCH_MAX_SIZE", 50)
+        if len(slugs) + len(ids) > max_size:
+            raise ValidationError({"slugs": [f"Не больше {max_size} продуктов за запрос"]})
+
+        products = list(self.get_queryset().filter(Q(slug__in=slugs) | Q(id__in=[int(x) for x in ids])))
+        data = self.get_serializer(products, many=True).data
+
+        found_slugs = {p.slug for p in products}
+        found_ids = {str(p.id) for p in products}
+        return Response({
+            "results": {product.slug: item for product, item in zip(products, data)},
+            "missing": [s for s in slugs if s not in found_slugs] + [i for i in ids if i not in found_ids],
+        })
+
+
+class ProductBatchAPIView(SiteCachedResponseMixin, ProductBatchView):
+    """Кэш и conditional GET поверх ProductBatchView.get."""
+
+    def get_validators(self, request):
+        return site_catalog_validators(self, request)
 
 
 class CommentCreateAPIView(generics.CreateAPIView):
@@ -13,6 +13,8 @@ PRODUCT_DUPLICATE_EXCLUDE_FIELDS = [
     "id",
     "slug",
     "site",
+    "steam_id",
+    "steam_payload_hash",
     "created_at",
     "polls",
     "best_products",
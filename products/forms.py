@@ -5,8 +5,7 @@ from .widgets import StarRatingWidget, ScreenshotsWidget
 from django.contrib.admin.widgets import AdminFileWidget
 from django.contrib.admin.widgets import AdminURLFieldWidget
 from tinymce.widgets import TinyMCE
-from products.utils.images import save_upload_as_webp, save_url_as_webp
-from django.core.files.storage import default_storage
+from products.utils.images import delete_stored_file, save_upload_as_webp, save_url_as_webp
 
 
 class CustomFileWidget(AdminFileWidget):
@@ -152,10 +151,7 @@ class ProductForm(forms.ModelForm):
 
     def finalize_logo_cleanup(self):
         if self._delete_old_logo_file and self._old_logo_name:
-            try:
-                default_storage.delete(self._old_logo_name)
-            except Exception:
-                pass
+            delete_stored_file(self._old_logo_name)  # общий webp импорта Steam не удалит
 
     class Media:
         css = {
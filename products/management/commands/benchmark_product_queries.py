@@ -0,0 +1,154 @@
+import random
+import statistics
+import time
+
+from django.contrib.sites.models import Site
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Max, Count
+
+from products.constants import PRODUCT_TYPE_CHOICES
+from products.models import Product, Category
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN и время горячих запросов к продуктам (список, фильтры, импорт Steam) "
+        "на синтетическом каталоге — без индексов Product.Meta.indexes и с ними. "
+        "Всё выполняется в транзакции и откатывается."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=50000, help="Размер каталога на сайт")
+        parser.add_argument("--sites", type=int, default=3)
+        parser.add_argument("--repeat", type=int, default=7, help="Прогонов на запрос (берём медиану)")
+        parser.add_argument("--no-explain", action="store_true", help="Только время, без планов")
+
+    # ────────────────────────────────
+    # Синтетический каталог
+    # ────────────────────────────────
+    def _catalog(self, per_site, site_count):
+        rnd = random.Random(42)
+        types = [value for value, _ in PRODUCT_TYPE_CHOICES]
+        sites = [
+            Site.objects.create(domain=f"bench-{i}.invalid", name=f"Bench {i}") for i in range(site_count)
+        ]
+        categories = Category.objects.bulk_create(
+            Category(name=f"Bench category {i}", slug=f"bench-category-{i}", type=types[i % len(types)])
+            for i in range(30)
+        )
+        for site in sites:
+            Product.objects.bulk_create(
+                (
+                    Product(
+                        site=site,
+                        title=f"Bench product {i}",
+                        slug=f"bench-product-{i}",
+                        steam_id=str(100000 + i),
+                        is_active=rnd.random() < 0.9,
+                        type=rnd.choice(types),
+                        category=rnd.choice(categories),
+                        rating=rnd.randint(1, 5),
+                        review_headline="Headline",
+                    )
+                    for i in range(per_site)
+                ),
+                batch_size=2000,
+            )
+        # bulk_create ставит почти одинаковый created_at — разносим по времени
+        with connection.cursor() as cursor:
+            table = connection.ops.quote_name(Product._meta.db_table)
+            if connection.vendor == "postgresql":
+                cursor.execute(f"UPDATE {table} SET created_at = created_at - (id * interval '1 minute')")
+            elif connection.vendor == "sqlite":
+                cursor.execute(f"UPDATE {table} SET created_at = datetime(created_at, '-' || id || ' minutes')")
+        return sites[len(sites) // 2], categories[0]
+
+    def _queries(self, site, category):
+        active = Product.objects.filter(site=site, is_active=True)
+        boundary = active.order_by("-created_at", "-id").values_list("created_at", "id")[1000]
+        return {
+            "list_newest": lambda: active.order_by("-created_at")[:20],
+            "list_rating": lambda: active.order_by("-rating", "-id")[:20],
+            "list_keyset": lambda: active.filter(created_at__lte=boundary[0]).exclude(
+                created_at=boundary[0], id__gte=boundary[1]
+            ).order_by("-created_at", "-id")[:20],
+            "filter_type": lambda: active.filter(type="movie").order_by("-created_at")[:20],
+            "filter_category": lambda: active.filter(category=category).order_by("-created_at")[:20],
+            "count_type": lambda: [active.filter(type="app").count()],
+            "list_etag": lambda: [Product.objects.filter(site=site).aggregate(Max("updated_at"), Count("id"))],
+        }
+
+    def _constraint_queries(self, site):
+        # Идут по индексам ограничений (UniqueConstraint product_unique_steam_site),
+        # а не Meta.indexes: «до» и «после» у них одинаковые — сравнивать нечего,
+        # поэтому только время и план с индексами.
+        return {
+            "steam_lookup": lambda: Product.objects.filter(steam_id="100777", site=site)[:1],
+        }
+
+    def _analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {connection.ops.quote_name(Product._meta.db_table)}")
+
+    def _run(self, queries, repeat, explain):
+        timings = {}
+        for name, build in queries.items():
+            samples = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                list(build())
+                samples.append((time.perf_counter() - started) * 1000)
+            timings[name] = statistics.median(samples)
+            if explain:
+                queryset = build()
+                plan = queryset.explain() if hasattr(queryset, "explain") else "(агрегат — без EXPLAIN)"
+                self.stdout.write(f"  {name}:")
+                for line in plan.splitlines():
+                    self.stdout.write(f"      {line}")
+        return timings
+
+    def handle(self, *args, **options):
+        indexes = Product._meta.indexes
+        explain = not options["no_explain"]
+        self.stdout.write(f"Бэкенд: {connection.vendor}; каталог {options['products']} × {options['sites']} сайтов")
+
+        try:
+            with transaction.atomic():
+                site, category = self._catalog(options["products"], options["sites"])
+                queries = self._queries(site, category)
+                constraint_queries = self._constraint_queries(site)
+
+                # без `with`: SQLite не даёт входить в schema_editor внутри atomic,
+                # а CREATE/DROP INDEX ему и не нужен
+                editor = connection.schema_editor()
+                editor.deferred_sql = []
+                for index in indexes:
+                    editor.execute(index.remove_sql(Product, editor))
+                self._analyze()
+                self.stdout.write(self.style.MIGRATE_HEADING("Без индексов:"))
+                before = self._run(queries, options["repeat"], explain)
+
+                for index in indexes:
+                    editor.execute(index.create_sql(Product, editor))
+                self._analyze()
+                self.stdout.write(self.style.MIGRATE_HEADING("С индексами:"))
+                after = self._run(queries, options["repeat"], explain)
+
+                self.stdout.write(self.style.MIGRATE_HEADING("По индексам ограничений (не сравниваются):"))
+                constrained = self._run(constraint_queries, options["repeat"], explain)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Медиана, мс:"))
+        self.stdout.write(f"  {'запрос':18} {'до':>9} {'после':>9} {'×':>7}")
+        for name in queries:
+            speedup = before[name] / after[name] if after[name] else float("inf")
+            self.stdout.write(f"  {name:18} {before[name]:9.2f} {after[name]:9.2f} {speedup:7.1f}")
+        for name, timing in constrained.items():
+            self.stdout.write(f"  {name:18} {'—':>9} {timing:9.2f} {'—':>7}  (UniqueConstraint, не удаляется)")
@@ -0,0 +1,144 @@
+import json
+import statistics
+import tempfile
+import time
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.sites.models import Site
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import override_settings
+
+from products.models import BackgroundTask, Product
+from products.services import steam_client, steam_fake, tasks
+from products.utils import sites
+
+
+class Command(BaseCommand):
+    help = (
+        "Бенчмарк импорта из Steam без сети: поднимает fake_steam_server на корпусе, прогоняет "
+        "import_steam (fetch → transform → persist, по желанию и конвертацию картинок) на временном "
+        "сайте в транзакции, которая откатывается, и печатает ID/с. Для CI — --json и --fail-under."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--corpus", help="Каталог корпуса; без него — синтетический во временном каталоге")
+        parser.add_argument("--count", type=int, default=500, help="Размер синтетического корпуса")
+        parser.add_argument("--limit", type=int, help="Импортировать не больше N appid из корпуса")
+        parser.add_argument("--repeat", type=int, default=1, help="Прогонов; итог — медиана")
+        parser.add_argument("--latency", type=float, default=20.0, help="Задержка фейкового Steam, мс")
+        parser.add_argument("--error-rate", type=float, default=0.0)
+        parser.add_argument("--throttle-rate", type=float, default=0.0)
+        parser.add_argument("--rate", type=float, default=1000.0, help="STEAM_RATE_LIMIT на время прогона, запросов/с")
+        parser.add_argument("--workers", type=int)
+        parser.add_argument("--processes", type=int, default=0)
+        parser.add_argument("--batch-size", type=int)
+        parser.add_argument("--images", action="store_true", help="Ещё и сконвертировать картинки (задачи convert_assets)")
+        parser.add_argument("--json", action="store_true", help="Итог одной строкой JSON")
+        parser.add_argument("--fail-under", type=float, metavar="IDS_PER_SEC", help="Код выхода 1, если медиана ниже")
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory(prefix="steam-bench-") as tmp:
+            tmp = Path(tmp)
+            corpus = Path(options["corpus"]) if options["corpus"] else tmp / "corpus"
+            if not options["corpus"]:
+                steam_fake.generate_corpus(corpus, options["count"])
+            elif not (corpus / "appdetails").is_dir():
+                raise CommandError(f"Нет корпуса в {corpus}")
+
+            server = steam_fake.FakeSteamServer(
+                corpus,
+                latency=options["latency"] / 1000,
+                error_rate=options["error_rate"],
+                throttle_rate=options["throttle_rate"],
+            )
+            appids = sorted(server.corpus.appdetails)[:options["limit"] or None]
+            if not appids:
+                raise CommandError("Корпус пуст")
+            ids_file = tmp / "ids.txt"
+            ids_file.write_text("\n".join(map(str, appids)), encoding="utf-8")
+
+            runs = []
+            with server:
+                for run in range(max(1, options["repeat"])):
+                    with override_settings(
+                        **server.settings(),
+                        STEAM_APPDETAILS_CACHE_DIR=str(tmp / f"appdetails-{run}"),  # каждый прогон — холодный кэш
+                        STEAM_APPDETAILS_OFFLINE=False,
+                        STEAM_RATE_LIMIT=options["rate"],
+                        STEAM_RATE_BURST=max(8, int(options["rate"])),
+                        MEDIA_ROOT=str(tmp / "media"),
+                        # SQLite не даст потокам загрузки писать блокировки, пока открыта транзакция прогона
+                        STEAM_INFLIGHT_DB_LOCKS=connection.vendor != "sqlite",
+                    ):
+                        runs.append(self._run(ids_file, len(appids), tmp / f"checkpoint-{run}", options))
+                    if not options["json"]:
+                        self.stdout.write(self._line(run + 1, runs[-1]))
+                http = server.counters
+
+        rate = statistics.median(r["ids_per_sec"] for r in runs)
+        result = {
+            "ids": len(appids),
+            "repeat": len(runs),
+            "ids_per_sec": round(rate, 1),
+            "runs": runs,
+            "fake_steam": http,
+            "options": {key: options[key] for key in ("latency", "error_rate", "throttle_rate", "workers", "processes", "batch_size", "images")},
+        }
+        if options["json"]:
+            self.stdout.write(json.dumps(result, ensure_ascii=False))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Медиана: {rate:.1f} ID/с ({len(appids)} appid × {len(runs)}) · фейковый Steam: {http}"
+            ))
+        if options["fail_under"] is not None and rate < options["fail_under"]:
+            raise CommandError(f"{rate:.1f} ID/с ниже порога {options['fail_under']}")
+
+    def _line(self, run, r):
+        line = f"Прогон {run}: {r['seconds']:.2f}с · {r['ids_per_sec']:.1f} ID/с · продуктов {r['products']}"
+        if "images_per_sec" in r:
+            line += f" · картинки {r['image_seconds']:.2f}с ({r['images_per_sec']:.1f} продуктов/с)"
+        return line
+
+    def _run(self, ids_file, count, checkpoint, options):
+        args = [str(ids_file), "--restart", "--checkpoint", str(checkpoint), "--processes", str(options["processes"])]
+        if options["workers"]:
+            args += ["--workers", str(options["workers"])]
+        if options["batch_size"]:
+            args += ["--batch-size", str(options["batch_size"])]
+
+        http_baseline = steam_client.stats()
+        result = {}
+        # всё пишется в основном потоке, так что прогон целиком откатывается
+        with transaction.atomic():
+            site = Site.objects.create(domain=f"steam-benchmark-{time.time_ns()}.invalid", name="Steam benchmark")
+            last_task = BackgroundTask.objects.order_by("-id").values_list("id", flat=True).first() or 0
+            output = StringIO()
+            started = time.perf_counter()
+            call_command("import_steam", *args, "--site", str(site.id), stdout=output, stderr=output)
+            seconds = time.perf_counter() - started
+            result.update(
+                seconds=round(seconds, 3),
+                ids_per_sec=round(count / seconds, 1),
+                products=Product.objects.filter(site=site).count(),
+                summary=output.getvalue().strip().splitlines()[-4:],
+            )
+
+            if options["images"]:
+                # задачи конвертации — здесь же, в этой транзакции (воркер run_tasks её не видит)
+                pending = list(BackgroundTask.objects.filter(id__gt=last_task, name="convert_assets"))
+                converted = sum(len(task.payload.get("items") or []) for task in pending)
+                started = time.perf_counter()
+                for task in pending:
+                    tasks.run(task)
+                image_seconds = time.perf_counter() - started
+                result.update(
+                    image_seconds=round(image_seconds, 3),
+                    images_per_sec=round(converted / image_seconds, 1) if image_seconds else 0.0,
+                )
+            transaction.set_rollback(True)
+        sites.invalidate()
+        result["http"] = steam_client.stats_since(http_baseline)
+        return result
@@ -0,0 +1,88 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from products.services import steam_fake
+
+
+def default_corpus_dir() -> Path:
+    return Path(getattr(settings, "STEAM_FAKE_CORPUS_DIR", settings.BASE_DIR / "var" / "steam_fake_corpus"))
+
+
+class Command(BaseCommand):
+    help = (
+        "Локальная подмена Steam (products/services/steam_fake.py): serve — отдавать корпус "
+        "appdetails/GetAppList/картинок с задержкой и сбоями, generate — синтетический корпус, "
+        "record — корпус из дискового кэша appdetails."
+    )
+
+    def add_arguments(self, parser):
+        sub = parser.add_subparsers(dest="action", required=True)
+
+        serve = sub.add_parser("serve", help="Запустить сервер (Ctrl+C — стоп)")
+        serve.add_argument("--corpus", help="Каталог корпуса (по умолчанию STEAM_FAKE_CORPUS_DIR)")
+        serve.add_argument("--host", default="127.0.0.1")
+        serve.add_argument("--port", type=int, default=8765)
+        serve.add_argument("--latency", type=float, default=0.0, help="Задержка ответа, мс")
+        serve.add_argument("--jitter", type=float, default=0.5, help="Разброс задержки, доля (0.5 = ±50%%)")
+        serve.add_argument("--error-rate", type=float, default=0.0, help="Доля ответов 503")
+        serve.add_argument("--throttle-rate", type=float, default=0.0, help="Доля ответов 429")
+        serve.add_argument("--retry-after", type=int, default=1, help="Retry-After у 429, сек")
+
+        generate = sub.add_parser("generate", help="Сгенерировать синтетический корпус")
+        generate.add_argument("--corpus")
+        generate.add_argument("--count", type=int, default=1000)
+        generate.add_argument("--seed", type=int, default=0)
+        generate.add_argument("--invalid-share", type=float, default=0.1, help="Доля appid с success=false")
+
+        record = sub.add_parser("record", help="Собрать корпус из дискового кэша appdetails")
+        record.add_argument("--corpus")
+        record.add_argument("--cc", default="us")
+        record.add_argument("--lang", default="en")
+        record.add_argument("--limit", type=int)
+        record.add_argument("--images", action="store_true", help="Докачать логотипы и скриншоты (нужна сеть)")
+
+    def handle(self, *args, **options):
+        corpus = Path(options["corpus"]) if options["corpus"] else default_corpus_dir()
+        getattr(self, f"_{options['action']}")(corpus, options)
+
+    def _serve(self, corpus, options):
+        if not (corpus / "appdetails").is_dir():
+            raise CommandError(f"Нет корпуса в {corpus}: fake_steam_server generate или record")
+        server = steam_fake.FakeSteamServer(
+            corpus,
+            host=options["host"],
+            port=options["port"],
+            latency=options["latency"] / 1000,
+            jitter=options["jitter"],
+            error_rate=options["error_rate"],
+            throttle_rate=options["throttle_rate"],
+            retry_after=options["retry_after"],
+            verbose=options["verbosity"] > 1,
+        )
+        self.stdout.write(
+            f"Фейковый Steam на {server.url}: {len(server.corpus.appdetails)} appdetails, "
+            f"{len(server.corpus.apps)} в списке, {len(server.corpus.images)} картинок\n"
+            "Направить импорт:\n" + "\n".join(f"  {name}={value}" for name, value in server.settings().items())
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stdout.write(f"Остановлен; ответов: {server.counters}")
+
+    def _generate(self, corpus, options):
+        written = steam_fake.generate_corpus(
+            corpus, options["count"], seed=options["seed"], invalid_share=options["invalid_share"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Сгенерировано {written} appdetails в {corpus}"))
+
+    def _record(self, corpus, options):
+        written = steam_fake.record_corpus(
+            corpus, cc=options["cc"], lang=options["lang"], limit=options["limit"], images=options["images"]
+        )
+        if not written:
+            raise CommandError("В кэше appdetails нет записей: steam_appdetails_cache prewarm …")
+        self.stdout.write(self.style.SUCCESS(f"Записано {written} appdetails в {corpus}"))
@@ -0,0 +1,194 @@
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from products.models import Product
+from products.services import steam_verdicts
+from products.services.steam_parser import split_steam_ids
+from products.services.steam_pipeline import SteamPipeline
+from products.services.steam_writer import SteamProductWriter
+from products.utils.sites import first_site, get_site_by_id
+
+
+class Command(BaseCommand):
+    help = (
+        "Импорт из Steam без браузера: ID (или ссылки на магазин) из файла или stdin, по одному "
+        "или через запятую в строке, на один или несколько сайтов. Та же нормализация и пакетная "
+        "запись, что и в админке. После каждой пачки пишется чекпоинт — прерванный запуск той же "
+        "командой продолжается с места остановки."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("source", nargs="?", default="-", help="Файл с ID; '-' или без аргумента — stdin")
+        parser.add_argument("--site", type=int, action="append", help="ID сайта (можно несколько); по умолчанию первый")
+        parser.add_argument("--workers", type=int, help="Параллельных загрузок (по умолчанию STEAM_IMPORT_WORKERS)")
+        parser.add_argument(
+            "--processes", type=int, default=0,
+            help="Процессов для нормализации (transform); 0 — в основном процессе",
+        )
+        parser.add_argument("--batch-size", type=int, help="ID в пачке (по умолчанию STEAM_IMPORT_BATCH_SIZE)")
+        parser.add_argument("--checkpoint", help="Файл чекпоинта (по умолчанию <source>.checkpoint или var/import_steam.checkpoint)")
+        parser.add_argument("--restart", action="store_true", help="Игнорировать чекпоинт и начать сначала")
+        parser.add_argument("--update", action="store_true", help="Обновлять уже существующие продукты (иначе пропускать)")
+        parser.add_argument("--refresh", action="store_true", help="Перезапросить appdetails мимо TTL дискового кэша")
+
+    # ────────────────────────────────
+    # Вход и чекпоинт
+    # ────────────────────────────────
+    def _ids(self, source):
+        stream = sys.stdin if source == "-" else open(source, encoding="utf-8")
+        try:
+            for line in stream:
+                yield from split_steam_ids(line)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+    def _checkpoint_path(self, options) -> Path:
+        if options["checkpoint"]:
+            return Path(options["checkpoint"])
+        if options["source"] == "-":
+            return Path(settings.BASE_DIR) / "var" / "import_steam.checkpoint"
+        return Path(f"{options['source']}.checkpoint")
+
+    def _load_checkpoint(self, path: Path, key: dict) -> dict | None:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return None
+        if data.get("key") != key:
+            raise CommandError(
+                f"Чекпоинт {path} от другого запуска ({data.get('key')}); --restart, чтобы начать заново"
+            )
+        return data
+
+    def _save_checkpoint(self, path: Path, key: dict, offset: int, counts: dict):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_text(json.dumps({
+            "key": key, "offset": offset, "counts": counts, "updated_at": timezone.now().isoformat(),
+        }), encoding="utf-8")
+        os.replace(tmp, path)
+
+    # ────────────────────────────────
+    # Импорт
+    # ────────────────────────────────
+    def handle(self, *args, **options):
+        sites = [get_site_by_id(site_id) for site_id in options["site"] or ()] or [first_site()]
+        if None in sites:
+            raise CommandError("Нет такого сайта: " + ", ".join(
+                str(site_id) for site_id in options["site"] if not get_site_by_id(site_id)
+            ))
+        workers = options["workers"] or int(getattr(settings, "STEAM_IMPORT_WORKERS", 8))
+        batch_size = options["batch_size"] or int(getattr(settings, "STEAM_IMPORT_BATCH_SIZE", 50))
+
+        source = options["source"]
+        if source != "-" and not os.path.exists(source):
+            raise CommandError(f"Нет файла {source}")
+        key = {
+            "source": "-" if source == "-" else os.path.abspath(source),
+            "sites": sorted(site.id for site in sites),
+        }
+        checkpoint = self._checkpoint_path(options)
+        state = None if options["restart"] else self._load_checkpoint(checkpoint, key)
+        offset = state["offset"] if state else 0
+        counts = dict.fromkeys(("added", "unchanged", "skipped", "invalid", "failed"), 0)
+        if state:
+            counts.update(state.get("counts") or {})
+            self.stdout.write(f"Продолжаем с позиции {offset} (чекпоинт {checkpoint})")
+
+        # уже импортированное пропускаем без запроса в Steam
+        existing = {
+            site.id: set(Product.objects.filter(site=site).exclude(steam_id__isnull=True).values_list("steam_id", flat=True))
+            for site in sites
+        } if not options["update"] else {site.id: set() for site in sites}
+        writers = {site.id: SteamProductWriter(site, batch_size=batch_size) for site in sites}
+
+        processed = 0
+        started = time.monotonic()
+        ids = self._ids(source)
+        for _ in range(offset):
+            if next(ids, None) is None:
+                break
+
+        pipeline = SteamPipeline(workers=workers, processes=options["processes"], refresh=options["refresh"])
+        try:
+            with pipeline:
+                while True:
+                    chunk = [steam_id for _, steam_id in zip(range(batch_size), ids)]
+                    if not chunk:
+                        break
+                    self._import_chunk(chunk, pipeline, writers, existing, counts, options)
+                    offset += len(chunk)
+                    processed += len(chunk)
+                    self._save_checkpoint(checkpoint, key, offset, counts)
+
+                    elapsed = time.monotonic() - started
+                    self.stdout.write(
+                        f"… {offset}: добавлено {counts['added']}, без изменений {counts['unchanged']}, "
+                        f"пропущено {counts['skipped']}, невалидных {counts['invalid']}, ошибок {counts['failed']} "
+                        f"· {processed / elapsed:.1f} ID/с"
+                    )
+        except KeyboardInterrupt:
+            self.stderr.write(f"Прервано на позиции {offset}; повторите команду, чтобы продолжить")
+            self._summary(processed, started, counts, pipeline)
+            return
+
+        checkpoint.unlink(missing_ok=True)
+        self._summary(processed, started, counts, pipeline)
+
+    def _import_chunk(self, chunk, pipeline, writers, existing, counts, options):
+        # один запрос в Steam на ID, сколько бы сайтов ни было
+        digits = [steam_id for steam_id in chunk if steam_id.isdigit()]
+        counts["invalid"] += len(chunk) - len(digits)
+        counts["skipped"] += sum(1 for steam_id in digits for known in existing.values() if steam_id in known)
+        wanted = [
+            steam_id for steam_id in dict.fromkeys(digits)
+            if any(steam_id not in known for known in existing.values())
+        ]
+
+        verdicts = []
+        for item in pipeline.run(wanted):
+            if item.invalid:
+                verdicts.append((item.steam_id, False, ""))
+                counts["invalid"] += 1
+                continue
+            if item.game is not None:
+                verdicts.append((item.steam_id, True, item.game.get("type") or ""))
+            if item.error:
+                counts["failed"] += 1
+                if options["verbosity"] > 1:
+                    self.stderr.write(f"{item.steam_id}: {item.error}")
+                continue
+            for site_id, writer in writers.items():
+                if item.steam_id not in existing[site_id]:
+                    writer.add(item.steam_id, item.record)
+
+        steam_verdicts.record_many(verdicts)
+        # строки — на каждый сайт, картинки — общие (одна конвертация на игру)
+        for site_id, results in pipeline.persist_sites(writers.values()).items():
+            for result in results:
+                if result.error:
+                    counts["failed"] += 1
+                    if options["verbosity"] > 1:
+                        self.stderr.write(f"{result.steam_id} (site {site_id}): {result.error}")
+                else:
+                    counts["added" if result.changed else "unchanged"] += 1
+                    existing[site_id].add(result.steam_id)
+
+    def _summary(self, processed, started, counts, pipeline):
+        elapsed = max(time.monotonic() - started, 1e-9)
+        self.stdout.write(self.style.SUCCESS(
+            f"Готово за {elapsed:.1f}с: {processed} ID, {processed / elapsed:.1f} ID/с · "
+            f"добавлено {counts['added']}, без изменений {counts['unchanged']}, пропущено {counts['skipped']}, "
+            f"невалидных {counts['invalid']}, ошибок {counts['failed']}"
+        ))
+        # persist — на пачку (все сайты), fetch и transform — на ID
+        for line in pipeline.stats.lines():
+            self.stdout.write(f"  {line}")
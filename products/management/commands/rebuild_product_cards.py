@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from products.models import Product
+from products.services import product_cards
+
+
+class Command(BaseCommand):
+    help = "Пересобирает готовые JSON-карточки продуктов (ProductCard) для списка API."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--site", type=int, help="Только продукты этого Site ID")
+        parser.add_argument("--missing", action="store_true", help="Только продукты без карточки")
+
+    def handle(self, *args, **options):
+        qs = Product.objects.all()
+        if options["site"]:
+            qs = qs.filter(site_id=options["site"])
+        if options["missing"]:
+            qs = qs.filter(card__isnull=True)
+
+        ids = list(qs.values_list("id", flat=True))
+        product_cards.rebuild(ids)
+        self.stdout.write(self.style.SUCCESS(f"Карточек пересобрано: {len(ids)}"))
@@ -0,0 +1,103 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from products.models import Product
+from products.services import steam_verdicts
+from products.services.steam_pipeline import SteamPipeline
+from products.services.steam_writer import SteamProductWriter, steam_payload_hash
+from products.utils.sites import get_site_by_id
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересинхронизирует продукты со steam_id: appdetails качаются пачками параллельно, "
+        "продукт перезаписывается (и картинки переконвертируются) только если изменился "
+        "хеш нормализованных данных."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--site", type=int, help="Только продукты этого сайта")
+        parser.add_argument("--batch-size", type=int, default=200)
+        parser.add_argument("--workers", type=int, help="Параллельных загрузок (по умолчанию STEAM_IMPORT_WORKERS)")
+        parser.add_argument(
+            "--processes", type=int, default=0,
+            help="Процессов для нормализации (transform); 0 — в основном процессе",
+        )
+        parser.add_argument(
+            "--refresh", action="store_true",
+            help="Перезапросить appdetails мимо TTL дискового кэша (условным GET)",
+        )
+        parser.add_argument("--force", action="store_true", help="Перезаписать даже без изменений")
+
+    def _failed(self, counts, options, steam_id, site_id, error):
+        counts["failed"] += 1
+        if options["verbosity"] > 1:
+            self.stderr.write(f"{steam_id} (site {site_id}): {error}")
+
+    def handle(self, *args, **options):
+        products = Product.objects.exclude(steam_id__isnull=True).exclude(steam_id="")
+        if options["site"]:
+            if not get_site_by_id(options["site"]):
+                raise CommandError(f"Нет сайта с id={options['site']}")
+            products = products.filter(site_id=options["site"])
+
+        workers = options["workers"] or int(getattr(settings, "STEAM_IMPORT_WORKERS", 8))
+        batch_size = max(1, options["batch_size"])
+        counts = {"changed": 0, "unchanged": 0, "failed": 0}
+        started = time.time()
+        last_id = 0
+
+        pipeline = SteamPipeline(workers=workers, processes=options["processes"], refresh=options["refresh"])
+        with pipeline:
+            while True:
+                batch = list(
+                    products.filter(id__gt=last_id).order_by("id")
+                    .values_list("id", "steam_id", "site_id", "steam_payload_hash")[:batch_size]
+                )
+                if not batch:
+                    break
+                last_id = batch[-1][0]
+
+                # один запрос на steam_id, даже если продукт есть на нескольких сайтах
+                steam_ids = list(dict.fromkeys(row[1] for row in batch))
+                fetched = {item.steam_id: item for item in pipeline.run(steam_ids)}
+
+                writers = {}  # site_id → SteamProductWriter: пачка пишется одним upsert на сайт
+                for _pk, steam_id, site_id, old_hash in batch:
+                    item = fetched[steam_id]
+                    if item.error:
+                        if item.invalid:
+                            steam_verdicts.record(steam_id, is_valid=False)
+                        self._failed(counts, options, steam_id, site_id, item.error)
+                        continue
+                    normalized = item.record
+                    if not options["force"] and steam_payload_hash(normalized) == old_hash:
+                        counts["unchanged"] += 1
+                        continue
+                    if site_id not in writers:
+                        writers[site_id] = SteamProductWriter(
+                            get_site_by_id(site_id), batch_size=batch_size, force=options["force"],
+                        )
+                    writers[site_id].add(steam_id, normalized)
+
+                for site_id, results in pipeline.persist_sites(writers.values()).items():
+                    for result in results:
+                        if result.error:
+                            self._failed(counts, options, result.steam_id, site_id, result.error)
+                        else:
+                            counts["changed" if result.changed else "unchanged"] += 1
+
+                done = sum(counts.values())
+                self.stdout.write(
+                    f"… {done}: изменено {counts['changed']}, без изменений {counts['unchanged']}, "
+                    f"ошибок {counts['failed']}"
+                )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Готово за {time.time() - started:.1f}с: изменено {counts['changed']}, "
+            f"без изменений {counts['unchanged']}, ошибок {counts['failed']}"
+        ))
+        for line in pipeline.stats.lines():
+            self.stdout.write(f"  {line}")
@@ -0,0 +1,88 @@
+import os
+import signal
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+
+from products.services import tasks
+
+
+class Command(BaseCommand):
+    help = (
+        "Воркер фоновых задач (BackgroundTask): импорт из Steam, конвертация картинок. "
+        "Забирает задачи из БД с блокировкой строк, повторяет упавшие с backoff и продлевает "
+        "visibility timeout, пока задача выполняется. Можно запускать несколько копий."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency", type=int,
+            help="Задач одновременно (по умолчанию TASKS_WORKER_CONCURRENCY)",
+        )
+        parser.add_argument("--poll", type=float, help="Пауза между опросами пустой очереди, сек")
+        parser.add_argument("--only", action="append", metavar="NAME", help="Только задачи с этим именем")
+        parser.add_argument("--once", action="store_true", help="Выполнить то, что есть, и выйти")
+
+    def _run(self, task):
+        try:
+            return tasks.run(task)
+        finally:
+            # у каждого потока пула своё соединение с БД
+            connection.close()
+
+    def _stop(self, signum, frame):
+        self.stdout.write("Остановка: новые задачи не берём, дожидаемся текущих (повторный сигнал — выход сразу)")
+        self.stopping = True
+        signal.signal(signum, signal.SIG_DFL)
+
+    def handle(self, *args, **options):
+        unknown = set(options["only"] or ()) - set(tasks.HANDLERS)
+        if unknown:
+            raise CommandError(f"Неизвестные задачи: {', '.join(sorted(unknown))}")
+
+        concurrency = max(1, options["concurrency"] or int(getattr(settings, "TASKS_WORKER_CONCURRENCY", 4)))
+        poll = options["poll"] or float(getattr(settings, "TASKS_POLL_INTERVAL", 2))
+        heartbeat = tasks.visibility_timeout() / 3
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        self.stdout.write(f"Воркер {worker_id}: потоков {concurrency}, задачи: {', '.join(options['only'] or tasks.HANDLERS)}")
+        running = {}  # future → task
+        extended_at = time.monotonic()
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="task") as pool:
+            while True:
+                close_old_connections()
+                claimed = []
+                if not self.stopping and len(running) < concurrency:
+                    claimed = tasks.claim(worker_id, concurrency - len(running), names=options["only"])
+                    for task in claimed:
+                        self.stdout.write(f"→ #{task.pk} {task.name} (попытка {task.attempts}/{task.max_attempts})")
+                        running[pool.submit(self._run, task)] = task
+
+                if not running:
+                    if self.stopping or (options["once"] and not claimed):
+                        break
+                    time.sleep(poll)
+                    continue
+
+                # долгие задачи (импорт) держат блокировку, пока воркер жив
+                if time.monotonic() - extended_at > heartbeat:
+                    tasks.extend(worker_id, [task.pk for task in running.values()])
+                    extended_at = time.monotonic()
+
+                done, _ = wait(running, timeout=min(poll, heartbeat), return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    if future.result():
+                        self.stdout.write(self.style.SUCCESS(f"✓ #{task.pk} {task.name}"))
+                    else:
+                        self.stderr.write(f"✗ #{task.pk} {task.name}: ошибка, см. last_error")
+
+        self.stdout.write("Воркер остановлен")
@@ -0,0 +1,136 @@
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from products.models import Product, SteamAppVerdict
+from products.services import appdetails_cache, steam_client
+from products.utils.db import DBThreadPoolExecutor
+
+
+class Command(BaseCommand):
+    help = (
+        "Дисковый кэш Steam appdetails (products/services/appdetails_cache.py): "
+        "prewarm — скачать заранее, stats — что лежит, show — одна запись, prune — удалить старое."
+    )
+
+    def add_arguments(self, parser):
+        sub = parser.add_subparsers(dest="action", required=True)
+
+        prewarm = sub.add_parser("prewarm", help="Скачать appdetails заранее (свежие записи пропускаются)")
+        prewarm.add_argument("appids", nargs="*", help="Steam App ID")
+        prewarm.add_argument("--products", action="store_true", help="Все steam_id продуктов")
+        prewarm.add_argument("--verdicts", metavar="TYPE", help="Все заведомо хорошие appid этого типа")
+        prewarm.add_argument("--refresh", action="store_true", help="Перезапросить и свежие (условным GET)")
+        prewarm.add_argument("--cc", default="us")
+        prewarm.add_argument("--lang", default="en")
+
+        sub.add_parser("stats", help="Сколько записей, размер, возраст")
+
+        show = sub.add_parser("show", help="Показать запись кэша")
+        show.add_argument("appid")
+        show.add_argument("--cc", default="us")
+        show.add_argument("--lang", default="en")
+
+        prune = sub.add_parser("prune", help="Удалить записи старше N дней (по умолчанию — старше TTL)")
+        prune.add_argument("--older-than", type=float, metavar="DAYS")
+        prune.add_argument("--all", action="store_true", help="Очистить кэш целиком")
+
+    def handle(self, *args, **options):
+        getattr(self, f"_{options['action']}")(options)
+
+    # ────────────────────────────────
+    # prewarm
+    # ────────────────────────────────
+    def _prewarm(self, options):
+        appids = list(options["appids"])
+        if options["products"]:
+            appids += Product.objects.exclude(steam_id__isnull=True).exclude(steam_id="").values_list(
+                "steam_id", flat=True
+            )
+        if options["verdicts"]:
+            appids += [
+                str(appid) for appid in SteamAppVerdict.objects.filter(
+                    is_valid=True, app_type=options["verdicts"]
+                ).values_list("appid", flat=True)
+            ]
+        appids = [appid for appid in dict.fromkeys(appids) if str(appid).isdigit()]
+        if not appids:
+            raise CommandError("Нет appid: передайте их аргументами или --products / --verdicts TYPE")
+
+        cc, lang = options["cc"], options["lang"]
+        if not options["refresh"]:
+            appids = [a for a in appids if not appdetails_cache.is_fresh(appdetails_cache.read(a, cc, lang))]
+
+        def warm(appid):
+            try:
+                appdetails_cache.fetch(appid, cc=cc, lang=lang, refresh=options["refresh"])
+                return True
+            except steam_client.SteamRequestError as e:
+                self.stderr.write(f"{appid}: {e}")
+                return False
+
+        started = time.time()
+        with DBThreadPoolExecutor(max_workers=int(getattr(settings, "STEAM_IMPORT_WORKERS", 8))) as pool:
+            results = list(pool.map(warm, appids))
+        self.stdout.write(self.style.SUCCESS(
+            f"Прогрето {sum(results)} из {len(appids)} за {time.time() - started:.1f}с"
+        ))
+
+    # ────────────────────────────────
+    # stats / show
+    # ────────────────────────────────
+    def _stats(self, options):
+        now = time.time()
+        ttl = appdetails_cache.ttl()
+        count = Counter()
+        size = Counter()
+        stale = Counter()
+        oldest = None
+        for _path, locale, bytes_, mtime in appdetails_cache.entries():
+            count[locale] += 1
+            size[locale] += bytes_
+            if now - mtime >= ttl:
+                stale[locale] += 1
+            oldest = mtime if oldest is None else min(oldest, mtime)
+
+        self.stdout.write(f"Каталог: {appdetails_cache.cache_dir()} · TTL {ttl // 3600} ч")
+        if not count:
+            self.stdout.write("Кэш пуст")
+            return
+        for locale in sorted(count):
+            self.stdout.write(
+                f"  {locale:8} записей: {count[locale]:7} · {size[locale] / 1024 / 1024:8.1f} МБ · устарело: {stale[locale]}"
+            )
+        self.stdout.write(f"Самая старая запись: {(now - oldest) / 86400:.1f} дн.")
+
+    def _show(self, options):
+        entry = appdetails_cache.read(options["appid"], options["cc"], options["lang"])
+        if not entry:
+            raise CommandError("Записи нет")
+        body = entry["body"].get(str(entry["appid"]), {})
+        data = body.get("data") or {}
+        self.stdout.write(
+            f"{entry['appid']} ({entry['cc']}/{entry['lang']}): success={body.get('success')} "
+            f"type={data.get('type', '—')} name={data.get('name', '—')!r}\n"
+            f"  скачано {(time.time() - entry['fetched_at']) / 3600:.1f} ч назад · свежая: {appdetails_cache.is_fresh(entry)}\n"
+            f"  etag={entry.get('etag') or '—'} last_modified={entry.get('last_modified') or '—'}\n"
+            f"  {appdetails_cache.path_for(entry['appid'], entry['cc'], entry['lang'])}"
+        )
+
+    # ────────────────────────────────
+    # prune
+    # ────────────────────────────────
+    def _prune(self, options):
+        max_age = None if options["all"] else (
+            options["older_than"] * 86400 if options["older_than"] is not None else appdetails_cache.ttl()
+        )
+        now = time.time()
+        removed = freed = 0
+        for path, _locale, bytes_, mtime in list(appdetails_cache.entries()):
+            if max_age is None or now - mtime >= max_age:
+                path.unlink(missing_ok=True)
+                removed += 1
+                freed += bytes_
+        self.stdout.write(self.style.SUCCESS(f"Удалено {removed} записей, {freed / 1024 / 1024:.1f} МБ"))
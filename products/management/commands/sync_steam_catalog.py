@@ -0,0 +1,74 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from products.services import steam_catalog, steam_client
+
+APP_LIST_V2_PATH = "/ISteamApps/GetAppList/v2/"
+STORE_APP_LIST_PATH = "/IStoreService/GetAppList/v1/"
+STORE_PAGE_SIZE = 50000
+
+
+class Command(BaseCommand):
+    help = (
+        "Обновляет локальное зеркало каталога Steam (products/services/steam_catalog.py). "
+        "С STEAM_WEB_API_KEY — инкрементально через IStoreService (if_modified_since), "
+        "без ключа — полной выгрузкой ISteamApps/GetAppList/v2."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Полная перезагрузка вместо инкремента")
+
+    def _store_pages(self, key: str, since: int | None):
+        last_appid = 0
+        while True:
+            params = (
+                f"?key={key}&max_results={STORE_PAGE_SIZE}&last_appid={last_appid}"
+                "&include_games=1&include_dlc=1&include_software=1&include_videos=1&include_hardware=1"
+            )
+            if since:
+                params += f"&if_modified_since={since}"
+            data = steam_client.get_json(steam_client.web_api_url(STORE_APP_LIST_PATH) + params, timeout=60).get("response", {})
+            yield data.get("apps", [])
+            if not data.get("have_more_results"):
+                return
+            last_appid = data["last_appid"]
+
+    def _full_v2(self) -> dict[int, str]:
+        apps = steam_client.get_json(steam_client.web_api_url(APP_LIST_V2_PATH), timeout=120).get("applist", {}).get("apps", [])
+        if not isinstance(apps, list):
+            raise CommandError("GetAppList/v2 вернул неожиданный формат")
+        return {int(app["appid"]): app.get("name", "") for app in apps if app.get("appid")}
+
+    def handle(self, *args, **options):
+        started = time.time()
+        key = getattr(settings, "STEAM_WEB_API_KEY", "")
+        current = None if options["full"] else steam_catalog.load()
+
+        try:
+            if key:
+                since = int(current.meta["synced_at"]) if current and current.meta.get("source") == "store" else None
+                apps = dict(current.items()) if since else {}
+                changed = 0
+                for page in self._store_pages(key, since):
+                    for app in page:
+                        apps[int(app["appid"])] = app.get("name", "")
+                        changed += 1
+                source = "store"
+            else:
+                apps = self._full_v2()
+                changed = len(apps) - (len(current) if current else 0)
+                source = "v2"
+        except steam_client.SteamRequestError as e:
+            raise CommandError(f"Не удалось скачать каталог: {e}")
+
+        if not apps:
+            raise CommandError("Steam вернул пустой каталог — зеркало не трогаем")
+
+        # метка — момент начала выгрузки: изменения во время синка подхватит следующий инкремент
+        meta = steam_catalog.write(apps, synced_at=started, source=source)
+        self.stdout.write(self.style.SUCCESS(
+            f"Каталог: {meta['count']} приложений ({source}, изменений: {changed}) "
+            f"за {time.time() - started:.1f}с → {steam_catalog.catalog_dir() / meta['generation']}"
+        ))
@@ -0,0 +1,12 @@
+from products.utils.sites import resolve_site_by_host
+
+
+class CurrentSiteMiddleware:
+    """Один раз на запрос кладёт request.site (host → Site из памяти процесса, без запросов к БД)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.site = resolve_site_by_host(request)
+        return self.get_response(request)
@@ -3,6 +3,12 @@ from .product import Product
 from .faq import FAQ
 from .poll import Poll, PollOption
 from .comment import Comment
+from .product_card import ProductCard
+from .steam_app_verdict import SteamAppVerdict
+from .background_task import BackgroundTask
+from .parse_job import ParseJob, ParseJobMessage
+from .steam_lock import SteamLock
+from .cache_version import CacheVersion
 
 __all__ = [
     "Category",
@@ -13,4 +19,11 @@ __all__ = [
     "Poll",
     "PollOption",
     "Comment",
+    "ProductCard",
+    "SteamAppVerdict",
+    "BackgroundTask",
+    "ParseJob",
+    "ParseJobMessage",
+    "SteamLock",
+    "CacheVersion",
 ]
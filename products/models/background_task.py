@@ -0,0 +1,45 @@
+from django.db import models
+from django.utils import timezone
+
+
+class BackgroundTask(models.Model):
+    """
+    Фоновая задача в БД вместо daemon-потока в gunicorn-воркере: админка ставит
+    её в очередь, `manage.py run_tasks` забирает (select_for_update skip_locked),
+    повторяет с backoff и переотдаёт, если воркер пропал (locked_until истёк).
+    Обработчики — products/services/tasks.py.
+    """
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    name = models.CharField("Task", max_length=64)
+    payload = models.JSONField("Payload", default=dict, blank=True)
+    status = models.CharField("Status", max_length=16, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    attempts = models.PositiveIntegerField("Attempts", default=0)
+    max_attempts = models.PositiveIntegerField("Max attempts", default=5)
+    run_after = models.DateTimeField("Run after", default=timezone.now)
+    locked_until = models.DateTimeField("Locked until", null=True, blank=True)
+    locked_by = models.CharField("Locked by", max_length=128, blank=True)
+    last_error = models.TextField("Last error", blank=True)
+    created_at = models.DateTimeField("Created at", auto_now_add=True)
+    updated_at = models.DateTimeField("Updated at", auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "run_after"], name="bgtask_status_run_after"),
+            models.Index(fields=["status", "locked_until"], name="bgtask_status_locked"),
+        ]
+        ordering = ["-id"]
+        verbose_name = "Background task"
+        verbose_name_plural = "Background tasks"
+
+    def __str__(self):
+        return f"#{self.pk} {self.name} ({self.status})"
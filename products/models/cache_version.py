@@ -0,0 +1,37 @@
+import time
+
+from django.db import models
+from django.db.models import F
+
+
+class CacheVersion(models.Model):
+    """
+    Версия данных для кэша ответов API: scope — id сайта или "global".
+    Живёт в БД, а не в кэше: кэш по умолчанию — LocMem своего процесса, а менять
+    данные могут другие процессы (веб-воркеры, manage.py run_tasks).
+    """
+    scope = models.CharField("Scope", max_length=32, primary_key=True)
+    version = models.BigIntegerField("Version", default=0)
+    updated_at = models.DateTimeField("Updated at", auto_now=True)
+
+    class Meta:
+        verbose_name = "Cache version"
+        verbose_name_plural = "Cache versions"
+
+    def __str__(self):
+        return f"{self.scope}: {self.version}"
+
+    @classmethod
+    def bump(cls, scope) -> None:
+        """+1 одним UPDATE; строки ещё нет — создаём с монотонного time_ns(), чтобы не повторить старую версию."""
+        scope = str(scope)
+        if cls.objects.filter(scope=scope).update(version=F("version") + 1):
+            return
+        cls.objects.bulk_create([cls(scope=scope, version=time.time_ns())], ignore_conflicts=True)
+
+    @classmethod
+    def current(cls, *scopes) -> dict[str, int]:
+        """scope → версия одним запросом; нет строки — 0 (её ещё ни разу не поднимали)."""
+        scopes = [str(scope) for scope in scopes]
+        rows = dict(cls.objects.filter(scope__in=scopes).values_list("scope", "version"))
+        return {scope: rows.get(scope, 0) for scope in scopes}
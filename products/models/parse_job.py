@@ -0,0 +1,47 @@
+from django.db import models
+
+
+class ParseJob(models.Model):
+    """
+    Прогресс импорта из Steam в БД, а не в LocMem-кэше процесса: статус виден
+    из любого gunicorn-воркера, а воркер задач пишет счётчики одним UPDATE
+    без read-modify-write (products/services/progress.py).
+    """
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_CANCELLED = "cancelled"
+    STATUS_FAILED = "failed"
+
+    id = models.CharField(primary_key=True, max_length=32, editable=False)
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    added = models.PositiveIntegerField(default=0)
+    errors = models.PositiveIntegerField(default=0)
+    status = models.CharField(max_length=16, default=STATUS_RUNNING)
+    done = models.BooleanField(default=False)
+    cancel = models.BooleanField(default=False)
+    http = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        verbose_name = "Parse job"
+        verbose_name_plural = "Parse jobs"
+
+    def __str__(self):
+        return f"{self.pk} ({self.status})"
+
+
+class ParseJobMessage(models.Model):
+    """Строка лога задачи; id растёт монотонно — по нему лог читается «с места»."""
+    job = models.ForeignKey(ParseJob, on_delete=models.CASCADE, related_name="messages")
+    text = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["job", "-id"], name="parse_job_message_job_id"),
+        ]
+
+    def __str__(self):
+        return self.text
@@ -1,8 +1,9 @@
 from django.db import models
-from django.core.files.storage import default_storage
 from django.db.models.signals import pre_save, post_delete
 from django.dispatch import receiver
 
+from products.utils.images import delete_stored_file
+
 
 class Poll(models.Model):
     title = models.CharField(
@@ -44,17 +45,10 @@ def _delete_old_poll_image_on_change(sender, instance: Poll, **kwargs):
     new_name = getattr(getattr(instance, "image", None), "name", None)
 
     if old_name and old_name != new_name:
-        try:
-            default_storage.delete(old_name)
-        except Exception:
-            pass
+        delete_stored_file(old_name)
 
 
 @receiver(post_delete, sender=Poll)
 def _delete_poll_image_on_delete(sender, instance: Poll, **kwargs):
     name = getattr(getattr(instance, "image", None), "name", None)
-    if name:
-        try:
-            default_storage.delete(name)
-        except Exception:
-            pass
\ No newline at end of file
+    delete_stored_file(name)
\ No newline at end of file
@@ -3,12 +3,37 @@ from django.core.validators import MinValueValidator, MaxValueValidator
 from tinymce.models import HTMLField
 from django.contrib.sites.models import Site
 from django.core.exceptions import ValidationError
+from django.dispatch import Signal
+from django.utils import timezone
 
 from products.constants import PRODUCT_TYPE_CHOICES, RATING_MIN, RATING_MAX, BUTTON_TEXT_BY_TYPE
 from .category import Category, Author
 from ..utils.slug import unique_slug
 
 
+# queryset.update() прошёл мимо save() и post_save: site_ids — чьи продукты изменились
+# (None — неизвестно чьи)
+products_updated = Signal()
+
+# Поля мини-карточки (BestProductMiniSerializer): только их изменение видно в best_products других
+MINI_CARD_FIELDS = ("title", "slug", "type", "logo_file", "logo_url")
+
+
+class ProductQuerySet(models.QuerySet):
+    def update(self, *, site_ids=None, **kwargs):
+        """
+        update() без save() тоже двигает updated_at: по нему считаются ETag/Last-Modified
+        и устаревают карточки (ProductCard) — иначе изменение через update() их не сбросит.
+        site_ids — сайты изменённых продуктов, если вызывающий их знает: кэш API сбросится
+        только у них (пусто — не сбрасывать); None — у всех сайтов. Сами сайты не запрашиваем.
+        """
+        kwargs.setdefault("updated_at", timezone.now())
+        updated = super().update(**kwargs)
+        if updated and (site_ids is None or site_ids):
+            products_updated.send(sender=self.model, site_ids=site_ids)
+        return updated
+
+
 class Product(models.Model):
     TYPE_CHOICES = PRODUCT_TYPE_CHOICES
 
@@ -105,12 +130,42 @@ class Product(models.Model):
 
     # Служебные
     created_at = models.DateTimeField(auto_now_add=True)
+    # двигается и при изменении FAQ/опросов/вариантов/рекомендаций (products/signals.py)
+    updated_at = models.DateTimeField(auto_now=True)
+    # sha256 нормализованного appdetails (steam_parser.steam_payload_hash) — для инкрементального resync
+    steam_payload_hash = models.CharField(max_length=64, blank=True, default="", editable=False)
 
     polls_title = models.CharField("Тайтл блока опросов", max_length=255, blank=True, null=True)
 
+    objects = ProductQuerySet.as_manager()
 
     class Meta:
         unique_together = ('slug', 'site')
+        # Под реальные запросы API: сайт + is_active, затем сортировка/фильтр.
+        # Частичные индексы (is_active=True) — там, где бэкенд их поддерживает.
+        indexes = [
+            models.Index(
+                fields=["site", "-created_at", "-id"], condition=models.Q(is_active=True),
+                name="product_site_active_created",
+            ),
+            models.Index(
+                fields=["site", "-rating", "-id"], condition=models.Q(is_active=True),
+                name="product_site_active_rating",
+            ),
+            models.Index(
+                fields=["site", "type", "-created_at"], condition=models.Q(is_active=True),
+                name="product_site_active_type",
+            ),
+            models.Index(
+                fields=["site", "category", "-created_at"], condition=models.Q(is_active=True),
+                name="product_site_active_cat",
+            ),
+            models.Index(fields=["site", "updated_at"], name="product_site_updated"),  # ETag списка
+        ]
+        constraints = [
+            # импорт из Steam: поиск и upsert (bulk_create update_conflicts) по этой паре
+            models.UniqueConstraint(fields=["steam_id", "site"], name="product_unique_steam_site"),
+        ]
         verbose_name = "Product"
         verbose_name_plural = "Products"
 
@@ -121,7 +176,30 @@ class Product(models.Model):
 
         self.button_text = BUTTON_TEXT_BY_TYPE.get(self.type, "View Product")
 
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "updated_at" not in update_fields:
+            # save(update_fields=[…]) иначе не запишет auto_now — ETag и карточка не устареют
+            kwargs["update_fields"] = [*update_fields, "updated_at"]
+
         super().save(*args, **kwargs)
+        self._saved_mini_card = self._mini_card_state()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._saved_mini_card = instance._mini_card_state()
+        return instance
+
+    def _mini_card_state(self):
+        # из __dict__, а не getattr: отложенные (only/defer) поля не догружаем
+        return tuple(str(self.__dict__.get(name) or "") for name in MINI_CARD_FIELDS)
+
+    def mini_card_changed(self, update_fields=None) -> bool:
+        """Изменилось ли с загрузки (или прошлого save) то, что показывает мини-карточка."""
+        if update_fields is not None:
+            return not set(update_fields).isdisjoint(MINI_CARD_FIELDS)
+        saved = getattr(self, "_saved_mini_card", None)
+        return saved is None or saved != self._mini_card_state()
 
     def get_absolute_url(self):
         return f"https://{self.site.domain.rstrip('/')}/product/{self.slug}"
@@ -0,0 +1,21 @@
+from django.db import models
+
+
+class ProductCard(models.Model):
+    """
+    Денормализованная «карточка» продукта: готовый JSON ProductListSerializer.
+    Список продуктов склеивает эти строки в ответ без моделей и сериалайзеров.
+    Пересобирается сигналами (products/signals.py) и командой rebuild_product_cards.
+    """
+    product = models.OneToOneField(
+        'Product', on_delete=models.CASCADE, primary_key=True, related_name='card'
+    )
+    payload = models.TextField("Card JSON")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Product card"
+        verbose_name_plural = "Product cards"
+
+    def __str__(self):
+        return f"Card #{self.product_id}"
@@ -0,0 +1,23 @@
+from django.db import models
+
+
+class SteamAppVerdict(models.Model):
+    """
+    Итог последней проверки appid через appdetails: годится ли приложение
+    и какого оно типа (game, dlc, music…). Random-режим берёт кандидатов только
+    из заведомо хороших и ещё не проверенных (products/services/steam_verdicts.py).
+    """
+    appid = models.PositiveIntegerField("Steam App ID", primary_key=True)
+    is_valid = models.BooleanField("Valid?")
+    app_type = models.CharField("App type", max_length=32, blank=True)
+    checked_at = models.DateTimeField("Checked at")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["is_valid", "app_type"], name="steam_verdict_valid_type"),
+        ]
+        verbose_name = "Steam app verdict"
+        verbose_name_plural = "Steam app verdicts"
+
+    def __str__(self):
+        return f"{self.appid}: {'ok' if self.is_valid else 'bad'} {self.app_type}".strip()
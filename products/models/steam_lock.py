@@ -0,0 +1,21 @@
+from django.db import models
+
+
+class SteamLock(models.Model):
+    """
+    Блокировка «работа в полёте» между процессами: ключ вида appdetails:<appid>:<cc>-<l>
+    или assets:<product_id>:<хеш URL>. Кто вставил строку — делает работу, остальные
+    ждут её результата (products/services/steam_inflight.py). Просроченная строка
+    (locked_until в прошлом) считается свободной — на случай упавшего процесса.
+    """
+    key = models.CharField("Key", max_length=128, primary_key=True)
+    owner = models.CharField("Owner", max_length=128)
+    locked_until = models.DateTimeField("Locked until", db_index=True)
+    created_at = models.DateTimeField("Created at", auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Steam lock"
+        verbose_name_plural = "Steam locks"
+
+    def __str__(self):
+        return f"{self.key} ({self.owner})"
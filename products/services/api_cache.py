@@ -0,0 +1,106 @@
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from products.models import CacheVersion
+
+KEY_PREFIX = "api_cache"
+GLOBAL_SCOPE = "global"
+
+# Тела ответов — в кэше процесса (LocMem, если CACHES не задан), а версии — в БД
+# (CacheVersion): изменение из любого процесса (админка, run_tasks) меняет ключи во
+# всех веб-воркерах. Прочитанные версии процесс помнит API_CACHE_VERSION_CHECK_INTERVAL
+# секунд (как карту сайтов — SITE_CACHE_CHECK_INTERVAL), так что попадание в кэш
+# обычно обходится без ORM; чужие изменения видны с этой задержкой, свои — сразу.
+
+_lock = threading.Lock()
+_seen: dict = {}  # site_id → ((глобальная, сайта), когда прочитали)
+
+
+def timeout() -> int:
+    """TTL кэша ответов API (0 — кэш выключен)."""
+    return int(getattr(settings, "API_CACHE_TIMEOUT", 60 * 10))
+
+
+def version_check_interval() -> float:
+    return float(getattr(settings, "API_CACHE_VERSION_CHECK_INTERVAL", 5))
+
+
+def bump_version(scope) -> None:
+    """O(1)-инвалидация: старые ключи просто перестают читаться и истекают по TTL."""
+    CacheVersion.bump(scope)
+    with _lock:
+        if scope == GLOBAL_SCOPE:
+            _seen.clear()
+        else:
+            _seen.pop(str(scope), None)
+
+
+def bump_site(site_id) -> None:
+    if site_id:
+        bump_version(site_id)
+
+
+def bump_global() -> None:
+    """Общие для всех сайтов данные (категории, авторы)."""
+    bump_version(GLOBAL_SCOPE)
+
+
+def versions(site_id) -> tuple[int, int]:
+    """(глобальная, сайта): из памяти процесса или одним запросом, если запомненные устарели."""
+    now = time.monotonic()
+    seen = _seen.get(str(site_id))
+    if seen is not None and now - seen[1] < version_check_interval():
+        return seen[0]
+    current = CacheVersion.current(GLOBAL_SCOPE, site_id)
+    result = current[GLOBAL_SCOPE], current[str(site_id)]
+    with _lock:
+        _seen[str(site_id)] = (result, now)
+    return result
+
+
+def normalized_query(request) -> str:
+    """Query-параметры в каноничном виде: порядок ключей и значений не важен."""
+    items = sorted(
+        (key, value)
+        for key in request.GET.keys()
+        for value in request.GET.getlist(key)
+    )
+    return "&".join(f"{k}={v}" for k, v in items)
+
+
+def response_key(request, site_id, variant: str = "") -> str:
+    global_v, site_v = versions(site_id)
+    raw = f"{variant}|{request.build_absolute_uri(request.path)}?{normalized_query(request)}"
+    digest = hashlib.md5(raw.encode("utf-8")).hexdigest()
+    return f"{KEY_PREFIX}:r:{site_id}:{global_v}:{site_v}:{digest}"
+
+
+def get_response(key):
+    return cache.get(key)
+
+
+def set_response(key, payload) -> None:
+    cache.set(key, payload, timeout())
+
+
+def approx_count_timeout() -> int:
+    return int(getattr(settings, "API_APPROX_COUNT_TIMEOUT", 60 * 5))
+
+
+def approx_count(queryset, *, site_id, params: dict) -> int:
+    """
+    COUNT(*) по набору фильтров, закэшированный на сайт + фильтры.
+    Намеренно не зависит от версии сайта: число «приблизительное» в пределах TTL.
+    """
+    raw = "&".join(f"{k}={v}" for k in sorted(params) for v in sorted(params[k]))
+    digest = hashlib.md5(raw.encode("utf-8")).hexdigest()
+    key = f"{KEY_PREFIX}:count:{site_id}:{digest}"
+    total = cache.get(key)
+    if total is None:
+        total = queryset.order_by().count()
+        cache.set(key, total, approx_count_timeout())
+    return int(total)
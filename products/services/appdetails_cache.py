@@ -0,0 +1,132 @@
+# Дисковый кэш сырых ответов Steam appdetails: по файлу gzip на (appid, cc, l)
+# в STEAM_APPDETAILS_CACHE_DIR/<cc>-<l>/<appid // 1000>/<appid>.json.gz.
+# Свежие (моложе STEAM_APPDETAILS_TTL) отдаются без сети; устаревшие
+# перезапрашиваются условно (If-None-Match / If-Modified-Since, если Steam их дал).
+# STEAM_APPDETAILS_OFFLINE=True — только кэш, любой давности (тесты, бенчмарки).
+import gzip
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+from products.services import steam_client, steam_inflight
+
+APPDETAILS_PATH = "/api/appdetails"
+
+
+def cache_dir() -> Path:
+    return Path(getattr(settings, "STEAM_APPDETAILS_CACHE_DIR", settings.BASE_DIR / "var" / "steam_appdetails"))
+
+
+def ttl() -> int:
+    return int(getattr(settings, "STEAM_APPDETAILS_TTL", 60 * 60 * 24 * 7))
+
+
+def offline() -> bool:
+    return bool(getattr(settings, "STEAM_APPDETAILS_OFFLINE", False))
+
+
+def path_for(appid, cc: str = "us", lang: str = "en") -> Path:
+    appid = int(appid)
+    return cache_dir() / f"{cc}-{lang}" / f"{appid // 1000:04d}" / f"{appid}.json.gz"
+
+
+def read(appid, cc: str = "us", lang: str = "en") -> dict | None:
+    """Запись кэша: {"appid", "cc", "lang", "fetched_at", "etag", "last_modified", "body"} или None."""
+    try:
+        with gzip.open(path_for(appid, cc, lang), "rt", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (FileNotFoundError, EOFError, OSError, ValueError):
+        return None
+
+
+def write(entry: dict) -> Path:
+    path = path_for(entry["appid"], entry["cc"], entry["lang"])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # pid + поток: одну запись могут одновременно писать потоки одного процесса
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=6) as fh:
+        json.dump(entry, fh, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+    return path
+
+
+def is_fresh(entry: dict | None) -> bool:
+    return bool(entry) and time.time() - entry.get("fetched_at", 0) < ttl()
+
+
+def fetch(appid, *, cc: str = "us", lang: str = "en", refresh: bool = False):
+    """
+    Ответ appdetails (распарсенный JSON) через кэш. refresh=True — мимо TTL,
+    но всё равно условным запросом. Ошибки сети — steam_client.SteamRequestError.
+    """
+    appid = str(appid)
+    entry = read(appid, cc, lang) if appid.isdigit() else None
+    if entry and (offline() or (not refresh and is_fresh(entry))):
+        return entry["body"]
+    if offline():
+        raise steam_client.SteamRequestError(f"appdetails {appid} ({cc}/{lang}) нет в кэше, а STEAM_APPDETAILS_OFFLINE включён")
+
+    if not appid.isdigit():
+        return _fetch_remote(appid, cc, lang, entry)
+
+    # одинаковый запрос из другого потока/процесса уже в полёте — ждём его записи в кэш
+    requested_at = time.time()
+
+    def ready():
+        fresh = read(appid, cc, lang)
+        return fresh["body"] if fresh and fresh.get("fetched_at", 0) >= requested_at else None
+
+    return steam_inflight.coalesce(
+        f"appdetails:{appid}:{cc}-{lang}",
+        produce=lambda: _fetch_remote(appid, cc, lang, entry),
+        ready=ready,
+    )
+
+
+def _fetch_remote(appid: str, cc: str, lang: str, entry: dict | None):
+    headers = {}
+    if entry and entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry and entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+
+    url = steam_client.store_url(APPDETAILS_PATH)
+    response = steam_client.get(f"{url}?appids={appid}&cc={cc}&l={lang}", timeout=10, headers=headers)
+    if response.status_code == 304 and entry:
+        entry["fetched_at"] = time.time()
+        write(entry)
+        return entry["body"]
+    try:
+        body = response.json()
+    except ValueError as e:
+        raise steam_client.SteamRequestError(f"appdetails {appid}: ответ не JSON (HTTP {response.status_code})") from e
+
+    # кэшируем и success=false — это тоже ответ Steam, а не сбой
+    if response.status_code == 200 and isinstance(body, dict) and appid.isdigit():
+        write({
+            "appid": int(appid),
+            "cc": cc,
+            "lang": lang,
+            "fetched_at": time.time(),
+            "etag": response.headers.get("ETag", ""),
+            "last_modified": response.headers.get("Last-Modified", ""),
+            "body": body,
+        })
+    return body
+
+
+def entries():
+    """(path, cc-lang, размер, mtime) по всем файлам кэша — для stats/prune без распаковки."""
+    root = cache_dir()
+    if not root.exists():
+        return
+    for locale_dir in root.iterdir():
+        if not locale_dir.is_dir():
+            continue
+        for path in locale_dir.glob("*/*.json.gz"):
+            stat = path.stat()
+            yield path, locale_dir.name, stat.st_size, stat.st_mtime
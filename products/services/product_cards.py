@@ -0,0 +1,78 @@
+from rest_framework.renderers import JSONRenderer
+
+from products.api.querysets import query_plan, PRODUCT_QUERY_PROFILES
+from products.api.serializers import ProductListSerializer
+from products.models import Product, ProductCard
+
+BATCH_SIZE = 500
+
+PAYLOAD_FIELD = "card__payload"
+CARD_UPDATED_FIELD = "card__updated_at"
+# что списку нужно от строки продукта, чтобы отдать карточку или понять, что она устарела
+ROW_FIELDS = ("id", "updated_at", PAYLOAD_FIELD, CARD_UPDATED_FIELD)
+
+
+def _list_queryset():
+    # без фильтра is_active: карточка нужна и неактивному продукту, когда его включат
+    return query_plan(PRODUCT_QUERY_PROFILES["list"]).apply(Product.objects.all())
+
+
+def render_card(product) -> str:
+    """JSON карточки — байт-в-байт то, что отдал бы ProductListSerializer."""
+    return JSONRenderer().render(ProductListSerializer(product).data).decode("utf-8")
+
+
+def rebuild(product_ids) -> dict[int, str]:
+    """Пересобирает карточки для product_ids; возвращает {id: payload}."""
+    product_ids = list(product_ids)
+    payloads = {}
+    for start in range(0, len(product_ids), BATCH_SIZE):
+        chunk = product_ids[start:start + BATCH_SIZE]
+        cards = [
+            ProductCard(product_id=product.id, payload=render_card(product))
+            for product in _list_queryset().filter(id__in=chunk)
+        ]
+        ProductCard.objects.bulk_create(
+            cards,
+            update_conflicts=True,
+            unique_fields=["product"],
+            update_fields=["payload", "updated_at"],
+        )
+        payloads.update((card.product_id, card.payload) for card in cards)
+    return payloads
+
+
+def rebuild_for(**filters) -> int:
+    ids = list(Product.objects.filter(**filters).values_list("id", flat=True))
+    rebuild(ids)
+    return len(ids)
+
+
+def _is_stale(row) -> bool:
+    # нет карточки (bulk-операции, продукт старше таблицы) или продукт менялся после
+    # её сборки — например, queryset.update(), который post_save не шлёт
+    if row.get(PAYLOAD_FIELD) is None:
+        return True
+    card_updated, updated = row.get(CARD_UPDATED_FIELD), row.get("updated_at")
+    return card_updated is None or (updated is not None and card_updated < updated)
+
+
+def payloads_for(rows) -> list[str]:
+    """rows — строки .values(*ROW_FIELDS, ...). Отсутствующие и устаревшие карточки собираются на лету."""
+    stale = [row["id"] for row in rows if _is_stale(row)]
+    built = rebuild(stale) if stale else {}
+    payloads = []
+    for row in rows:
+        payload = built.get(row["id"], row.get(PAYLOAD_FIELD))
+        if payload is not None:
+            payloads.append(payload)
+    return payloads
+
+
+def render_list(envelope: dict, payloads: list[str]) -> bytes:
+    """Склеивает пагинационную обёртку и готовые карточки в JSON-ответ."""
+    head = JSONRenderer().render({k: v for k, v in envelope.items() if k != "results"})
+    results = ("[" + ",".join(payloads) + "]").encode("utf-8")
+    if head == b"{}":
+        return b'{"results":' + results + b"}"
+    return head[:-1] + b',"results":' + results + b"}"
@@ -1,63 +1,114 @@
 import uuid
-from django.core.cache import cache
+from datetime import timedelta
 
-TTL = 60 * 30  # 30 минут
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from products.models import ParseJob, ParseJobMessage
+
+ITEMS = 10  # сколько последних сообщений отдаёт get()
+
+
+def _retention() -> timedelta:
+    return timedelta(hours=int(getattr(settings, "PARSE_JOB_RETENTION_HOURS", 24)))
+
+
+def _log_limit() -> int:
+    return int(getattr(settings, "PARSE_JOB_MESSAGE_LIMIT", 500))
 
-def _key(job_id: str) -> str:
-    return f"parse_job:{job_id}"
 
 def new_job(total: int) -> str:
+    # заодно убираем старые задачи (сообщения — каскадом)
+    ParseJob.objects.filter(updated_at__lt=timezone.now() - _retention()).delete()
     job_id = uuid.uuid4().hex
-    cache.set(_key(job_id), {
-        "total": int(total),
-        "processed": 0,
-        "added": 0,
-        "errors": 0,
-        "items": [],
-        "done": False,
-        "cancel": False,
-        "status": "running",
-    }, TTL)
+    ParseJob.objects.create(id=job_id, total=int(total))
     return job_id
 
+
+def _as_dict(job: ParseJob, items: list[str]) -> dict:
+    data = {
+        "total": job.total,
+        "processed": job.processed,
+        "added": job.added,
+        "errors": job.errors,
+        "items": items,
+        "done": job.done,
+        "cancel": job.cancel,
+        "status": job.status,
+    }
+    if job.http is not None:
+        data["http"] = job.http
+    return data
+
+
+def state(job_id: str) -> dict | None:
+    """Счётчики и статус без сообщений — один запрос по PK."""
+    job = ParseJob.objects.filter(pk=job_id).first()
+    return _as_dict(job, []) if job else None
+
+
 def get(job_id: str) -> dict | None:
-    return cache.get(_key(job_id))
+    data = state(job_id)
+    if data is None:
+        return None
+    items = list(ParseJobMessage.objects.filter(job_id=job_id).order_by("-id").values_list("text", flat=True)[:ITEMS])
+    data["items"] = items[::-1]
+    return data
+
+
+def messages_after(job_id: str, after_id: int | None = None, limit: int = 100) -> list[tuple[int, str]]:
+    """
+    (id, text) сообщений новее after_id — для чтения лога «с места» (SSE, Last-Event-ID).
+    after_id=None — последние limit сообщений.
+    """
+    messages = ParseJobMessage.objects.filter(job_id=job_id)
+    if after_id is None:
+        return list(messages.order_by("-id").values_list("id", "text")[:limit])[::-1]
+    return list(messages.filter(id__gt=after_id).order_by("id").values_list("id", "text")[:limit])
+
+
+def _log(job_id: str, msg: str):
+    ParseJobMessage.objects.create(job_id=job_id, text=msg)
+    # лог ограничен: когда у задачи набралось limit + limit/10 сообщений, срезаем всё
+    # старше последних limit (проверка — по индексу (job, -id), только сообщения этой задачи)
+    limit = _log_limit()
+    overflow = limit + max(limit // 10, 1)
+    messages = ParseJobMessage.objects.filter(job_id=job_id).order_by("-id").values_list("id", flat=True)
+    if messages[overflow - 1:overflow]:
+        boundary = messages[limit:limit + 1]
+        ParseJobMessage.objects.filter(job_id=job_id, id__lte=boundary[0]).delete()
 
-def update(job_id: str, *, processed=None, added=None, errors=None, msg: str | None = None):
-    data = cache.get(_key(job_id))
-    if not data:
+
+def update(job_id: str, *, processed=None, added=None, errors=None, msg: str | None = None, http=None):
+    """Абсолютные значения счётчиков — одним UPDATE, без чтения."""
+    fields = {}
+    if processed is not None: fields["processed"] = int(processed)
+    if added is not None:     fields["added"] = int(added)
+    if errors is not None:    fields["errors"] = int(errors)
+    if http is not None:      fields["http"] = http
+    if not ParseJob.objects.filter(pk=job_id).update(updated_at=timezone.now(), **fields):
         return
-    if processed is not None: data["processed"] = int(processed)
-    if added is not None:     data["added"] = int(added)
-    if errors is not None:    data["errors"] = int(errors)
     if msg:
-        items = data.get("items", [])
-        items.append(msg)
-        data["items"] = items[-10:]
-    cache.set(_key(job_id), data, TTL)
+        _log(job_id, msg)
+
 
 def finish(job_id: str, *, status: str | None = None):
-    data = cache.get(_key(job_id)) or {}
-    data["done"] = True
+    jobs = ParseJob.objects.filter(pk=job_id)
+    now = timezone.now()
     if status:
-        data["status"] = status
-    elif data.get("status") == "cancelled":
-        # если уже отменён — оставим cancelled
-        pass
+        jobs.update(done=True, status=status, updated_at=now)
     else:
-        data["status"] = "done"
-    cache.set(_key(job_id), data, TTL)
+        # если уже отменён — оставим cancelled
+        jobs.update(done=True, updated_at=now)
+        jobs.filter(~Q(status=ParseJob.STATUS_CANCELLED)).update(status=ParseJob.STATUS_DONE)
 
 # --- отмена ---
 def cancel(job_id: str):
     """Пометить задачу как отменённую (воркер увидит флаг и сам завершится)."""
-    data = cache.get(_key(job_id))
-    if not data:
-        return
-    data["cancel"] = True
-    data["status"] = "cancelled"
-    cache.set(_key(job_id), data, TTL)
+    ParseJob.objects.filter(pk=job_id).update(
+        cancel=True, status=ParseJob.STATUS_CANCELLED, updated_at=timezone.now()
+    )
 
 def is_cancelled(job_id: str) -> bool:
-    data = cache.get(_key(job_id)) or {}
-    return bool(data.get("cancel"))
+    return ParseJob.objects.filter(pk=job_id, cancel=True).exists()
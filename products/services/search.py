@@ -0,0 +1,154 @@
+# Полнотекстовый поиск по продуктам: title > review_headline > seo_title/seo_description.
+#   • PostgreSQL — generated-колонка search_document (tsvector) + GIN-индекс;
+#   • SQLite — FTS5-таблица products_product_fts, синхронизируется триггерами.
+# Оба варианта обновляет сама БД на любом INSERT/UPDATE, в т.ч. bulk-операциях.
+# На остальных бэкендах apply() возвращает None — остаётся обычный icontains.
+import re
+
+from django.conf import settings
+from django.db import connections, DEFAULT_DB_ALIAS
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+
+from products.models import Product
+
+TABLE = Product._meta.db_table
+PG_COLUMN = "search_document"
+PG_INDEX = f"{TABLE}_search_gin"
+FTS_TABLE = f"{TABLE}_fts"
+
+# веса колонок для bm25 (SQLite): title, review_headline, seo_text
+FTS_WEIGHTS = (10.0, 4.0, 1.0)
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+_installed: dict[str, bool] = {}
+
+
+def _config() -> str:
+    cfg = getattr(settings, "PRODUCT_SEARCH_CONFIG", "simple")
+    if not re.fullmatch(r"[a-z_]+", cfg):
+        raise ValueError(f"Недопустимая конфигурация полнотекстового поиска: {cfg!r}")
+    return cfg
+
+
+def _pg_document_sql(cfg: str) -> str:
+    return (
+        f"setweight(to_tsvector('{cfg}', coalesce(title, '')), 'A') || "
+        f"setweight(to_tsvector('{cfg}', coalesce(review_headline, '')), 'B') || "
+        f"setweight(to_tsvector('{cfg}', coalesce(seo_title, '') || ' ' || coalesce(seo_description, '')), 'C')"
+    )
+
+
+_SQLITE_SEO_TEXT = "coalesce({p}seo_title, '') || ' ' || coalesce({p}seo_description, '')"
+
+
+def _sqlite_ddl() -> list[str]:
+    seo_new = _SQLITE_SEO_TEXT.format(p="new.")
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        f"title, review_headline, seo_text, tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {TABLE} BEGIN "
+        f"INSERT INTO {FTS_TABLE}(rowid, title, review_headline, seo_text) "
+        f"VALUES (new.id, new.title, new.review_headline, {seo_new}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE ON {TABLE} BEGIN "
+        f"DELETE FROM {FTS_TABLE} WHERE rowid = old.id; "
+        f"INSERT INTO {FTS_TABLE}(rowid, title, review_headline, seo_text) "
+        f"VALUES (new.id, new.title, new.review_headline, {seo_new}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {TABLE} BEGIN "
+        f"DELETE FROM {FTS_TABLE} WHERE rowid = old.id; END",
+    ]
+
+
+def install(using: str = DEFAULT_DB_ALIAS) -> bool:
+    """Идемпотентно создаёт поисковый индекс для текущего бэкенда (вызывается из post_migrate)."""
+    connection = connections[using]
+    vendor = connection.vendor
+    with connection.cursor() as cursor:
+        if vendor == "postgresql":
+            cursor.execute(
+                f"ALTER TABLE {TABLE} ADD COLUMN IF NOT EXISTS {PG_COLUMN} tsvector "
+                f"GENERATED ALWAYS AS ({_pg_document_sql(_config())}) STORED"
+            )
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {PG_INDEX} ON {TABLE} USING gin ({PG_COLUMN})")
+        elif vendor == "sqlite":
+            try:
+                for statement in _sqlite_ddl():
+                    cursor.execute(statement)
+            except Exception:
+                # SQLite собран без FTS5 — остаёмся на icontains
+                _installed[using] = False
+                return False
+            rebuild(using)
+        else:
+            return False
+    _installed[using] = True
+    return True
+
+
+def rebuild(using: str = DEFAULT_DB_ALIAS) -> None:
+    """Полная переиндексация FTS5 (PostgreSQL пересчитывает generated-колонку сам)."""
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}(rowid, title, review_headline, seo_text) "
+            f"SELECT id, title, review_headline, {_SQLITE_SEO_TEXT.format(p='')} FROM {TABLE}"
+        )
+
+
+def is_available(using: str = DEFAULT_DB_ALIAS) -> bool:
+    if using not in _installed:
+        connection = connections[using]
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                columns = connection.introspection.get_table_description(cursor, TABLE)
+            _installed[using] = any(c.name == PG_COLUMN for c in columns)
+        elif connection.vendor == "sqlite":
+            _installed[using] = FTS_TABLE in connection.introspection.table_names()
+        else:
+            _installed[using] = False
+    return _installed[using]
+
+
+def tokens(term: str) -> list[str]:
+    return TOKEN_RE.findall(term or "")
+
+
+def apply(queryset, term: str):
+    """
+    Фильтрует queryset по полнотекстовому запросу и аннотирует search_rank
+    (больше — релевантнее). Каждое слово ищется по префиксу, слова через AND.
+    Возвращает None, если полнотекстовый индекс недоступен.
+    """
+    words = tokens(term)
+    if not words:
+        return queryset
+    using = queryset.db
+    if not is_available(using):
+        return None
+
+    vendor = connections[using].vendor
+    if vendor == "postgresql":
+        tsquery = "to_tsquery(%s::regconfig, %s)"
+        params = [_config(), " & ".join(f"{w}:*" for w in words)]
+        return queryset.filter(
+            RawSQL(f"{TABLE}.{PG_COLUMN} @@ {tsquery}", params, output_field=BooleanField())
+        ).annotate(
+            search_rank=RawSQL(f"ts_rank({TABLE}.{PG_COLUMN}, {tsquery})", params, output_field=FloatField())
+        )
+
+    match = " ".join('"{}"*'.format(w.replace('"', '""')) for w in words)
+    weights = ", ".join(str(w) for w in FTS_WEIGHTS)
+    return queryset.filter(
+        id__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match])
+    ).annotate(
+        search_rank=RawSQL(
+            f"SELECT -bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND rowid = {TABLE}.id",
+            [match],
+            output_field=FloatField(),
+        )
+    )
@@ -0,0 +1,177 @@
+# Локальное зеркало каталога Steam (appid → name) для random-режима и поиска имени
+# без сети. Хранится поколениями в STEAM_CATALOG_DIR:
+#   <gen>/appids.u32   — отсортированные appid (uint32, little-endian)
+#   <gen>/offsets.u32  — n+1 смещений имён в names.bin
+#   <gen>/names.bin    — имена подряд в UTF-8
+#   CURRENT.json       — какое поколение активно + когда синхронизировано
+# Файлы читаются через mmap: старт — миллисекунды, память — page cache ОС.
+import json
+import mmap
+import os
+import random
+import shutil
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+
+from django.conf import settings
+
+POINTER = "CURRENT.json"
+KEEP_GENERATIONS = 2
+
+
+def catalog_dir() -> Path:
+    return Path(getattr(settings, "STEAM_CATALOG_DIR", settings.BASE_DIR / "var" / "steam_catalog"))
+
+
+def _u32(values) -> array:
+    arr = array("I", values)
+    if arr.itemsize != 4:
+        arr = array("L", values)
+    return arr
+
+
+class Catalog:
+    """Только чтение. Держит mmap всех трёх файлов поколения."""
+
+    def __init__(self, path: Path, meta: dict):
+        self.path = path
+        self.meta = meta
+        self._files = []
+        self.appids = self._map("appids.u32")
+        self.offsets = self._map("offsets.u32")
+        self.names = self._map("names.bin", cast=None)
+
+    def _map(self, name, cast="I"):
+        fh = open(self.path / name, "rb")
+        self._files.append(fh)
+        if os.fstat(fh.fileno()).st_size == 0:
+            view = memoryview(b"")
+        else:
+            view = memoryview(mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ))
+        if cast is None:
+            return view
+        if sys.byteorder != "little":
+            # редкий случай — читаем в память и разворачиваем порядок байт
+            arr = array("I", view.tobytes())
+            arr.byteswap()
+            return memoryview(arr)
+        return view.cast(cast)
+
+    def __len__(self):
+        return len(self.appids)
+
+    def __contains__(self, appid) -> bool:
+        return self._index(int(appid)) is not None
+
+    def _index(self, appid: int):
+        i = bisect_left(self.appids, appid)
+        if i < len(self.appids) and self.appids[i] == appid:
+            return i
+        return None
+
+    def _name_at(self, i: int) -> str:
+        return bytes(self.names[self.offsets[i]:self.offsets[i + 1]]).decode("utf-8", "replace")
+
+    def name(self, appid) -> str | None:
+        i = self._index(int(appid))
+        return None if i is None else self._name_at(i)
+
+    def random_ids(self, count: int, exclude=(), rng=random) -> list[str]:
+        """count случайных appid (строками, как steam_id у Product), без повторов и exclude."""
+        total = len(self.appids)
+        if not total:
+            return []
+        exclude = set(exclude)
+        picked = {}
+        # выборка по индексам: O(count), без копии массива
+        for _ in range(count * 20):
+            if len(picked) >= count:
+                break
+            appid = str(self.appids[rng.randrange(total)])
+            if appid not in exclude:
+                picked[appid] = None
+        return list(picked)
+
+    def items(self):
+        for i in range(len(self.appids)):
+            yield self.appids[i], self._name_at(i)
+
+
+_lock = threading.Lock()
+_loaded: tuple[float, Catalog | None] | None = None
+
+
+def load() -> Catalog | None:
+    """Текущее поколение (кэшируется в процессе до смены CURRENT.json); None — зеркала нет."""
+    global _loaded
+    pointer = catalog_dir() / POINTER
+    try:
+        stamp = pointer.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    loaded = _loaded
+    if loaded and loaded[0] == stamp:
+        return loaded[1]
+    with _lock:
+        meta = json.loads(pointer.read_text("utf-8"))
+        catalog = Catalog(catalog_dir() / meta["generation"], meta)
+        _loaded = (stamp, catalog)
+    return catalog
+
+
+def write(apps: dict[int, str], *, synced_at: float | None = None, **meta) -> dict:
+    """Пишет новое поколение и атомарно переключает на него CURRENT.json."""
+    root = catalog_dir()
+    root.mkdir(parents=True, exist_ok=True)
+    generation = f"gen-{time.time_ns()}"
+    tmp = root / f".{generation}"
+    tmp.mkdir()
+
+    appids = sorted(apps)
+    offsets = _u32([0])
+    with open(tmp / "names.bin", "wb") as names:
+        position = 0
+        for appid in appids:
+            encoded = (apps[appid] or "").encode("utf-8")
+            names.write(encoded)
+            position += len(encoded)
+            offsets.append(position)
+    for name, arr in (("appids.u32", _u32(appids)), ("offsets.u32", offsets)):
+        if sys.byteorder != "little":
+            arr.byteswap()
+        with open(tmp / name, "wb") as fh:
+            arr.tofile(fh)
+    os.replace(tmp, root / generation)
+
+    meta = {
+        **meta,
+        "generation": generation,
+        "count": len(appids),
+        "synced_at": synced_at if synced_at is not None else time.time(),
+    }
+    pointer_tmp = root / f".{POINTER}.tmp"
+    pointer_tmp.write_text(json.dumps(meta), "utf-8")
+    os.replace(pointer_tmp, root / POINTER)
+    _prune(root, keep=generation)
+    return meta
+
+
+def _prune(root: Path, keep: str):
+    generations = sorted(p for p in root.iterdir() if p.is_dir() and p.name.startswith("gen-"))
+    for path in generations[:-KEEP_GENERATIONS]:
+        if path.name != keep:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def random_ids(count: int, exclude=()) -> list[str] | None:
+    catalog = load()
+    return catalog.random_ids(count, exclude=exclude) if catalog else None
+
+
+def name_of(appid) -> str | None:
+    catalog = load()
+    return catalog.name(appid) if catalog else None
@@ -0,0 +1,274 @@
+# HTTP-клиент для Steam: одна keep-alive сессия на процесс, token bucket на хост
+# (общий для всех потоков), адаптивный backoff на 429/5xx с учётом Retry-After
+# и счётчики по хостам: общие на процесс и свои у каждой задачи (scoped_stats).
+import contextvars
+import random
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_BACKOFF = 60.0
+
+# хосты с лимитами (API и витрина); CDN картинок не ограничиваем
+LIMITED_HOST_SUFFIXES = ("steampowered.com",)
+# CDN картинок Steam — их URL из appdetails можно перенаправить (STEAM_CDN_BASE_URL)
+CDN_HOST_SUFFIXES = ("steamstatic.com", "akamaihd.net")
+
+
+class SteamRequestError(Exception):
+    pass
+
+
+class TokenBucket:
+    """
+    rate токенов/сек, ёмкость burst. На 429 скорость падает вдвое и хост ставится
+    на паузу (Retry-After), на успехах — плавно возвращается к исходной (AIMD).
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.max_rate = self.rate = float(rate)
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        if now > self.updated:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def acquire(self) -> float:
+        """Ждёт токен; возвращает, сколько секунд пришлось ждать."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self.blocked_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = max(self.blocked_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(delay)
+            waited += delay
+
+    def throttle(self, pause: float):
+        with self._lock:
+            now = time.monotonic()
+            self.blocked_until = max(self.blocked_until, now + pause)
+            self.rate = max(self.max_rate / 16, self.rate / 2)
+            self.tokens = 0.0
+            self.updated = self.blocked_until
+
+    def recover(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+
+_lock = threading.Lock()
+_session: requests.Session | None = None
+_buckets: dict[str, TokenBucket | None] = {}
+_stats = defaultdict(lambda: {"requests": 0, "retries": 0, "throttled": 0, "errors": 0, "wait_seconds": 0.0})
+_scope: contextvars.ContextVar["HttpStats | None"] = contextvars.ContextVar("steam_http_stats", default=None)
+
+
+# ────────────────────────────────
+# Базовые URL (настраиваются — например, на локальный fake_steam_server)
+# ────────────────────────────────
+
+def store_url(path: str) -> str:
+    """URL витрины (store.steampowered.com) — appdetails."""
+    return getattr(settings, "STEAM_STORE_BASE_URL", "https://store.steampowered.com").rstrip("/") + path
+
+
+def web_api_url(path: str) -> str:
+    """URL Web API (api.steampowered.com) — GetAppList и т.п."""
+    return getattr(settings, "STEAM_WEB_API_BASE_URL", "https://api.steampowered.com").rstrip("/") + path
+
+
+def cdn_url(url: str) -> str:
+    """URL картинки из appdetails; с STEAM_CDN_BASE_URL хост CDN Steam подменяется на него."""
+    base = getattr(settings, "STEAM_CDN_BASE_URL", "")
+    parts = urlsplit(url or "")
+    if not base or not (parts.hostname or "").endswith(CDN_HOST_SUFFIXES):
+        return url
+    query = f"?{parts.query}" if parts.query else ""
+    return f"{base.rstrip('/')}{parts.path}{query}"
+
+
+def _limited(host: str) -> bool:
+    configured = {
+        urlsplit(store_url("/")).hostname,
+        urlsplit(web_api_url("/")).hostname,
+    }
+    return host.endswith(LIMITED_HOST_SUFFIXES) or host in configured
+
+
+def session() -> requests.Session:
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                pool_size = int(getattr(settings, "STEAM_HTTP_POOL_SIZE", 16))
+                s = requests.Session()
+                adapter = HTTPAdapter(pool_connections=8, pool_maxsize=pool_size)
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                _session = s
+    return _session
+
+
+def _bucket(host: str) -> TokenBucket | None:
+    if host not in _buckets:
+        with _lock:
+            if host not in _buckets:
+                limited = _limited(host)
+                _buckets[host] = TokenBucket(
+                    rate=float(getattr(settings, "STEAM_RATE_LIMIT", 4)),
+                    burst=float(getattr(settings, "STEAM_RATE_BURST", 8)),
+                ) if limited else None
+    return _buckets[host]
+
+
+class HttpStats:
+    """Счётчики по хостам только для запросов из своего контекста (одна задача импорта)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows = defaultdict(lambda: {"requests": 0, "retries": 0, "throttled": 0, "errors": 0, "wait_seconds": 0.0})
+
+    def add(self, host: str, deltas: dict):
+        with self._lock:
+            row = self._rows[host]
+            for name, value in deltas.items():
+                row[name] += value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                host: {**row, "wait_seconds": round(row["wait_seconds"], 2)}
+                for host, row in self._rows.items() if row["requests"]
+            }
+
+
+@contextmanager
+def scoped_stats():
+    """
+    with scoped_stats() as http: … — считать запросы этого контекста отдельно от
+    соседних задач того же процесса. В пулы потоков контекст передаётся явно:
+    pool.submit(contextvars.copy_context().run, fn, …).
+    """
+    counters = HttpStats()
+    token = _scope.set(counters)
+    try:
+        yield counters
+    finally:
+        _scope.reset(token)
+
+
+def _count(host: str, **deltas):
+    with _lock:
+        row = _stats[host]
+        for name, value in deltas.items():
+            row[name] += value
+    scope = _scope.get()
+    if scope is not None:
+        scope.add(host, deltas)
+
+
+def _retry_after(response) -> float | None:
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff(attempt: int) -> float:
+    return min(MAX_BACKOFF, (2 ** attempt) * (0.5 + random.random()))
+
+
+def get(url: str, *, timeout: float = 10, **kwargs) -> requests.Response:
+    """
+    GET с лимитом и повторами. Возвращает успешный ответ (2xx–4xx кроме 429);
+    после исчерпания повторов — SteamRequestError с последней причиной.
+    """
+    host = urlsplit(url).hostname or ""
+    bucket = _bucket(host)
+    retries = int(getattr(settings, "STEAM_HTTP_RETRIES", 4))
+    last_error = None
+
+    for attempt in range(retries + 1):
+        if attempt:
+            _count(host, retries=1)
+        if bucket:
+            waited = bucket.acquire()
+            if waited:
+                _count(host, wait_seconds=waited)
+
+        _count(host, requests=1)
+        try:
+            response = session().get(url, timeout=timeout, **kwargs)
+        except requests.RequestException as e:
+            last_error = e
+            pause = _backoff(attempt)
+        else:
+            if response.status_code not in RETRY_STATUSES:
+                if bucket:
+                    bucket.recover()
+                return response
+            last_error = f"HTTP {response.status_code}"
+            pause = _retry_after(response) or _backoff(attempt)
+            if response.status_code == 429:
+                _count(host, throttled=1)
+            response.close()
+
+        if attempt == retries:
+            break
+        if bucket:
+            # пауза общая для всех потоков, которые ходят на этот хост
+            bucket.throttle(pause)
+        else:
+            time.sleep(pause)
+            _count(host, wait_seconds=pause)
+
+    _count(host, errors=1)
+    raise SteamRequestError(f"{host}: {last_error} (после {retries} повторов)")
+
+
+def get_json(url: str, *, timeout: float = 10):
+    response = get(url, timeout=timeout)
+    try:
+        return response.json()
+    except ValueError as e:
+        raise SteamRequestError(f"{urlsplit(url).hostname}: ответ не JSON (HTTP {response.status_code})") from e
+
+
+def stats() -> dict:
+    """Снимок счётчиков по хостам с момента старта процесса (все задачи и потоки)."""
+    with _lock:
+        return {host: dict(row) for host, row in _stats.items()}
+
+
+def stats_since(baseline: dict) -> dict:
+    """Счётчики процесса за период: stats() минус baseline (без параллельных задач — для бенчмарка)."""
+    result = {}
+    for host, row in stats().items():
+        base = baseline.get(host, {})
+        delta = {name: value - base.get(name, 0) for name, value in row.items()}
+        if delta["requests"]:
+            delta["wait_seconds"] = round(delta["wait_seconds"], 2)
+            result[host] = delta
+    return result
@@ -0,0 +1,298 @@
+# Локальная подмена Steam для бенчмарков и тестов без сети: HTTP-сервер отдаёт
+# записанный корпус (appdetails, GetAppList, картинки) с настраиваемой задержкой
+# и инъекцией 5xx/429. Импорт направляется на него настройками
+# STEAM_STORE_BASE_URL / STEAM_WEB_API_BASE_URL / STEAM_CDN_BASE_URL
+# (FakeSteamServer.settings()).
+#
+# Корпус — каталог:
+#   appdetails/<appid>.json  тело ответа appdetails как есть ({"<appid>": {...}})
+#   applist.json             {"applist": {"apps": [{"appid", "name"}, ...]}}
+#   images/<имя файла>       картинки; чего нет — отдаётся заглушка
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from PIL import Image
+
+from products.services import appdetails_cache, steam_client
+
+IMAGE_SUFFIXES = (".jpg", ".jpeg", ".png", ".webp", ".gif")
+CDN_BASE = "https://shared.akamai.steamstatic.com/store_item_assets/steam/apps"
+
+
+# ────────────────────────────────
+# Корпус
+# ────────────────────────────────
+
+class Corpus:
+    """Корпус в памяти: тела appdetails (байты), список приложений, картинки по имени файла."""
+
+    def __init__(self, appdetails: dict[int, bytes], apps: list[dict], images: dict[str, bytes]):
+        self.appdetails = appdetails
+        self.apps = apps
+        self.images = images
+
+    @classmethod
+    def load(cls, path) -> "Corpus":
+        path = Path(path)
+        appdetails = {
+            int(file.stem): file.read_bytes()
+            for file in (path / "appdetails").glob("*.json") if file.stem.isdigit()
+        }
+        try:
+            apps = json.loads((path / "applist.json").read_text(encoding="utf-8"))["applist"]["apps"]
+        except FileNotFoundError:
+            apps = [{"appid": appid, "name": ""} for appid in sorted(appdetails)]
+        images = {file.name: file.read_bytes() for file in (path / "images").glob("*") if file.is_file()}
+        return cls(appdetails, apps, images)
+
+
+def _write_corpus(path, appdetails: dict[int, dict], apps: list[dict]):
+    path = Path(path)
+    (path / "appdetails").mkdir(parents=True, exist_ok=True)
+    (path / "images").mkdir(exist_ok=True)
+    for appid, body in appdetails.items():
+        (path / "appdetails" / f"{appid}.json").write_text(
+            json.dumps(body, ensure_ascii=False, separators=(",", ":")), encoding="utf-8"
+        )
+    (path / "applist.json").write_text(json.dumps({"applist": {"apps": apps}}), encoding="utf-8")
+
+
+def generate_corpus(path, count: int = 1000, *, seed: int = 0, invalid_share: float = 0.1) -> int:
+    """Синтетический корпус правдоподобной формы — для CI без записанных ответов."""
+    rng = random.Random(seed)
+    genres = ["Action", "Adventure", "Indie", "RPG", "Strategy", "Simulation", "Casual", "Sports"]
+    appdetails, apps = {}, []
+    for i in range(count):
+        appid = 10 + i * 10
+        name = f"Benchmark App {appid}"
+        apps.append({"appid": appid, "name": name})
+        if rng.random() < invalid_share:
+            appdetails[appid] = {str(appid): {"success": False}}
+            continue
+        shots = [
+            {"id": n, "path_full": f"{CDN_BASE}/{appid}/ss_{n}.1920x1080.jpg?t=1700000000"}
+            for n in range(rng.randint(2, 6))
+        ]
+        minimum = (
+            "<strong>Minimum:</strong><br><ul class=\"bb_ul\">"
+            f"<li><strong>OS:</strong> Windows {rng.choice([7, 10, 11])} 64-bit<br></li>"
+            f"<li><strong>Processor:</strong> Intel Core i{rng.choice([3, 5, 7])}<br></li>"
+            f"<li><strong>Memory:</strong> {rng.choice([4, 8, 16])} GB RAM<br></li>"
+            f"<li><strong>Graphics:</strong> GTX {rng.choice([660, 970, 1060])}<br></li>"
+            f"<li><strong>Storage:</strong> {rng.randint(1, 120)} GB available space</li></ul>"
+        )
+        appdetails[appid] = {str(appid): {"success": True, "data": {
+            "type": "game" if rng.random() < 0.8 else "dlc",
+            "name": name,
+            "steam_appid": appid,
+            "required_age": rng.choice([0, 0, 0, 13, 18]),
+            "header_image": f"{CDN_BASE}/{appid}/header.jpg?t=1700000000",
+            "short_description": "Lorem ipsum " * rng.randint(5, 40),
+            "detailed_description": "<p>" + "Lorem ipsum dolor sit amet. " * rng.randint(20, 200) + "</p>",
+            "pc_requirements": {"minimum": minimum},
+            "developers": [f"Studio {rng.randint(1, 50)}"],
+            "publishers": [f"Publisher {rng.randint(1, 20)}"],
+            "genres": [{"id": str(n), "description": g} for n, g in enumerate(rng.sample(genres, rng.randint(1, 3)))],
+            "categories": [{"id": 2, "description": "Single-player"}],
+            "screenshots": shots,
+            "release_date": {"coming_soon": False, "date": f"{rng.randint(1, 28)} {rng.choice(['Jan', 'Mar', 'Jun', 'Oct'])}, {rng.randint(2005, 2025)}"},
+        }}}
+    _write_corpus(path, appdetails, apps)
+    return len(appdetails)
+
+
+def record_corpus(path, *, cc: str = "us", lang: str = "en", limit: int | None = None, images: bool = False) -> int:
+    """Корпус из дискового кэша appdetails (уже записанные ответы Steam); images — докачать картинки."""
+    appdetails, apps = {}, []
+    for file, locale, _size, _mtime in appdetails_cache.entries():
+        if locale != f"{cc}-{lang}":
+            continue
+        entry = appdetails_cache.read(file.name.split(".")[0], cc, lang)
+        if not entry:
+            continue
+        appdetails[entry["appid"]] = entry["body"]
+        data = (entry["body"].get(str(entry["appid"])) or {}).get("data") or {}
+        apps.append({"appid": entry["appid"], "name": data.get("name", "")})
+        if limit and len(appdetails) >= limit:
+            break
+    _write_corpus(path, appdetails, sorted(apps, key=lambda app: app["appid"]))
+
+    if images:
+        for body in appdetails.values():
+            data = (next(iter(body.values())) or {}).get("data") or {}
+            urls = [data.get("header_image")] + [s.get("path_full") for s in data.get("screenshots", [])[:3]]
+            for url in filter(None, urls):
+                target = Path(path) / "images" / Path(urlsplit(url).path).name
+                if target.exists():
+                    continue
+                try:
+                    target.write_bytes(steam_client.get(url, timeout=15).content)
+                except steam_client.SteamRequestError:
+                    continue
+    return len(appdetails)
+
+
+def _placeholder_image() -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (460, 215), (27, 40, 56)).save(buffer, "JPEG", quality=80)
+    return buffer.getvalue()
+
+
+# ────────────────────────────────
+# Сервер
+# ────────────────────────────────
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_Server"
+    protocol_version = "HTTP/1.1"  # keep-alive, как у настоящего Steam
+    disable_nagle_algorithm = True  # иначе заголовки и тело ждут delayed ACK (~40 мс на ответ)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status: int, body: bytes = b"", content_type: str = "application/json", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def _inject(self) -> bool:
+        """Задержка и искусственные сбои; True — ответ уже отправлен."""
+        options = self.server.options
+        if options["latency"]:
+            jitter = options["jitter"]
+            time.sleep(max(0.0, options["latency"] * (1 + random.uniform(-jitter, jitter))))
+        roll = random.random()
+        if roll < options["throttle_rate"]:
+            self.server.count("throttled")
+            self._send(429, b"", headers={"Retry-After": str(options["retry_after"])})
+            return True
+        if roll < options["throttle_rate"] + options["error_rate"]:
+            self.server.count("errors")
+            self._send(503, b"")
+            return True
+        return False
+
+    def do_GET(self):
+        self.server.count("requests")
+        if self._inject():
+            return
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        corpus = self.server.corpus
+
+        if url.path.rstrip("/") == appdetails_cache.APPDETAILS_PATH:
+            appid = (query.get("appids") or [""])[0]
+            body = corpus.appdetails.get(int(appid)) if appid.isdigit() else None
+            if body is None:
+                body = json.dumps({appid: {"success": False}}).encode()
+            etag = f'"{hashlib.md5(body).hexdigest()}"'
+            if self.headers.get("If-None-Match") == etag:
+                self._send(304, headers={"ETag": etag})
+            else:
+                self._send(200, body, headers={"ETag": etag})
+        elif url.path.rstrip("/") == "/ISteamApps/GetAppList/v2":
+            self._send(200, json.dumps({"applist": {"apps": corpus.apps}}).encode())
+        elif url.path.rstrip("/") == "/IStoreService/GetAppList/v1":
+            last_appid = int((query.get("last_appid") or ["0"])[0] or 0)
+            limit = int((query.get("max_results") or ["10000"])[0])
+            page = [app for app in corpus.apps if app["appid"] > last_appid][:limit + 1]
+            more = len(page) > limit
+            page = page[:limit]
+            response = {"apps": page, "have_more_results": more}
+            if page:
+                response["last_appid"] = page[-1]["appid"]
+            self._send(200, json.dumps({"response": response}).encode())
+        elif url.path.lower().endswith(IMAGE_SUFFIXES):
+            name = Path(url.path).name
+            self._send(200, corpus.images.get(name) or self.server.placeholder, content_type="image/jpeg")
+        else:
+            self._send(404, b'{"error": "not found"}')
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, corpus: Corpus, options: dict, verbose: bool = False):
+        super().__init__(address, _Handler)
+        self.corpus = corpus
+        self.options = options
+        self.verbose = verbose
+        self.placeholder = _placeholder_image()
+        self.counters = {"requests": 0, "throttled": 0, "errors": 0}
+        self._lock = threading.Lock()
+
+    def count(self, name: str):
+        with self._lock:
+            self.counters[name] += 1
+
+
+class FakeSteamServer:
+    """
+    Фейковый Steam в фоновом потоке — для тестов и бенчмарков:
+
+        with FakeSteamServer(corpus_dir, latency=0.05) as fake, override_settings(**fake.settings()):
+            ...  # импорт ходит в fake, а не в Steam
+
+    latency — секунды (± jitter доля), error_rate / throttle_rate — доля ответов 503 / 429.
+    """
+
+    def __init__(self, corpus, *, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 jitter: float = 0.5, error_rate: float = 0.0, throttle_rate: float = 0.0,
+                 retry_after: int = 1, verbose: bool = False):
+        self.corpus = corpus if isinstance(corpus, Corpus) else Corpus.load(corpus)
+        self.options = {
+            "latency": latency, "jitter": jitter, "error_rate": error_rate,
+            "throttle_rate": throttle_rate, "retry_after": retry_after,
+        }
+        self._server = _Server((host, port), self.corpus, self.options, verbose=verbose)
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def counters(self) -> dict:
+        return dict(self._server.counters)
+
+    def settings(self) -> dict:
+        """Настройки, которые направляют импорт на этот сервер."""
+        return {
+            "STEAM_STORE_BASE_URL": self.url,
+            "STEAM_WEB_API_BASE_URL": self.url,
+            "STEAM_CDN_BASE_URL": self.url,
+        }
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def start(self) -> "FakeSteamServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-steam", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
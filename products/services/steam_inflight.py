@@ -0,0 +1,158 @@
+# Реестр «работы в полёте» для импорта из Steam: два импорта (или один, запущенный
+# дважды) не качают один и тот же appdetails и не конвертируют одни и те же картинки.
+#   • внутри процесса — словарь key → Event: потоки ждут лидера без запросов к БД;
+#   • между процессами — строка SteamLock: кто вставил, тот и делает; остальные
+#     опрашивают, пока результат не появится (ready()) или блокировка не освободится.
+# Результат лидера ожидающие берут не из памяти, а из того же места, куда он его
+# положил (дисковый кэш appdetails, поля продукта) — поэтому это работает и между
+# процессами, и после перезапуска.
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, transaction
+from django.utils import timezone
+
+from products.models import SteamLock
+
+POLL_INTERVAL = 0.2  # сек — как часто ожидающий проверяет чужую блокировку
+
+_lock = threading.Lock()
+_local: dict[str, threading.Event] = {}
+_stats = Counter()
+
+
+def db_locks() -> bool:
+    return bool(getattr(settings, "STEAM_INFLIGHT_DB_LOCKS", True))
+
+
+def ttl() -> int:
+    return int(getattr(settings, "STEAM_INFLIGHT_TTL", 120))
+
+
+def new_owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def stats() -> dict:
+    """Сколько раз работу сделали сами, а сколько дождались чужой (в этом процессе)."""
+    with _lock:
+        return dict(_stats)
+
+
+def _count(name: str):
+    with _lock:
+        _stats[name] += 1
+
+
+# ────────────────────────────────
+# Таблица блокировок
+# ────────────────────────────────
+
+def claim(keys, owner: str, seconds: int | None = None) -> set[str]:
+    """Занять ключи разом (3 запроса на пачку); возвращает те, что достались owner."""
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return set()
+    now = timezone.now()
+    SteamLock.objects.filter(key__in=keys, locked_until__lt=now).delete()
+    SteamLock.objects.bulk_create(
+        [SteamLock(key=key, owner=owner, locked_until=now + timedelta(seconds=seconds or ttl())) for key in keys],
+        ignore_conflicts=True,
+    )
+    return set(SteamLock.objects.filter(key__in=keys, owner=owner).values_list("key", flat=True))
+
+
+def claim_one(key: str, owner: str, seconds: int | None = None) -> bool:
+    now = timezone.now()
+    SteamLock.objects.filter(key=key, locked_until__lt=now).delete()
+    try:
+        with transaction.atomic():
+            SteamLock.objects.create(key=key, owner=owner, locked_until=now + timedelta(seconds=seconds or ttl()))
+    except IntegrityError:
+        return False
+    return True
+
+
+def release(keys, owner: str):
+    keys = list(keys)
+    if keys:
+        SteamLock.objects.filter(key__in=keys, owner=owner).delete()
+
+
+def is_locked(key: str) -> bool:
+    return SteamLock.objects.filter(key=key, locked_until__gte=timezone.now()).exists()
+
+
+# ────────────────────────────────
+# Слияние одинаковой работы
+# ────────────────────────────────
+
+def _wait_remote(key: str, ready, deadline: float):
+    """Ждём другой процесс: результат (ready() не None) или None, если блокировка ушла без него."""
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        result = ready()
+        if result is not None:
+            return result
+        if not is_locked(key):
+            return ready()
+    return None
+
+
+def coalesce(key: str, produce, ready):
+    """
+    produce() — сделать работу (и положить результат туда, откуда его читает ready()).
+    ready() — готовый результат или None. Если ту же работу уже делает другой поток
+    или процесс — ждём его и возвращаем ready(); не дождались — делаем сами.
+    """
+    deadline = time.monotonic() + ttl()
+    while True:
+        with _lock:
+            event = _local.get(key)
+            leader = event is None
+            if leader:
+                event = _local[key] = threading.Event()
+        if not leader:
+            event.wait(max(0.0, deadline - time.monotonic()))
+            result = ready()
+            if result is not None:
+                _count("waited")
+                return result
+            if time.monotonic() < deadline:
+                continue  # лидер не справился — попробуем стать лидером сами
+            _count("produced")
+            return produce()
+
+        owner = new_owner()
+        claimed = False
+        try:
+            if db_locks():
+                try:
+                    claimed = claim_one(key, owner)
+                    if not claimed:
+                        result = _wait_remote(key, ready, deadline)
+                        if result is not None:
+                            _count("waited")
+                            return result
+                        claimed = claim_one(key, owner)
+                except DatabaseError:
+                    # таблица блокировок недоступна (напр. SQLite занят чужой транзакцией) —
+                    # остаётся слияние внутри процесса
+                    _count("lock_errors")
+            _count("produced")
+            return produce()
+        finally:
+            if claimed:
+                try:
+                    release([key], owner)
+                except DatabaseError:
+                    pass  # истечёт по locked_until
+            with _lock:
+                _local.pop(key, None)
+            event.set()
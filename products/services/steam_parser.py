@@ -1,83 +1,31 @@
 from .progress import (
     new_job,
     get as pg_get,
+    state as pg_state,
+    messages_after as pg_messages_after,
     update as pg_update,
     finish as pg_finish,
     cancel as pg_cancel,
     is_cancelled
 )
+import json
 import re
-import random
-import requests
-from datetime import datetime
+import time
 from django.shortcuts import render
-from django.contrib.sites.models import Site
 from django.contrib.admin.views.decorators import staff_member_required
-from django.utils.text import Truncator
-import threading
-from django.db import connection
-from django.http import JsonResponse
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 
-from products.models import Product, Category
-from products.utils.images import save_url_as_webp
-
-STEAM_API_URL = "https://store.steampowered.com/api/appdetails"
-LIMIT_SCREENSHOTS = 3
-
+from products.models import ParseJob, Product
+from products.services import appdetails_cache, steam_client, steam_verdicts, tasks
+from products.services.steam_writer import SteamProductWriter
+from products.utils.sites import all_sites, get_site_by_id, first_site
 
 # ────────────────────────────────
 # ⚙️ Вспомогательные функции
 # ────────────────────────────────
 
-def _convert_in_background(product_id: int, logo_url: str | None, screenshots: list[str] | None):
-    try:
-        product = Product.objects.filter(id=product_id).first()
-        if not product:
-            return
-        # реальная запись в модель
-        _attach_webp_assets(product, logo_url=logo_url, screenshot_urls=screenshots)
-    finally:
-        # корректно закрываем соединение БД в потоке
-        try:
-            connection.close()
-        except Exception:
-            pass
-
-
-def _attach_webp_assets(product, logo_url: str | None, screenshot_urls: list[str] | None):
-    updated_fields = []
-
-    # логотип
-    if logo_url:
-        try:
-            saved = save_url_as_webp(logo_url, base_dir='logos')
-            if hasattr(product, 'logo_file'):
-                product.logo_file = saved["path"]  # сохраняем путь для ImageField
-                updated_fields.append('logo_file')
-            elif hasattr(product, 'logo_url'):
-                product.logo_url = saved["url"]
-                updated_fields.append('logo_url')
-        except Exception:
-            pass  # не роняем парсер из-за картинки
-
-    # скриншоты
-    local_urls = []
-    for idx, s_url in enumerate((screenshot_urls or [])[:LIMIT_SCREENSHOTS]):
-        try:
-            saved = save_url_as_webp(s_url, base_dir='screenshots', base_name=f'screenshot-{idx + 1}')
-            local_urls.append(saved["url"])
-        except Exception:
-            continue
-
-    if local_urls and hasattr(product, 'screenshots'):
-        product.screenshots = local_urls
-        updated_fields.append('screenshots')
-
-    if updated_fields:
-        product.save(update_fields=updated_fields)
-
-
 def get_current_site_from_request(request):
     site_id = (
             request.GET.get("site")
@@ -85,71 +33,42 @@ def get_current_site_from_request(request):
             or request.session.get("current_site_id")
     )
     if site_id and str(site_id).isdigit():
-        return Site.objects.filter(id=site_id).first()
-    return Site.objects.first()
+        return get_site_by_id(site_id)
+    return first_site()
 
 
-def safe_steam_request(url: str):
-    """Безопасный GET-запрос к Steam API с проверкой формата ответа"""
-    try:
-        resp = requests.get(url, timeout=10)
-        data = resp.json()
-        if not isinstance(data, dict):
-            print(f"⚠ Steam API вернул не dict: {type(data).__name__}")
-            return {}
-        return data
-    except Exception as e:
-        print(f"❌ Ошибка Steam API: {e}")
-        return {}
-
+def split_steam_ids(text: str) -> list[str]:
+    """ID и ссылки на магазин (…/app/<id>/…) через запятую или с новой строки → список ID."""
+    return [
+        re.search(r'/app/(\d+)', x).group(1)
+        if x.startswith("http") and re.search(r'/app/(\d+)', x)
+        else x.strip()
+        for x in re.split(r"[\n,]+", text) if x.strip()
+    ]
 
-def fetch_steam_ids_by_mode(mode: str, request):
-    """Возвращает список уникальных Steam ID для парсинга"""
 
-    # 1️⃣ Ручной ввод
+def fetch_steam_ids_by_mode(mode: str, params):
+    """
+    Steam ID для парсинга (params — request.POST или payload задачи). Только ручной ввод:
+    random-режим берёт кандидатов прямо из steam_verdicts.sample в _parse_worker.
+    """
     if mode == "manual":
-        steam_ids = request.POST.get("steam_ids", "")
-        raw_items = re.split(r"[\n,]+", steam_ids)
-        return [
-            re.search(r'/app/(\d+)', x).group(1)
-            if x.startswith("http") and re.search(r'/app/(\d+)', x)
-            else x.strip()
-            for x in raw_items if x.strip()
-        ]
-
-    # 2️⃣ Случайная выборка
-    elif mode == "random":
-        target_count = int(request.POST.get("random_count", 10))
-
-        resp = safe_steam_request("https://api.steampowered.com/ISteamApps/GetAppList/v2/")
-        apps = resp.get("applist", {}).get("apps", [])
-        if not isinstance(apps, list) or not apps:
-            return []
-
-        steam_ids = set()
-        attempts = 0
-        max_attempts = target_count * 100  # большой запас для добора
-
-        while len(steam_ids) < target_count and attempts < max_attempts:
-            attempts += 1
-            app = random.choice(apps)
-            appid = app.get("appid")
-            if not appid or str(appid) in steam_ids:
-                continue
-
-            details = safe_steam_request(f"{STEAM_API_URL}?appids={appid}&cc=us&l=en")
-            data = details.get(str(appid), {})
-            if isinstance(data, dict) and data.get("success") and isinstance(data.get("data"), dict):
-                steam_ids.add(str(appid))
-
-        return list(steam_ids)[:target_count]
-
+        return split_steam_ids(params.get("steam_ids", ""))
     return []
 
 
-def parse_steam_game(steam_id: str, request=None):
-    """Парсит приложение (игру/DLC/приложение) по Steam ID"""
-    data = safe_steam_request(f"{STEAM_API_URL}?appids={steam_id}&cc=us&l=en")
+class InvalidSteamApp(ValueError):
+    """appdetails ответил, но приложения нет (success=False) или данные непригодны."""
+
+
+def fetch_steam_app(steam_id: str, refresh: bool = False) -> dict:
+    """
+    Скачивает и проверяет appdetails по Steam ID. Можно звать из пула потоков, но
+    не «без БД»: coalesce (steam_inflight) держит блокировку SteamLock, так что пул —
+    DBThreadPoolExecutor, закрывающий соединения потоков при shutdown.
+    """
+    # через дисковый кэш; сбой после всех повторов должен дойти до лога как есть
+    data = appdetails_cache.fetch(steam_id, cc="us", lang="en", refresh=refresh)
 
     if not isinstance(data, dict):
         raise ValueError(
@@ -163,182 +82,185 @@ def parse_steam_game(steam_id: str, request=None):
         )
 
     if not app_data.get("success"):
-        raise ValueError(f"Steam API не вернул данные для {steam_id} (success=False)")
+        raise InvalidSteamApp(f"Steam API не вернул данные для {steam_id} (success=False)")
 
     game = app_data.get("data")
     if not isinstance(game, dict):
-        raise ValueError(
+        raise InvalidSteamApp(
             f"Steam API вернул некорректный формат поля data ({type(game).__name__}) для {steam_id}"
         )
+    return game
 
-    # ── Нормализации ──
-    for key in ["genres", "categories", "publishers", "developers"]:
-        val = game.get(key, [])
-        if isinstance(val, list):
-            game[key] = [v.get("description") if isinstance(v, dict) else str(v) for v in val]
-        elif isinstance(val, str):
-            game[key] = [val]
-        else:
-            game[key] = []
 
-    title = game.get("name", "").strip()
-    if not title:
-        raise ValueError(f"Не удалось получить название продукта для Steam ID {steam_id}")
+FLUSH_INTERVAL = 2.0  # сек — чтобы прогресс в админке не замирал на маленьких пачках
+
+
+def _import_workers() -> int:
+    return max(1, int(getattr(settings, "STEAM_IMPORT_WORKERS", 8)))
 
-    try:
-        required_age = int(game.get("required_age") or 0)
-    except Exception:
-        required_age = 0
-
-    release_date_raw = game.get("release_date", {}).get("date", "")
-    release_date = None
-    for fmt in ("%b %d, %Y", "%d %b, %Y", "%B %d, %Y"):
-        try:
-            release_date = datetime.strptime(release_date_raw, fmt).date()
-            break
-        except Exception:
-            continue
-
-    publishers = [p.strip() for p in game.get("publishers", [])]
-    developers = [d.strip() for d in game.get("developers", [])]
-
-    pc_reqs = game.get("pc_requirements", {})
-    min_req_html = ""
-    if isinstance(pc_reqs, dict):
-        min_req_html = pc_reqs.get("minimum", "")
-    elif isinstance(pc_reqs, list) and pc_reqs:
-        first = pc_reqs[0]
-        if isinstance(first, dict):
-            min_req_html = first.get("minimum", "")
-
-    min_os = min_processor = min_ram = min_graphics = min_storage = min_additional = ""
-
-    if isinstance(min_req_html, str) and min_req_html.strip():
-        cleaned = re.sub(r"<br\s*/?>", "\n", min_req_html, flags=re.I)
-        cleaned = re.sub(r"<[^>]+>", "", cleaned).strip()
-        for line in cleaned.splitlines():
-            line_lower = line.lower()
-            if "os" in line_lower:
-                min_os = line.split(":", 1)[-1].strip()
-            elif "processor" in line_lower:
-                min_processor = line.split(":", 1)[-1].strip()
-            elif "memory" in line_lower or "ram" in line_lower:
-                min_ram = line.split(":", 1)[-1].strip()
-            elif "graphics" in line_lower or "video" in line_lower:
-                min_graphics = line.split(":", 1)[-1].strip()
-            elif "storage" in line_lower or "hdd" in line_lower:
-                min_storage = line.split(":", 1)[-1].strip()
-            else:
-                line_clean = line.replace("Minimum:", "").strip()
-                if line_clean:
-                    min_additional += line_clean + " "
-
-    screenshots = [s.get("path_full") for s in game.get("screenshots", []) if isinstance(s, dict)]
-
-    # Категория
-    category_name = "Steam Product"
-    if game["genres"]:
-        category_name = game["genres"][0]
-    elif game["categories"]:
-        category_name = game["categories"][0]
-
-    category, _ = Category.objects.get_or_create(name=category_name, type="game")
-    site = get_current_site_from_request(request) if request else Site.objects.first()
-
-    # ── Создание/обновление продукта ──
-    product, _ = Product.objects.update_or_create(
-        steam_id=steam_id,
-        site=site,
-        defaults={
-            "title": title,
-            "is_active": True,
-            "required_age": required_age,
-            "release_date": release_date,
-            "category": category,
-            "publishers": publishers,
-            "developers": developers,
-            "logo_url": game.get("header_image", ""),
-            "screenshots": screenshots,
-            "steam_url": f"https://store.steampowered.com/app/{steam_id}/",
-            "min_os": Truncator(min_os).chars(300),
-            "min_processor": Truncator(min_processor).chars(300),
-            "min_ram": Truncator(min_ram).chars(300),
-            "min_graphics": Truncator(min_graphics).chars(300),
-            "min_storage": Truncator(min_storage).chars(300),
-            "min_additional": Truncator(min_additional.strip()).chars(300),
-        }
-    )
 
-    # ⬇️ Конвертацию уносим в бэкграунд, чтобы не блокировать ответ админке
-    threading.Thread(
-        target=_convert_in_background,
-        args=(product.id, game.get("header_image", ""), screenshots[:LIMIT_SCREENSHOTS]),
-        daemon=True,
-    ).start()
-    return product
+def _parse_worker(job_id: str, site_ids, parse_mode: str, target_count: int, params: dict,
+                  http: steam_client.HttpStats):
+    """
+    Выполняется задачей steam_import в manage.py run_tasks (не в веб-воркере).
 
+    Стадии fetch / transform — SteamPipeline (STEAM_IMPORT_WORKERS потоков), как у
+    import_steam, а пишет в БД только этот поток — по мере готовности ответов.
+    В полёте не больше 2×workers запросов (и не больше, чем осталось до цели),
+    так что отмена срабатывает быстро и лишнего не скачиваем.
 
-def _parse_worker(job_id: str, request, parse_mode: str, target_count: int):
+    Готовые записи копятся в SteamProductWriter и пишутся пачками
+    (STEAM_IMPORT_BATCH_SIZE или раз в FLUSH_INTERVAL секунд).
+
+    В random-режиме кандидаты идут лениво из steam_verdicts.sample: невалидные
+    и чужого типа попыткой не считаются — просто берём следующего.
+
+    Сайтов может быть несколько: appdetails качается и нормализуется один раз,
+    строка Product (со своим слагом) пишется на каждый сайт, где игры ещё нет,
+    а картинки конвертируются одной задачей и общие для всех сайтов.
+    """
     attempted = 0
     added = 0
     errors = 0
+    def report(**kwargs):
+        # + счётчики HTTP этой задачи по хостам (запросы, повторы, 429, время ожидания)
+        pg_update(job_id, http=http.snapshot(), **kwargs)
+
     try:
-        current_site = get_current_site_from_request(request)
-        steam_ids = fetch_steam_ids_by_mode(parse_mode, request)
-        steam_ids = list(dict.fromkeys(steam_ids))
-        if parse_mode != "random":
-            steam_ids = steam_ids[: target_count * 5]
+        target_sites = [site for site in map(get_site_by_id, site_ids or ()) if site] or [first_site()]
+        existing = {
+            site.id: set(Product.objects.filter(site=site).values_list("steam_id", flat=True))
+            for site in target_sites
+        }
+        # пропускаем только то, что уже есть на всех выбранных сайтах
+        existing_ids = set.intersection(*existing.values())
+
+        if parse_mode == "random":
+            app_type = params.get("app_type") or "game"
+            steam_ids = steam_verdicts.sample(app_type, exclude=existing_ids, limit=target_count * 100)
+            total = target_count
+        else:
+            app_type = None
+            steam_ids = list(dict.fromkeys(fetch_steam_ids_by_mode(parse_mode, params)))[:target_count]
+            total = len(steam_ids)
 
-        total = min(len(steam_ids), target_count)
         if total == 0:
-            pg_update(job_id, processed=0, added=0, errors=0, msg="Нет ID для парсинга")
+            report(processed=0, added=0, errors=0, msg="Нет ID для парсинга")
             return
 
-        existing_ids = set(Product.objects.filter(site=current_site).values_list("steam_id", flat=True))
-
-        for steam_id in steam_ids:
-            if attempted >= target_count:
-                break
-            # ❗ проверка отмены перед обработкой ID
-            if is_cancelled(job_id):
-                pg_update(job_id, processed=attempted, added=added, errors=errors,
-                          msg="Отменено пользователем. Завершение…")
-                break
-
-            attempted += 1  # начали попытку
-
-            if steam_id in existing_ids:
-                pg_update(job_id, processed=attempted, added=added, errors=errors,
-                          msg=f"Пропущено: {steam_id} уже существует")
-                continue
-
-            try:
-                product = parse_steam_game(steam_id, request=request)
-                if not product or not getattr(product, "id", None):
-                    raise ValueError("empty product")
+        cancelled = False
+        writers = {site.id: SteamProductWriter(site) for site in target_sites}
+        many = len(writers) > 1
+        verdicts = []  # (appid, is_valid, app_type) — пишутся вместе с пачкой продуктов
+        flushed_at = time.monotonic()
+        # steam_pipeline сам импортирует этот модуль (fetch_steam_app)
+        from products.services.steam_pipeline import SteamPipeline
+        pipeline = SteamPipeline(workers=_import_workers())
+
+        def flush():
+            nonlocal added, errors, flushed_at
+            steam_verdicts.record_many(verdicts)
+            verdicts.clear()
+            for site_id, results in pipeline.persist_sites(writers.values()).items():
+                where = f" [{writers[site_id].site.domain}]" if many else ""
+                for result in results:
+                    if result.error:
+                        errors += 1
+                        report(processed=attempted, added=added, errors=errors,
+                               msg=f"ERR: {result.steam_id}{where} ({result.error})")
+                    else:
+                        added += 1
+                        report(processed=attempted, added=added, errors=errors,
+                               msg=f"OK: {result.steam_id}{where} — {result.title}")
+            flushed_at = time.monotonic()
+
+        def wanted():
+            # уже существующие пропускаем без запроса в Steam
+            nonlocal attempted
+            for steam_id in steam_ids:
+                if steam_id in existing_ids:
+                    attempted += 1
+                    report(processed=attempted, added=added, errors=errors,
+                           msg=f"Пропущено: {steam_id} уже существует")
+                    continue
                 existing_ids.add(steam_id)
-                added += 1
-                title = getattr(product, "title", "(без названия)")
-                pg_update(job_id, processed=attempted, added=added, errors=errors,
-                          msg=f"OK: {steam_id} — {title}")
-            except Exception as e:
-                errors += 1
-                pg_update(job_id, processed=attempted, added=added, errors=errors,
-                          msg=f"ERR: {steam_id} ({e})")
+                yield steam_id
+
+        with pipeline:
+            # в полёте не больше, чем осталось до цели: в random-режиме лишнего не качаем
+            for item in pipeline.run(wanted(), room=lambda: total - attempted):
+                if item.game is None:
+                    if item.invalid:
+                        verdicts.append((item.steam_id, False, ""))
+                    if not (item.invalid and app_type):
+                        attempted += 1
+                        errors += 1
+                        report(processed=attempted, added=added, errors=errors,
+                               msg=f"ERR: {item.steam_id} ({item.error})")
+                else:
+                    verdicts.append((item.steam_id, True, item.game.get("type") or ""))
+                    if not app_type or item.game.get("type") == app_type:
+                        attempted += 1
+                        if item.error:
+                            errors += 1
+                            report(processed=attempted, added=added, errors=errors,
+                                   msg=f"ERR: {item.steam_id} ({item.error})")
+                        else:
+                            # нормализовано один раз — строка на каждый сайт, где игры ещё нет
+                            for site_id, writer in writers.items():
+                                if item.steam_id not in existing[site_id]:
+                                    writer.add(item.steam_id, item.record)
+
+                buffered = max(len(writer) for writer in writers.values())
+                batch_size = min(writer.batch_size for writer in writers.values())
+                if buffered >= batch_size or len(verdicts) >= batch_size or (
+                    (buffered or verdicts) and time.monotonic() - flushed_at > FLUSH_INTERVAL
+                ):
+                    flush()
+
+                # ❗ проверка отмены после каждого ID; недокачанное отменит выход из with
+                if attempted >= total:
+                    break
+                if is_cancelled(job_id):
+                    cancelled = True
+                    report(processed=attempted, added=added, errors=errors,
+                           msg="Отменено пользователем. Завершение…")
+                    break
+
+        # дописываем то, что уже скачано (в т.ч. при отмене)
+        flush()
 
         # финальное сообщение: различаем нормальное завершение и отмену
-        if is_cancelled(job_id):
-            pg_update(job_id, processed=attempted, added=added, errors=errors,
-                      msg=f"Отменено. Итог: добавлено {added}, ошибок {errors}")
+        if cancelled or is_cancelled(job_id):
+            report(processed=attempted, added=added, errors=errors,
+                   msg=f"Отменено. Итог: добавлено {added}, ошибок {errors}")
             pg_finish(job_id, status="cancelled")
         else:
-            pg_update(job_id, processed=total, added=added, errors=errors,
-                      msg=f"Готово: добавлено {added}, ошибок {errors}")
+            report(processed=total, added=added, errors=errors,
+                   msg=f"Готово: добавлено {added}, ошибок {errors}")
             pg_finish(job_id, status="done")
     except Exception as e:
-        # аварийное завершение (на всякий)
-        pg_update(job_id, msg=f"Неожиданная ошибка: {e}")
-        pg_finish(job_id, status="done")
+        # аварийное завершение: ошибку — в лог, а решение о повторе — очереди (tasks.fail)
+        if tasks.is_last_attempt():
+            report(msg=f"Неожиданная ошибка: {e}")
+            pg_finish(job_id, status=ParseJob.STATUS_FAILED)
+        else:
+            report(msg=f"Неожиданная ошибка: {e}. Повторим попытку…")
+        raise
+
+
+def run_import_task(payload: dict):
+    """Обработчик задачи steam_import (products/services/tasks.py)."""
+    # run_tasks выполняет несколько задач в одном процессе — HTTP считаем по своей
+    with steam_client.scoped_stats() as http:
+        _parse_worker(
+            payload["job_id"],
+            payload.get("site_ids") or [payload.get("site_id")],  # site_id — задачи до мультисайта
+            payload.get("parse_mode", "manual"),
+            int(payload.get("target_count", 10)),
+            payload,
+            http,
+        )
 
 
 @csrf_exempt
@@ -349,9 +271,23 @@ def parse_steam_start(request):
     parse_mode = request.POST.get("parse_mode", "manual")
     target_count = int(request.POST.get("random_count", 10)) if parse_mode == "random" else 10
 
+    # несколько сайтов — один запрос в Steam на игру; без выбора — текущий сайт
+    site_ids = [int(pk) for pk in request.POST.getlist("sites") if str(pk).isdigit()]
+    if not site_ids:
+        current_site = get_current_site_from_request(request)
+        site_ids = [current_site.id] if current_site else []
+
     job_id = new_job(total=target_count)
-    t = threading.Thread(target=_parse_worker, args=(job_id, request, parse_mode, target_count), daemon=True)
-    t.start()
+    # сам импорт — в manage.py run_tasks; вьюха только ставит задачу
+    tasks.enqueue("steam_import", {
+        "job_id": job_id,
+        "site_ids": site_ids,
+        "parse_mode": parse_mode,
+        "target_count": target_count,
+        "steam_ids": request.POST.get("steam_ids", ""),
+        "app_type": request.POST.get("app_type") or "game",
+    }, max_attempts=2)
+    pg_update(job_id, msg="В очереди: ждём воркер (manage.py run_tasks)")
 
     return JsonResponse({"job_id": job_id})
 
@@ -364,6 +300,81 @@ def parse_steam_status(request, job_id: str):
     return JsonResponse(data)
 
 
+CANCEL_GRACE = 10  # сек — ждём, пока воркер допишет последнюю пачку после отмены
+
+
+def _events_enabled() -> bool:
+    # SSE держит веб-воркер всё время стрима — по умолчанию админка опрашивает статус
+    return bool(getattr(settings, "PARSE_EVENTS_ENABLED", False))
+
+
+def _sse(event: str, data, event_id=None) -> str:
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _progress_events(job_id: str, after_id):
+    """
+    Поток SSE: state — только изменившиеся счётчики, log — новые сообщения
+    (id события = id сообщения, по нему EventSource продолжает после обрыва),
+    end — задача завершена (или отменена и воркер не отозвался за CANCEL_GRACE).
+    Через PARSE_EVENTS_MAX_SECONDS поток закрывается без end — браузер
+    переподключится с Last-Event-ID. Весь стрим занимает поток веб-воркера,
+    поэтому он включается только PARSE_EVENTS_ENABLED (gthread/async gunicorn).
+    """
+    interval = float(getattr(settings, "PARSE_EVENTS_INTERVAL", 0.5))
+    deadline = time.monotonic() + int(getattr(settings, "PARSE_EVENTS_MAX_SECONDS", 60))
+    sent = {}
+    cancelled_at = None
+    pinged_at = time.monotonic()
+
+    yield f"retry: {int(interval * 4000)}\n\n"
+    while True:
+        data = pg_state(job_id)
+        if data is None:
+            yield _sse("end", {"error": "unknown job"})
+            return
+        data.pop("items")
+        changed = {key: value for key, value in data.items() if sent.get(key) != value}
+        if changed:
+            sent.update(changed)
+            yield _sse("state", changed)
+
+        messages = pg_messages_after(job_id, after_id)
+        for message_id, text in messages:
+            yield _sse("log", {"text": text}, event_id=message_id)
+        if messages:
+            after_id = messages[-1][0]
+        elif after_id is None:
+            after_id = 0
+
+        if data["cancel"] and cancelled_at is None:
+            cancelled_at = time.monotonic()
+        if data["done"] or (cancelled_at and time.monotonic() - cancelled_at > CANCEL_GRACE):
+            yield _sse("end", data)
+            return
+        if time.monotonic() > deadline:
+            return
+        if changed or messages:
+            pinged_at = time.monotonic()
+        elif time.monotonic() - pinged_at > 15:
+            yield ": ping\n\n"  # держим соединение через прокси
+            pinged_at = time.monotonic()
+        time.sleep(interval)
+
+
+@staff_member_required
+def parse_steam_events(request, job_id: str):
+    if not _events_enabled() or pg_state(job_id) is None:
+        return JsonResponse({"error": "unknown job"}, status=404)
+    last_id = request.headers.get("Last-Event-ID") or request.GET.get("last_event_id")
+    after_id = int(last_id) if last_id and last_id.isdigit() else None
+    response = StreamingHttpResponse(_progress_events(job_id, after_id), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # nginx: не буферизовать поток
+    return response
+
+
 @csrf_exempt
 @staff_member_required
 def parse_steam_cancel(request, job_id: str):
@@ -381,7 +392,8 @@ def parse_steam_cancel(request, job_id: str):
 def parse_steam_view(request):
     context = request.admin_site.each_context(request) if hasattr(request, 'admin_site') else {}
     context.update({
-        "site_list": Site.objects.all(),
+        "site_list": all_sites(),
         "current_site": get_current_site_from_request(request),
+        "events_enabled": _events_enabled(),
     })
     return render(request, 'admin/products/parse_steam.html', context)
@@ -0,0 +1,217 @@
+# Импорт из Steam как конвейер из трёх стадий:
+#   fetch     — appdetails через дисковый кэш (fetch_steam_app), пул потоков: это I/O;
+#   transform — steam_transform.normalize_steam_game, чистая функция: inline
+#               или в пуле процессов (processes > 0) — для больших бэкфиллов;
+#   persist   — SteamProductWriter.flush() пачками, в вызывающем потоке.
+# Элементы идут потоком в порядке входа, в полёте не больше window ID.
+# У каждой стадии свой таймер (StageStats) — для сводок и бенчмарков.
+import contextvars
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import NamedTuple
+
+import django
+from django.conf import settings
+
+from products.services.steam_parser import InvalidSteamApp, fetch_steam_app
+from products.services.steam_transform import normalize_steam_game
+from products.services.steam_writer import flush_sites
+from products.utils.db import DBThreadPoolExecutor
+
+STAGES = ("fetch", "transform", "persist")
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+class StageStats:
+    """Время по стадиям: число замеров, сумма, p50/p95, ошибки. Потокобезопасно."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = defaultdict(list)
+        self.errors = Counter()
+
+    def add(self, stage: str, seconds: float, error: bool = False):
+        with self._lock:
+            self.samples[stage].append(seconds)
+            if error:
+                self.errors[stage] += 1
+
+    @contextmanager
+    def timed(self, stage: str):
+        started = time.perf_counter()
+        failed = False
+        try:
+            yield
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self.add(stage, time.perf_counter() - started, error=failed)
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                stage: {
+                    "count": len(values),
+                    "total": sum(values),
+                    "p50": _percentile(values, 50),
+                    "p95": _percentile(values, 95),
+                    "errors": self.errors[stage],
+                }
+                for stage, values in self.samples.items()
+            }
+
+    def lines(self) -> list[str]:
+        summary = self.summary()
+        return [
+            f"{stage:9} ×{row['count']:<7} всего {row['total']:7.1f}с · p50 {row['p50'] * 1000:6.1f} мс · "
+            f"p95 {row['p95'] * 1000:6.1f} мс · ошибок {row['errors']}"
+            for stage in STAGES if (row := summary.get(stage))
+        ]
+
+
+class PipelineItem(NamedTuple):
+    steam_id: str
+    game: dict | None = None
+    record: dict | None = None
+    error: Exception | None = None
+
+    @property
+    def invalid(self) -> bool:
+        return isinstance(self.error, InvalidSteamApp)
+
+
+def _init_process():
+    # дочерний процесс при spawn стартует без настроенного Django (Truncator → переводы)
+    django.setup()
+
+
+def _transform(steam_id: str, game: dict):
+    """Выполняется в дочернем процессе: время меряем там же, ошибку возвращаем, а не бросаем."""
+    started = time.perf_counter()
+    try:
+        return normalize_steam_game(steam_id, game), None, time.perf_counter() - started
+    except Exception as e:
+        return None, e, time.perf_counter() - started
+
+
+class SteamPipeline:
+    """
+    with SteamPipeline(processes=4) as pipeline:
+        for item in pipeline.run(steam_ids): ...   # fetch + transform
+        pipeline.persist(writer)                    # persist, с таймером
+    """
+
+    def __init__(self, *, workers: int | None = None, processes: int = 0, refresh: bool = False,
+                 window: int | None = None, stats: StageStats | None = None):
+        self.workers = workers or int(getattr(settings, "STEAM_IMPORT_WORKERS", 8))
+        self.processes = max(0, processes)
+        self.refresh = refresh
+        self.window = window or self.workers * 2 + self.processes * 4
+        self.stats = stats or StageStats()
+        self._io_pool = None
+        self._cpu_pool = None
+
+    def __enter__(self):
+        self._io_pool = DBThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="steam-fetch")
+        if self.processes:
+            self._cpu_pool = ProcessPoolExecutor(max_workers=self.processes, initializer=_init_process)
+        return self
+
+    def __exit__(self, *exc):
+        self._io_pool.shutdown(cancel_futures=True)
+        if self._cpu_pool:
+            self._cpu_pool.shutdown(cancel_futures=True)
+        self._io_pool = self._cpu_pool = None
+
+    # ── стадии ──
+    def fetch(self, steam_id: str) -> dict:
+        with self.stats.timed("fetch"):
+            return fetch_steam_app(steam_id, refresh=self.refresh)
+
+    def _fetch_safe(self, steam_id):
+        try:
+            return self.fetch(steam_id), None
+        except Exception as e:
+            return None, e
+
+    def transform(self, steam_id: str, game: dict) -> dict:
+        with self.stats.timed("transform"):
+            return normalize_steam_game(steam_id, game)
+
+    def persist(self, writer):
+        """Записать накопленное в writer (SteamProductWriter) — одна пачка, один замер."""
+        if not len(writer):
+            return []
+        with self.stats.timed("persist"):
+            return writer.flush()
+
+    def persist_sites(self, writers) -> dict:
+        """То же для writer'ов нескольких сайтов: site_id → результаты, картинки — одной задачей."""
+        writers = [writer for writer in writers if len(writer)]
+        if not writers:
+            return {}
+        with self.stats.timed("persist"):
+            return flush_sites(writers)
+
+    # ── поток ──
+    def _start_transform(self, steam_id, game, error):
+        if error is not None:
+            return steam_id, game, (None, error)
+        if self._cpu_pool:
+            return steam_id, game, self._cpu_pool.submit(_transform, steam_id, game)
+        try:
+            return steam_id, game, (self.transform(steam_id, game), None)
+        except Exception as e:
+            return steam_id, game, (None, e)
+
+    def _finish_transform(self, pending) -> PipelineItem:
+        steam_id, game, outcome = pending
+        if not isinstance(outcome, tuple):
+            record, error, seconds = outcome.result()
+            self.stats.add("transform", seconds, error=error is not None)
+        else:
+            record, error = outcome
+        return PipelineItem(steam_id, game, record, error)
+
+    def run(self, steam_ids, room=None):
+        """
+        fetch + transform; PipelineItem на каждый ID, в порядке входа.
+        room() — сколько ID ещё можно держать в полёте (напр. «до цели осталось N»):
+        новые ID не берутся сверх min(window, room()).
+        """
+        if self._io_pool is None:
+            raise RuntimeError("SteamPipeline.run() — только внутри with SteamPipeline(...)")
+        ids = iter(steam_ids)
+        fetching = deque()      # (steam_id, future)
+        transforming = deque()  # (steam_id, game, future | (record, error))
+        exhausted = False
+        while True:
+            while not exhausted and len(fetching) + len(transforming) < (
+                self.window if room is None else min(self.window, room())
+            ):
+                steam_id = next(ids, None)
+                if steam_id is None:
+                    exhausted = True
+                    break
+                # контекст — в поток пула: счётчики HTTP задачи (steam_client.scoped_stats)
+                future = self._io_pool.submit(contextvars.copy_context().run, self._fetch_safe, steam_id)
+                fetching.append((steam_id, future))
+
+            # всё скачанное с головы очереди — сразу в transform
+            while fetching and (fetching[0][1].done() or not transforming):
+                steam_id, future = fetching.popleft()
+                transforming.append(self._start_transform(steam_id, *future.result()))
+
+            if not transforming:
+                return
+            yield self._finish_transform(transforming.popleft())
@@ -0,0 +1,110 @@
+# Стадия transform импорта из Steam: appdetails → плоская запись полей Product.
+# Чистые функции без БД и сети — их можно гонять в пуле процессов
+# (steam_pipeline) и проверять офлайн на сохранённых ответах.
+import re
+from datetime import datetime
+
+from django.utils.text import Truncator
+
+
+def parse_min_requirements(html) -> tuple[str, str, str, str, str, str]:
+    """pc_requirements.minimum (HTML) → (os, processor, ram, graphics, storage, additional)."""
+    min_os = min_processor = min_ram = min_graphics = min_storage = min_additional = ""
+
+    if isinstance(html, str) and html.strip():
+        cleaned = re.sub(r"<br\s*/?>", "\n", html, flags=re.I)
+        cleaned = re.sub(r"<[^>]+>", "", cleaned).strip()
+        for line in cleaned.splitlines():
+            line_lower = line.lower()
+            if "os" in line_lower:
+                min_os = line.split(":", 1)[-1].strip()
+            elif "processor" in line_lower:
+                min_processor = line.split(":", 1)[-1].strip()
+            elif "memory" in line_lower or "ram" in line_lower:
+                min_ram = line.split(":", 1)[-1].strip()
+            elif "graphics" in line_lower or "video" in line_lower:
+                min_graphics = line.split(":", 1)[-1].strip()
+            elif "storage" in line_lower or "hdd" in line_lower:
+                min_storage = line.split(":", 1)[-1].strip()
+            else:
+                line_clean = line.replace("Minimum:", "").strip()
+                if line_clean:
+                    min_additional += line_clean + " "
+
+    return min_os, min_processor, min_ram, min_graphics, min_storage, min_additional
+
+
+def normalize_steam_game(steam_id: str, game: dict) -> dict:
+    """
+    appdetails → поля Product (+ category_name). Чистая функция: без БД и без
+    изменения game — по её результату считается steam_payload_hash.
+    """
+    # ── Нормализации ──
+    lists = {}
+    for key in ["genres", "categories", "publishers", "developers"]:
+        val = game.get(key, [])
+        if isinstance(val, list):
+            lists[key] = [v.get("description") if isinstance(v, dict) else str(v) for v in val]
+        elif isinstance(val, str):
+            lists[key] = [val]
+        else:
+            lists[key] = []
+
+    title = game.get("name", "").strip()
+    if not title:
+        raise ValueError(f"Не удалось получить название продукта для Steam ID {steam_id}")
+
+    try:
+        required_age = int(game.get("required_age") or 0)
+    except Exception:
+        required_age = 0
+
+    release_date_raw = game.get("release_date", {}).get("date", "")
+    release_date = None
+    for fmt in ("%b %d, %Y", "%d %b, %Y", "%B %d, %Y"):
+        try:
+            release_date = datetime.strptime(release_date_raw, fmt).date()
+            break
+        except Exception:
+            continue
+
+    publishers = [p.strip() for p in lists["publishers"]]
+    developers = [d.strip() for d in lists["developers"]]
+
+    pc_reqs = game.get("pc_requirements", {})
+    min_req_html = ""
+    if isinstance(pc_reqs, dict):
+        min_req_html = pc_reqs.get("minimum", "")
+    elif isinstance(pc_reqs, list) and pc_reqs:
+        first = pc_reqs[0]
+        if isinstance(first, dict):
+            min_req_html = first.get("minimum", "")
+
+    min_os, min_processor, min_ram, min_graphics, min_storage, min_additional = parse_min_requirements(min_req_html)
+
+    screenshots = [s.get("path_full") for s in game.get("screenshots", []) if isinstance(s, dict)]
+
+    # Категория
+    category_name = "Steam Product"
+    if lists["genres"]:
+        category_name = lists["genres"][0]
+    elif lists["categories"]:
+        category_name = lists["categories"][0]
+
+    return {
+        "title": title,
+        "required_age": required_age,
+        "release_date": release_date,
+        "category_name": category_name,
+        "publishers": publishers,
+        "developers": developers,
+        "logo_url": game.get("header_image", "") or "",
+        "screenshots": screenshots,
+        "steam_url": f"https://store.steampowered.com/app/{steam_id}/",
+        "min_os": Truncator(min_os).chars(300),
+        "min_processor": Truncator(min_processor).chars(300),
+        "min_ram": Truncator(min_ram).chars(300),
+        "min_graphics": Truncator(min_graphics).chars(300),
+        "min_storage": Truncator(min_storage).chars(300),
+        "min_additional": Truncator(min_additional.strip()).chars(300),
+    }
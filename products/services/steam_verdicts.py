@@ -0,0 +1,110 @@
+# Вердикты по appid (SteamAppVerdict) и выборка кандидатов для random-режима:
+# сначала заведомо хорошие нужного типа, затем непроверенные из зеркала каталога.
+# Плохие вердикты перепроверяются не раньше чем через STEAM_VERDICT_RECHECK_DAYS.
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from products.models import SteamAppVerdict
+from products.services import steam_catalog, steam_client
+
+CHUNK = 200
+APP_LIST_V2_PATH = "/ISteamApps/GetAppList/v2/"
+
+
+def _recheck_after() -> timedelta:
+    return timedelta(days=int(getattr(settings, "STEAM_VERDICT_RECHECK_DAYS", 30)))
+
+
+def record(appid, *, is_valid: bool, app_type: str = ""):
+    """Сохранить вердикт сразу по ответу appdetails."""
+    if not str(appid).isdigit():
+        return
+    SteamAppVerdict.objects.update_or_create(
+        appid=int(appid),
+        defaults={"is_valid": is_valid, "app_type": (app_type or "")[:32], "checked_at": timezone.now()},
+    )
+
+
+def record_many(verdicts):
+    """Пачка вердиктов [(appid, is_valid, app_type)] одним upsert — для импорта."""
+    now = timezone.now()
+    rows = {
+        int(appid): SteamAppVerdict(appid=int(appid), is_valid=is_valid, app_type=(app_type or "")[:32], checked_at=now)
+        for appid, is_valid, app_type in verdicts
+        if str(appid).isdigit()
+    }
+    if rows:
+        SteamAppVerdict.objects.bulk_create(
+            rows.values(),
+            update_conflicts=True,
+            unique_fields=["appid"],
+            update_fields=["is_valid", "app_type", "checked_at"],
+        )
+
+
+def _int_ids(ids) -> set[int]:
+    return {int(x) for x in ids if str(x).isdigit()}
+
+
+def _catalog_candidates(limit: int):
+    catalog = steam_catalog.load()
+    if catalog is not None:
+        return catalog.random_ids(limit)
+    # зеркала нет — как раньше, одна полная выгрузка (запустите sync_steam_catalog)
+    print("⚠ Нет зеркала каталога Steam — качаем GetAppList целиком (запустите sync_steam_catalog)")
+    try:
+        apps = steam_client.get_json(steam_client.web_api_url(APP_LIST_V2_PATH), timeout=120).get("applist", {}).get("apps")
+    except steam_client.SteamRequestError as e:
+        print(f"❌ Ошибка Steam API: {e}")
+        return []
+    if not isinstance(apps, list) or not apps:
+        return []
+    return [str(app["appid"]) for app in random.sample(apps, min(limit, len(apps))) if app.get("appid")]
+
+
+def sample(app_type: str = "game", exclude=(), limit: int = 1000):
+    """
+    Ленивый генератор appid (строками) в порядке «сначала без запроса в Steam»:
+      1) известные хорошие типа app_type,
+      2) непроверенные (или с протухшим плохим вердиктом) из зеркала каталога.
+    exclude — steam_id, которые уже есть на сайте.
+    """
+    excluded = _int_ids(exclude)
+    good = list(
+        SteamAppVerdict.objects.filter(is_valid=True, app_type=app_type).values_list("appid", flat=True)
+    )
+    good = [appid for appid in good if appid not in excluded]
+    random.shuffle(good)
+    yielded = 0
+    for appid in good:
+        if yielded >= limit:
+            return
+        excluded.add(appid)
+        yielded += 1
+        yield str(appid)
+
+    stale = timezone.now() - _recheck_after()
+    candidates = [
+        int(appid) for appid in dict.fromkeys(_catalog_candidates(limit))
+        if str(appid).isdigit() and int(appid) not in excluded
+    ]
+    for start in range(0, len(candidates), CHUNK):
+        chunk = candidates[start:start + CHUNK]
+        known = {
+            v.appid: v
+            for v in SteamAppVerdict.objects.filter(appid__in=chunk).only("appid", "is_valid", "app_type", "checked_at")
+        }
+        for appid in chunk:
+            verdict = known.get(appid)
+            if verdict is not None:
+                if verdict.is_valid:
+                    continue  # хорошие нужного типа уже выданы выше, чужой тип не нужен
+                if verdict.checked_at > stale:
+                    continue
+            if yielded >= limit:
+                return
+            yielded += 1
+            yield str(appid)
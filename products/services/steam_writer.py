@@ -0,0 +1,275 @@
+# Пакетная запись продуктов из Steam: нормализованные записи копятся в буфере,
+# flush() пишет их одним bulk_create(update_conflicts) по (steam_id, site).
+# Категории — из словаря в памяти, слаги — одним запросом на пачку. Сигналов
+# bulk-запись не шлёт, поэтому после неё — signals.products_bulk_saved().
+import hashlib
+import json
+from functools import reduce
+from operator import or_
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Q
+from django.utils.text import slugify
+
+from products import signals
+from products.constants import BUTTON_TEXT_BY_TYPE
+from products.models import Product, Category
+from products.services import steam_client, steam_inflight, tasks
+from products.utils.images import save_url_as_webp, shared_webp_path
+
+LIMIT_SCREENSHOTS = 3
+CATEGORY_TYPE = "game"
+
+
+def steam_payload_hash(normalized: dict) -> str:
+    """sha256 нормализованных данных — неизменившиеся продукты не перезаписываем."""
+    raw = json.dumps(normalized, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class WriteResult(NamedTuple):
+    steam_id: str
+    product_id: int | None
+    title: str
+    changed: bool
+    error: Exception | None = None
+
+
+# ────────────────────────────────
+# Картинки (webp) — задачей в очереди (manage.py run_tasks), после записи
+# ────────────────────────────────
+
+def _shared_webp(url: str, base_dir: str, memo: dict) -> dict:
+    """
+    webp по адресу источника: уже лежит — берём как есть, иначе конвертируем один раз.
+    Одинаковые картинки продуктов разных сайтов (и параллельных задач) — один файл.
+    """
+    if url in memo:
+        return memo[url]
+    path = shared_webp_path(url, base_dir)
+
+    def ready():
+        return {"path": path, "url": default_storage.url(path)} if default_storage.exists(path) else None
+
+    memo[url] = ready() or steam_inflight.coalesce(
+        f"webp:{path}",
+        lambda: save_url_as_webp(steam_client.cdn_url(url), base_dir=base_dir, target_path=path,
+                                 get=steam_client.get),
+        ready,
+    )
+    return memo[url]
+
+
+def _attach_webp_assets(product, logo_url: str | None, screenshot_urls: list[str] | None, memo: dict | None = None):
+    memo = {} if memo is None else memo
+    updated_fields = []
+
+    # логотип
+    if logo_url:
+        try:
+            saved = _shared_webp(logo_url, 'logos', memo)
+            if hasattr(product, 'logo_file'):
+                product.logo_file = saved["path"]  # сохраняем путь для ImageField
+                updated_fields.append('logo_file')
+            elif hasattr(product, 'logo_url'):
+                product.logo_url = saved["url"]
+                updated_fields.append('logo_url')
+        except Exception:
+            pass  # не роняем парсер из-за картинки
+
+    # скриншоты
+    local_urls = []
+    for s_url in (screenshot_urls or [])[:LIMIT_SCREENSHOTS]:
+        try:
+            local_urls.append(_shared_webp(s_url, 'screenshots', memo)["url"])
+        except Exception:
+            continue
+
+    if local_urls and hasattr(product, 'screenshots'):
+        product.screenshots = local_urls
+        updated_fields.append('screenshots')
+
+    if updated_fields:
+        product.save(update_fields=updated_fields)
+
+
+def _assets_key(product_id, logo_url, screenshots) -> str:
+    digest = hashlib.sha1(json.dumps([logo_url, screenshots]).encode("utf-8")).hexdigest()[:16]
+    return f"assets:{product_id}:{digest}"
+
+
+def _convert_assets_now(items):
+    # те же картинки того же продукта уже конвертирует другая задача — её результат
+    # попадёт в тот же продукт, повторно не качаем
+    keyed = {_assets_key(*item): item for item in items}
+    owner = steam_inflight.new_owner()
+    mine = steam_inflight.claim(keyed, owner, seconds=steam_inflight.ttl() * 3)
+    try:
+        products = Product.objects.in_bulk([keyed[key][0] for key in mine])
+        memo = {}  # url → webp: одна игра на N сайтах — одна конвертация на задачу
+        for key in mine:
+            product_id, logo_url, screenshots = keyed[key]
+            product = products.get(product_id)
+            if product:
+                # реальная запись в модель
+                _attach_webp_assets(product, logo_url=logo_url, screenshot_urls=screenshots, memo=memo)
+    finally:
+        steam_inflight.release(mine, owner)
+
+
+def run_convert_task(payload: dict):
+    """Обработчик задачи convert_assets (products/services/tasks.py)."""
+    _convert_assets_now(payload.get("items") or [])
+
+
+def convert_assets(items):
+    """Одна задача конвертации на пачку (а не поток на продукт)."""
+    items = [[product_id, logo_url, list(screenshots or [])] for product_id, logo_url, screenshots in items]
+    if items:
+        tasks.enqueue("convert_assets", {"items": items})
+
+
+# ────────────────────────────────
+# Writer
+# ────────────────────────────────
+
+class SteamProductWriter:
+    """Буфер продуктов одного сайта; flush() пишет пачку и возвращает WriteResult по каждой записи."""
+
+    def __init__(self, site, batch_size: int | None = None, force: bool = False):
+        self.site = site
+        self.force = force  # писать даже при совпавшем steam_payload_hash
+        self.batch_size = batch_size or int(getattr(settings, "STEAM_IMPORT_BATCH_SIZE", 50))
+        self._records: dict[str, dict] = {}
+        self._categories: dict[str, int] | None = None
+
+    def __len__(self):
+        return len(self._records)
+
+    def add(self, steam_id: str, normalized: dict):
+        self._records[str(steam_id)] = normalized
+
+    def full(self) -> bool:
+        return len(self._records) >= self.batch_size
+
+    def _category_ids(self, names) -> dict[str, int]:
+        if self._categories is None:
+            self._categories = {}
+            for pk, name in Category.objects.filter(type=CATEGORY_TYPE).order_by("-id").values_list("id", "name"):
+                self._categories[name] = pk  # при дублях имени — самая ранняя, как get_or_create
+        for name in names:
+            if name not in self._categories:
+                # новые категории редки; save() сам сгенерирует slug
+                self._categories[name] = Category.objects.get_or_create(name=name, type=CATEGORY_TYPE)[0].id
+        return self._categories
+
+    def _slugs(self, titles: dict[str, str]) -> dict[str, str]:
+        """Те же слаги, что unique_slug (base, base-2, …), но одним запросом на пачку."""
+        bases = {steam_id: slugify(title) or "item" for steam_id, title in titles.items()}
+        if not bases:
+            return {}
+        lookup = reduce(or_, (Q(slug=base) | Q(slug__startswith=f"{base}-") for base in set(bases.values())))
+        taken = set(Product.objects.filter(lookup, site=self.site).values_list("slug", flat=True))
+        slugs = {}
+        for steam_id, base in bases.items():
+            slug, i = base, 2
+            while slug in taken:
+                slug = f"{base}-{i}"
+                i += 1
+            taken.add(slug)
+            slugs[steam_id] = slug
+        return slugs
+
+    def _write(self, records: dict[str, dict]) -> list[WriteResult]:
+        existing = {
+            row["steam_id"]: row
+            for row in Product.objects.filter(site=self.site, steam_id__in=list(records))
+            .values("id", "steam_id", "slug", "steam_payload_hash")
+        }
+        categories = self._category_ids({record["category_name"] for record in records.values()})
+        new_slugs = self._slugs({sid: record["title"] for sid, record in records.items() if sid not in existing})
+
+        results, objs = [], []
+        for steam_id, record in records.items():
+            digest = steam_payload_hash(record)
+            old = existing.get(steam_id)
+            if old and old["steam_payload_hash"] == digest and not self.force:
+                results.append(WriteResult(steam_id, old["id"], record["title"], changed=False))
+                continue
+            fields = {k: v for k, v in record.items() if k != "category_name"}
+            objs.append(Product(
+                **fields,
+                site=self.site,
+                steam_id=steam_id,
+                slug=old["slug"] if old else new_slugs[steam_id],
+                is_active=True,
+                category_id=categories[record["category_name"]],
+                steam_payload_hash=digest,
+                button_text=BUTTON_TEXT_BY_TYPE.get("game", "View Product"),
+            ))
+        if not objs:
+            return results
+
+        update_fields = [k for k in next(iter(records.values())) if k != "category_name"]
+        Product.objects.bulk_create(
+            objs,
+            update_conflicts=True,
+            unique_fields=["steam_id", "site"],
+            # is_active — только у новых строк: снятый редактором продукт resync не публикует заново
+            update_fields=update_fields + ["category", "steam_payload_hash", "updated_at"],
+        )
+        if any(obj.pk is None for obj in objs):
+            # бэкенд без RETURNING для upsert — дочитываем id
+            ids = dict(Product.objects.filter(site=self.site, steam_id__in=[o.steam_id for o in objs])
+                       .values_list("steam_id", "id"))
+            for obj in objs:
+                obj.pk = ids.get(obj.steam_id)
+        results.extend(WriteResult(obj.steam_id, obj.pk, obj.title, changed=True) for obj in objs)
+        return results
+
+    def flush(self) -> list[WriteResult]:
+        results, assets = self._flush()
+        convert_assets(assets)
+        return results
+
+    def _flush(self) -> tuple[list[WriteResult], list]:
+        """Запись пачки; картинки не ставит в очередь, а возвращает вторым элементом."""
+        records, self._records = self._records, {}
+        if not records:
+            return [], []
+        try:
+            with transaction.atomic():
+                results = self._write(records)
+        except Exception:
+            # одна плохая запись не должна ронять пачку — дописываем по одной
+            self._categories = None  # созданные в откатившейся транзакции категории недействительны
+            results = []
+            for steam_id, record in records.items():
+                try:
+                    with transaction.atomic():
+                        results.extend(self._write({steam_id: record}))
+                except Exception as e:
+                    results.append(WriteResult(steam_id, None, record.get("title", ""), changed=False, error=e))
+
+        changed = [r for r in results if r.changed]
+        signals.products_bulk_saved(self.site.id, [r.product_id for r in changed])
+        return results, [
+            (r.product_id, records[r.steam_id]["logo_url"], records[r.steam_id]["screenshots"][:LIMIT_SCREENSHOTS])
+            for r in changed
+        ]
+
+
+def flush_sites(writers) -> dict[int, list[WriteResult]]:
+    """
+    Сбросить буферы writer'ов нескольких сайтов (одна игра → строка на каждый сайт).
+    Картинки — одной задачей на все сайты: одинаковые URL в ней конвертируются один раз.
+    """
+    results, assets = {}, []
+    for writer in writers:
+        results[writer.site.id], site_assets = writer._flush()
+        assets.extend(site_assets)
+    convert_assets(assets)
+    return results
@@ -0,0 +1,153 @@
+# Очередь фоновых задач в БД (BackgroundTask) вместо daemon-потоков в веб-воркере.
+# enqueue() — один INSERT из вьюхи; manage.py run_tasks забирает задачи через
+# claim(): select_for_update(skip_locked) + условный UPDATE, так что две копии
+# воркера одну задачу не получат. Задача «занята» до locked_until (visibility
+# timeout): воркер продлевает его, пока работает, а если воркер умер — задачу
+# заберёт другой (пока не кончились попытки). Ошибка → повтор через
+# TASKS_RETRY_BACKOFF·2^(попытка-1) сек.
+import contextvars
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from products.models import BackgroundTask
+
+# имя задачи → обработчик handler(payload); строкой, чтобы не тянуть импорты по кругу
+HANDLERS = {
+    "steam_import": "products.services.steam_parser.run_import_task",
+    "convert_assets": "products.services.steam_writer.run_convert_task",
+}
+
+
+_current: contextvars.ContextVar[BackgroundTask | None] = contextvars.ContextVar("background_task", default=None)
+
+
+def current() -> BackgroundTask | None:
+    """Задача, которую сейчас выполняет этот поток (внутри обработчика), иначе None."""
+    return _current.get()
+
+
+def is_last_attempt() -> bool:
+    """После ошибки повтора не будет — обработчику пора закрывать своё состояние."""
+    task = current()
+    return task is None or task.attempts >= task.max_attempts
+
+
+def visibility_timeout() -> int:
+    return int(getattr(settings, "TASKS_VISIBILITY_TIMEOUT", 300))
+
+
+def _backoff(attempts: int) -> timedelta:
+    base = int(getattr(settings, "TASKS_RETRY_BACKOFF", 30))
+    return timedelta(seconds=min(base * 2 ** max(attempts - 1, 0), 60 * 60))
+
+
+def enqueue(name: str, payload: dict | None = None, *, delay: int = 0, max_attempts: int | None = None) -> BackgroundTask:
+    """Поставить задачу в очередь; выполнит её manage.py run_tasks."""
+    if name not in HANDLERS:
+        raise ValueError(f"Неизвестная задача: {name}")
+    return BackgroundTask.objects.create(
+        name=name,
+        payload=payload or {},
+        run_after=timezone.now() + timedelta(seconds=delay),
+        max_attempts=max_attempts or int(getattr(settings, "TASKS_MAX_ATTEMPTS", 5)),
+    )
+
+
+def _abandoned(now) -> Q:
+    # «running», но воркер не продлил блокировку — упал или убит
+    return Q(status=BackgroundTask.STATUS_RUNNING, locked_until__lt=now)
+
+
+def _claimable(now):
+    # в очереди и пора, либо брошенная воркером, у которой ещё остались попытки
+    return BackgroundTask.objects.filter(
+        Q(status=BackgroundTask.STATUS_QUEUED, run_after__lte=now)
+        | _abandoned(now) & Q(attempts__lt=F("max_attempts"))
+    )
+
+
+def reap(now=None) -> int:
+    """Брошенные задачи без оставшихся попыток → failed (иначе задача, роняющая воркер, крутилась бы вечно)."""
+    now = now or timezone.now()
+    return BackgroundTask.objects.filter(_abandoned(now), attempts__gte=F("max_attempts")).update(
+        status=BackgroundTask.STATUS_FAILED,
+        locked_until=None,
+        last_error="Воркер пропал, не завершив задачу; попытки исчерпаны",
+        updated_at=now,
+    )
+
+
+def claim(worker_id: str, limit: int = 1, names=None) -> list[BackgroundTask]:
+    """Забрать до limit задач: status=running, attempts+1, locked_until = now + visibility timeout."""
+    now = timezone.now()
+    reap(now)
+    locked_until = now + timedelta(seconds=visibility_timeout())
+    queryset = _claimable(now)
+    if names:
+        queryset = queryset.filter(name__in=names)
+
+    claimed = []
+    with transaction.atomic():
+        if connection.features.has_select_for_update_skip_locked:
+            queryset = queryset.select_for_update(skip_locked=True)
+        candidates = list(queryset.order_by("run_after", "id").values_list("id", flat=True)[:limit])
+        for pk in candidates:
+            # условный UPDATE — на бэкендах без SKIP LOCKED гонку решает он
+            updated = _claimable(now).filter(pk=pk).update(
+                status=BackgroundTask.STATUS_RUNNING,
+                attempts=F("attempts") + 1,
+                locked_until=locked_until,
+                locked_by=worker_id,
+                updated_at=now,
+            )
+            if updated:
+                claimed.append(pk)
+    return list(BackgroundTask.objects.filter(pk__in=claimed).order_by("run_after", "id"))
+
+
+def extend(worker_id: str, task_ids) -> int:
+    """Продлить visibility timeout задачам, которые этот воркер ещё выполняет."""
+    if not task_ids:
+        return 0
+    return BackgroundTask.objects.filter(
+        pk__in=list(task_ids), status=BackgroundTask.STATUS_RUNNING, locked_by=worker_id,
+    ).update(locked_until=timezone.now() + timedelta(seconds=visibility_timeout()))
+
+
+def complete(task: BackgroundTask):
+    BackgroundTask.objects.filter(pk=task.pk, locked_by=task.locked_by).update(
+        status=BackgroundTask.STATUS_DONE, locked_until=None, last_error="", updated_at=timezone.now(),
+    )
+
+
+def fail(task: BackgroundTask, error: BaseException):
+    """Повтор с экспоненциальной задержкой, пока не кончатся попытки."""
+    now = timezone.now()
+    last_error = "".join(traceback.format_exception(error))[-4000:]
+    if task.attempts >= task.max_attempts:
+        fields = {"status": BackgroundTask.STATUS_FAILED}
+    else:
+        fields = {"status": BackgroundTask.STATUS_QUEUED, "run_after": now + _backoff(task.attempts)}
+    BackgroundTask.objects.filter(pk=task.pk, locked_by=task.locked_by).update(
+        locked_until=None, last_error=last_error, updated_at=now, **fields,
+    )
+
+
+def run(task: BackgroundTask):
+    """Выполнить одну забранную задачу и отметить результат."""
+    token = _current.set(task)
+    try:
+        import_string(HANDLERS[task.name])(task.payload)
+    except Exception as e:
+        fail(task, e)
+        return False
+    finally:
+        _current.reset(token)
+    complete(task)
+    return True
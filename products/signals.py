@@ -0,0 +1,173 @@
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed, post_migrate
+from django.contrib.sites.models import Site
+from django.dispatch import receiver
+from django.utils import timezone
+
+from products.models import Product, Category, Author, FAQ, Poll, PollOption
+from products.models.author_proxy import AuthorProxy
+from products.models.product import products_updated
+from products.services import api_cache, search, product_cards
+from products.utils import sites
+
+
+# ────────────────────────────────
+# Инвалидация кэша ответов API
+# ────────────────────────────────
+
+def _site_id_of_product(product_id):
+    return Product.objects.filter(pk=product_id).values_list("site_id", flat=True).first()
+
+
+def _touch_products(site_ids, **filters):
+    """
+    Изменились связанные данные — двигаем Product.updated_at (ETag/Last-Modified).
+    site_ids — чей кэш API сбросить (пусто — вызывающий сбросит сам).
+    """
+    Product.objects.filter(**filters).update(updated_at=timezone.now(), site_ids=site_ids)
+
+
+def _child_changed(product_id):
+    if product_id:
+        _touch_products([_site_id_of_product(product_id)], pk=product_id)
+
+
+@receiver(post_save, sender=Product)
+def _product_saved(sender, instance: Product, update_fields=None, **kwargs):
+    # best_products выбираются в пределах сайта — у ссылающихся продуктов тот же сайт
+    if instance.mini_card_changed(update_fields):
+        _touch_products((), best_products=instance.pk)
+    api_cache.bump_site(instance.site_id)
+
+
+@receiver(post_delete, sender=Product)
+def _product_deleted(sender, instance: Product, **kwargs):
+    # строки best_products удалены без m2m_changed — мини-карточка пропала у ссылавшихся
+    _touch_products((), best_products=instance.pk)
+    api_cache.bump_site(instance.site_id)
+
+
+@receiver(products_updated)
+def _products_updated(sender, site_ids, **kwargs):
+    # карточки не пересобираем: payloads_for сам увидит updated_at новее карточки
+    if site_ids is None:
+        api_cache.bump_global()
+        return
+    for site_id in site_ids:
+        api_cache.bump_site(site_id)
+
+
+@receiver(m2m_changed, sender=Product.best_products.through)
+def _best_products_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_") or not isinstance(instance, Product):
+        return
+    if reverse and pk_set:
+        # product.recommended_for.add(...) меняет best_products у других продуктов (того же сайта)
+        _touch_products((), pk__in=pk_set)
+    _touch_products([instance.site_id], pk=instance.pk)
+
+
+@receiver(post_save, sender=FAQ)
+@receiver(post_delete, sender=FAQ)
+@receiver(post_save, sender=Poll)
+@receiver(post_delete, sender=Poll)
+def _product_child_changed(sender, instance, **kwargs):
+    _child_changed(instance.product_id)
+
+
+@receiver(post_save, sender=PollOption)
+@receiver(post_delete, sender=PollOption)
+def _poll_option_changed(sender, instance: PollOption, **kwargs):
+    _child_changed(Poll.objects.filter(pk=instance.poll_id).values_list("product_id", flat=True).first())
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+@receiver(post_save, sender=AuthorProxy)
+@receiver(post_delete, sender=AuthorProxy)
+def _shared_reference_changed(sender, instance, **kwargs):
+    api_cache.bump_global()
+
+
+@receiver(post_save, sender=Category)
+def _touch_category_products(sender, instance: Category, **kwargs):
+    _touch_products((), category_id=instance.id)  # кэш — bump_global выше
+
+
+@receiver(post_save, sender=Author)
+@receiver(post_save, sender=AuthorProxy)
+def _touch_author_products(sender, instance, **kwargs):
+    _touch_products((), author_id=instance.id)  # кэш — bump_global выше
+
+
+# ────────────────────────────────
+# Карточки продуктов (ProductCard)
+# ────────────────────────────────
+
+@receiver(post_save, sender=Product)
+def _rebuild_product_card(sender, instance: Product, **kwargs):
+    product_cards.rebuild([instance.id])
+
+
+@receiver(post_save, sender=Category)
+def _rebuild_category_cards(sender, instance: Category, **kwargs):
+    product_cards.rebuild_for(category_id=instance.id)
+
+
+@receiver(post_save, sender=Author)
+@receiver(post_save, sender=AuthorProxy)
+def _rebuild_author_cards(sender, instance, **kwargs):
+    product_cards.rebuild_for(author_id=instance.id)
+
+
+@receiver(pre_delete, sender=Category)
+@receiver(pre_delete, sender=Author)
+@receiver(pre_delete, sender=AuthorProxy)
+def _remember_card_owners(sender, instance, **kwargs):
+    # после удаления FK станет NULL (SET_NULL) без сигналов Product — запомним, кого пересобрать
+    lookup = "category_id" if isinstance(instance, Category) else "author_id"
+    instance._card_product_ids = list(Product.objects.filter(**{lookup: instance.id}).values_list("id", flat=True))
+
+
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Author)
+@receiver(post_delete, sender=AuthorProxy)
+def _rebuild_orphaned_cards(sender, instance, **kwargs):
+    product_ids = getattr(instance, "_card_product_ids", [])
+    _touch_products((), pk__in=product_ids)  # кэш — bump_global выше
+    product_cards.rebuild(product_ids)
+
+
+# ────────────────────────────────
+# Пакетные записи (bulk_create / update сигналов не шлют)
+# ────────────────────────────────
+
+def products_bulk_saved(site_id, product_ids):
+    """То же, что post_save Product, но одной пачкой — звать после bulk-записи продуктов."""
+    product_ids = list(product_ids)
+    if not product_ids:
+        return
+    _touch_products((), best_products__in=product_ids)
+    api_cache.bump_site(site_id)
+    product_cards.rebuild(product_ids)
+
+
+# ────────────────────────────────
+# Карта host → Site (products/utils/sites.py)
+# ────────────────────────────────
+
+@receiver(post_save, sender=Site)
+@receiver(post_delete, sender=Site)
+def _site_changed(sender, instance: Site, **kwargs):
+    sites.invalidate()
+
+
+# ────────────────────────────────
+# Полнотекстовый индекс (DDL зависит от бэкенда)
+# ────────────────────────────────
+
+@receiver(post_migrate)
+def _install_search_index(sender, using, **kwargs):
+    if getattr(sender, "name", None) == "products":
+        search.install(using)
@@ -1,7 +1,9 @@
 (function () {
   const POLL_MS = 500;
+  const LOG_LINES = 10;
 
   let pollTimer = null;
+  let eventSource = null;
   let isRunning = false;
   let currentJobId = null;
 
@@ -37,12 +39,23 @@
     log.scrollTop = log.scrollHeight;
   }
 
+  // сводка HTTP по всем хостам: повторы, ответы 429, время ожидания лимита
+  function httpSummary(http) {
+    const rows = Object.values(http || {});
+    if (!rows.length) return '';
+    const sum = (key) => rows.reduce((acc, row) => acc + (row[key] || 0), 0);
+    return ` · повторов: ${sum('retries')} · 429: ${sum('throttled')} · ожидание: ${sum('wait_seconds').toFixed(1)}с`;
+  }
+
   function enableForm(enabled) {
     qs("#parse_mode").disabled = !enabled;
     const rc = qs("#random_count");
     if (rc) rc.disabled = !enabled;
+    const at = qs("#app_type");
+    if (at) at.disabled = !enabled;
     const si = qs("#steam_ids");
     if (si) si.disabled = !enabled;
+    document.querySelectorAll('#sites_input input[name=sites]').forEach(el => { el.disabled = !enabled; });
   }
 
   function setStartButton(state) {
@@ -74,7 +87,7 @@
         const url = cancelTpl.replace('JOB_ID', currentJobId);
         try {
           await fetch(url, { method: 'POST', headers: { 'X-CSRFToken': getCsrf() } });
-          // дальше воркер сам увидит флаг и завершит; просто ждём d.done в poll
+          // дальше воркер сам увидит флаг и завершит; просто ждём конца потока (или d.done в poll)
         } catch (_) {}
       };
     }
@@ -105,6 +118,28 @@
       clearInterval(pollTimer);
       pollTimer = null;
     }
+    if (eventSource) {
+      eventSource.close();
+      eventSource = null;
+    }
+  }
+
+  function render(d) {
+    const total = d.total || 1;
+    const processed = d.processed || 0;
+    const added = d.added || 0;
+    const errors = d.errors || 0;
+
+    const pct = total ? (processed / total) * 100 : 0;
+    setBar(pct);
+    qs("#meta").textContent = `Обработано: ${processed} / ${total} · добавлено: ${added} · ошибок: ${errors}` + httpSummary(d.http);
+    renderLog(d.items || []);
+
+    if (d.done) {
+      clearPoll();
+      setBar(100);
+      toIdleUI(); // по завершении — «Начать парсинг» и кнопка «Назад»
+    }
   }
 
   function poll(jobId, urls) {
@@ -122,24 +157,46 @@
       }
       if (!res.ok) return;
 
-      const d = await res.json();
+      render(await res.json());
+    }, POLL_MS);
+  }
 
-      const total = d.total || 1;
-      const processed = d.processed || 0;
-      const added = d.added || 0;
-      const errors = d.errors || 0;
+  // SSE (только если включён PARSE_EVENTS_ENABLED — тогда в шаблоне есть data-events-url-template):
+  // сервер шлёт только изменившиеся счётчики и новые строки лога;
+  // после обрыва EventSource сам переподключается с Last-Event-ID.
+  // Нет EventSource или поток не поднялся (прокси буферизует) — обычный poll.
+  function stream(jobId, urls) {
+    if (!window.EventSource || !urls.eventsTpl) {
+      poll(jobId, urls);
+      return;
+    }
+    currentJobId = jobId;
+    clearPoll();
 
-      const pct = total ? (processed / total) * 100 : 0;
-      setBar(pct);
-      qs("#meta").textContent = `Обработано: ${processed} / ${total} · добавлено: ${added} · ошибок: ${errors}`;
-      renderLog(d.items || []);
+    const d = { items: [] };
+    let received = false;
+    const es = new EventSource(urls.eventsTpl.replace('JOB_ID', jobId));
+    eventSource = es;
 
-      if (d.done) {
-        clearPoll();
-        setBar(100);
-        toIdleUI(); // по завершении — «Начать парсинг» и кнопка «Назад»
+    es.addEventListener('state', (e) => {
+      received = true;
+      Object.assign(d, JSON.parse(e.data));
+      render(d);
+    });
+    es.addEventListener('log', (e) => {
+      received = true;
+      d.items = d.items.concat(JSON.parse(e.data).text).slice(-LOG_LINES);
+      render(d);
+    });
+    es.addEventListener('end', (e) => {
+      Object.assign(d, JSON.parse(e.data), { done: true });
+      render(d);
+    });
+    es.onerror = () => {
+      if (!received || es.readyState === EventSource.CLOSED) {
+        poll(jobId, urls);
       }
-    }, POLL_MS);
+    };
   }
 
   async function startParsing() {
@@ -149,6 +206,7 @@
     const form = qs("#parseSteamForm");
     const startUrl = root.dataset.startUrl;
     const statusTpl = root.dataset.statusUrlTemplate;
+    const eventsTpl = root.dataset.eventsUrlTemplate;
 
     const fd = new FormData(form);
 
@@ -174,7 +232,7 @@
     }
 
     const data = await res.json();
-    poll(data.job_id, { statusTpl });
+    stream(data.job_id, { statusTpl, eventsTpl });
   }
 
   document.addEventListener("DOMContentLoaded", function () {
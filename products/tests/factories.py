@@ -0,0 +1,24 @@
+from django.contrib.sites.models import Site
+
+from products.models import Author, Category, Product
+
+
+def make_category(name="Action"):
+    return Category.objects.get_or_create(name=name, type="game")[0]
+
+
+def make_author(name="Author"):
+    return Author.objects.get_or_create(name=name)[0]
+
+
+def make_product(site=None, **fields):
+    defaults = {
+        "site": site or Site.objects.get_current(),
+        "title": "Product",
+        "review_headline": "Headline",
+        "review_body": "<p>Body</p>",
+        "category": make_category(),
+        "author": make_author(),
+    }
+    defaults.update(fields)
+    return Product.objects.create(**defaults)
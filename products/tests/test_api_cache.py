@@ -0,0 +1,106 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from products.models import CacheVersion, Product
+from products.services import api_cache
+from products.tests.factories import make_product
+from products.utils.sites import default_site
+
+
+@override_settings(API_CACHE_TIMEOUT=600)
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.site = default_site()
+        cls.product = make_product(cls.site, title="Cached Game")
+
+    def setUp(self):
+        cache.clear()
+        api_cache._seen.clear()  # версии, запомненные процессом в прошлых тестах
+
+    def test_matching_etag_returns_304(self):
+        response = self.client.get("/api/products/")
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers["ETag"]
+
+        response = self.client.get("/api/products/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers["ETag"], etag)
+
+    def test_cache_hit_skips_orm(self):
+        etag = self.client.get("/api/products/").headers["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/products/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_change_invalidates_etag_and_body(self):
+        etag = self.client.get("/api/products/").headers["ETag"]
+        self.product.title = "Renamed Game"
+        self.product.save()
+
+        response = self.client.get("/api/products/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+        self.assertContains(response, "Renamed Game")
+
+    def test_queryset_update_invalidates(self):
+        etag = self.client.get("/api/products/").headers["ETag"]
+        Product.objects.filter(pk=self.product.pk).update(title="Bulk Renamed")
+
+        response = self.client.get("/api/products/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Bulk Renamed")
+
+    @override_settings(API_CACHE_VERSION_CHECK_INTERVAL=0)
+    def test_version_lives_in_database(self):
+        # другой процесс поднял версию — здешний кэш ответа больше не читается
+        self.client.get("/api/products/")
+        before = api_cache.versions(self.site.id)
+        CacheVersion.bump(self.site.id)
+        self.assertNotEqual(api_cache.versions(self.site.id), before)
+
+    def test_other_process_bump_seen_after_interval(self):
+        before = api_cache.versions(self.site.id)
+        CacheVersion.bump(self.site.id)  # мимо api_cache — как из другого процесса
+        self.assertEqual(api_cache.versions(self.site.id), before)  # окно устаревания
+        with override_settings(API_CACHE_VERSION_CHECK_INTERVAL=0):
+            self.assertNotEqual(api_cache.versions(self.site.id), before)
+
+    def test_own_bump_seen_at_once(self):
+        before = api_cache.versions(self.site.id)
+        api_cache.bump_site(self.site.id)
+        self.assertNotEqual(api_cache.versions(self.site.id), before)
+
+
+class ProductTouchTests(TestCase):
+    """best_products у других продуктов трогаем только при изменении мини-карточки."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.site = default_site()
+        cls.shown = make_product(cls.site, title="Shown Game")
+        cls.referrer = make_product(cls.site, title="Referrer")
+        cls.referrer.best_products.add(cls.shown)
+
+    def _referrer_touched(self, change):
+        before = Product.objects.get(pk=self.referrer.pk).updated_at
+        change(Product.objects.get(pk=self.shown.pk))
+        return Product.objects.get(pk=self.referrer.pk).updated_at != before
+
+    def _set(self, **fields):
+        def change(product):
+            for name, value in fields.items():
+                setattr(product, name, value)
+            product.save()
+        return change
+
+    def test_mini_card_change_touches_referrers(self):
+        self.assertTrue(self._referrer_touched(self._set(title="Renamed")))
+
+    def test_other_change_does_not_touch_referrers(self):
+        self.assertFalse(self._referrer_touched(self._set(rating=2)))
+        self.assertFalse(self._referrer_touched(lambda product: product.save(update_fields=["rating"])))
+
+    def test_queryset_update_with_known_site_skips_site_lookup(self):
+        with self.assertNumQueries(2):  # UPDATE продуктов + версия кэша сайта
+            Product.objects.filter(pk=self.shown.pk).update(rating=3, site_ids=[self.site.id])
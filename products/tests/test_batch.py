@@ -0,0 +1,30 @@
+from django.test import TestCase, override_settings
+
+from products.tests.factories import make_product
+from products.utils.sites import default_site
+
+
+@override_settings(API_CACHE_TIMEOUT=0)
+class ProductBatchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.site = default_site()
+        cls.product = make_product(cls.site, title="Batch Game")
+
+    def _get(self, query):
+        return self.client.get(f"/api/products/batch/?{query}", HTTP_HOST=self.site.domain)
+
+    def test_ids_and_missing(self):
+        response = self._get(f"ids={self.product.id},{self.product.id + 1000}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.json()["results"]), [self.product.slug])
+        self.assertEqual(response.json()["missing"], [str(self.product.id + 1000)])
+
+    def test_id_out_of_range_is_400(self):
+        response = self._get("ids=99999999999999999999999")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("ids", response.json())
+
+    def test_non_ascii_digits_are_400(self):
+        response = self._get("ids=١٢")
+        self.assertEqual(response.status_code, 400)
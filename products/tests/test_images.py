@@ -0,0 +1,48 @@
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+
+from products.tests.factories import make_product
+from products.utils.images import delete_stored_file
+
+
+class DeleteStoredFileTests(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings = override_settings(MEDIA_ROOT=media.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def _file(self, name):
+        return default_storage.save(name, ContentFile(b"webp"))
+
+    def test_shared_screenshot_in_use_is_kept(self):
+        path = self._file("screenshots/shared/ab/abcdef.webp")
+        make_product(screenshots=[default_storage.url(path)])
+
+        delete_stored_file(path)
+        self.assertTrue(default_storage.exists(path))
+
+    def test_shared_logo_in_use_is_kept(self):
+        path = self._file("logos/shared/ab/abcdef.webp")
+        make_product(logo_file=path)
+
+        delete_stored_file(path)
+        self.assertTrue(default_storage.exists(path))
+
+    def test_unused_shared_file_is_deleted(self):
+        path = self._file("screenshots/shared/ab/abcdef.webp")
+        make_product(screenshots=[default_storage.url("screenshots/shared/cd/other.webp")])
+
+        delete_stored_file(path)
+        self.assertFalse(default_storage.exists(path))
+
+    def test_own_upload_is_deleted_without_lookup(self):
+        path = self._file("polls/2026/10/question.webp")
+
+        with self.assertNumQueries(0):
+            delete_stored_file(path)
+        self.assertFalse(default_storage.exists(path))
@@ -0,0 +1,74 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from products.models import Product
+from products.tests.factories import make_product
+from products.utils.sites import default_site
+
+
+@override_settings(API_CACHE_TIMEOUT=0)
+class CursorPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        site = default_site()
+        now = timezone.now()
+        cls.products = []
+        for i in range(7):
+            product = make_product(site, title=f"Game {i}")
+            cls.products.append(product)
+        # две пары с одинаковым created_at — порядок между ними решает id
+        for i, product in enumerate(cls.products):
+            Product.objects.filter(pk=product.pk).update(created_at=now - timedelta(minutes=i // 2))
+
+    def _walk(self, url):
+        titles, pages = [], []
+        while url:
+            data = self.client.get(url).json()
+            pages.append(data)
+            titles += [item["title"] for item in data["results"]]
+            url = data["next"]
+        return titles, pages
+
+    def _expected(self, *ordering):
+        return list(Product.objects.order_by(*ordering).values_list("title", flat=True))
+
+    def test_walks_every_row_once_in_order(self):
+        titles, pages = self._walk("/api/products/?pagination=cursor&page_size=3")
+        self.assertEqual(titles, self._expected("-created_at", "-id"))
+        self.assertEqual([len(page["results"]) for page in pages], [3, 3, 1])
+        self.assertNotIn("count", pages[0])
+        self.assertIsNone(pages[0]["previous"])
+
+    def test_ascending_ordering(self):
+        titles, _ = self._walk("/api/products/?pagination=cursor&page_size=2&ordering=title")
+        self.assertEqual(titles, self._expected("title", "id"))
+
+    def test_previous_link_returns_previous_page(self):
+        first = self.client.get("/api/products/?pagination=cursor&page_size=3").json()
+        second = self.client.get(first["next"]).json()
+        back = self.client.get(second["previous"]).json()
+        self.assertEqual(back["results"], first["results"])
+
+    def test_with_total(self):
+        data = self.client.get("/api/products/?pagination=cursor&with_total=1").json()
+        self.assertEqual(data["count"], 7)
+
+    def test_invalid_cursor_is_404(self):
+        response = self.client.get("/api/products/?cursor=not-a-cursor")
+        self.assertEqual(response.status_code, 404)
+
+    def test_cursor_with_ranked_search_is_400(self):
+        response = self.client.get("/api/products/?search=Game&pagination=cursor")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("pagination", response.json())
+
+    def test_cursor_with_search_and_explicit_ordering(self):
+        titles, _ = self._walk("/api/products/?search=Game&pagination=cursor&page_size=3&ordering=title")
+        self.assertEqual(titles, self._expected("title", "id"))
+
+    def test_page_pagination_keeps_search(self):
+        response = self.client.get("/api/products/?search=Game")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["count"], 7)
@@ -0,0 +1,62 @@
+from django.test import RequestFactory, TestCase, override_settings
+
+from products.api.querysets import QUERY_BUDGETS
+from products.api.views_api import ProductBatchAPIView, ProductDetailAPIView, ProductListAPIView
+from products.models import FAQ, Poll, PollOption
+from products.services import product_cards
+from products.tests.factories import make_product
+from products.utils.sites import default_site
+
+
+@override_settings(API_CACHE_TIMEOUT=0, ALLOWED_HOSTS=["*"])
+class QueryBudgetTests(TestCase):
+    """Число SQL-запросов эндпоинтов продуктов не превышает QUERY_BUDGETS."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.site = default_site()
+        cls.products = [make_product(cls.site, title=f"Budget Product {i}") for i in range(6)]
+        cls.main = cls.products[0]
+        for i in range(3):
+            FAQ.objects.create(product=cls.main, question=f"Q{i}", answer=f"A{i}")
+            poll = Poll.objects.create(product=cls.main, question=f"Poll {i}")
+            for j in range(3):
+                PollOption.objects.create(poll=poll, text=f"Option {j}")
+        for product in cls.products[1:]:
+            Poll.objects.create(product=product, question="Extra poll")
+        cls.main.best_products.set(cls.products[1:5])
+        # бюджет — на установившийся режим: FAQ/опросы сдвинули updated_at, карточки свежие
+        product_cards.rebuild([p.id for p in cls.products])
+
+    def setUp(self):
+        self.factory = RequestFactory(HTTP_HOST=self.site.domain)
+        default_site()  # карта сайтов прогрета — в бюджет не входит
+
+    def _assert_budget(self, name, view, path, **kwargs):
+        with self.assertNumQueries(QUERY_BUDGETS[name]):
+            response = view(self.factory.get(path), **kwargs)
+            if hasattr(response, "render"):
+                response.render()
+        self.assertEqual(response.status_code, 200)
+
+    def test_list(self):
+        self._assert_budget("list", ProductListAPIView.as_view(), "/api/products/")
+
+    def test_list_cursor(self):
+        self._assert_budget("list_cursor", ProductListAPIView.as_view(), "/api/products/?pagination=cursor")
+
+    def test_detail(self):
+        self._assert_budget(
+            "detail", ProductDetailAPIView.as_view(), f"/api/products/{self.main.slug}/", slug=self.main.slug,
+        )
+
+    def test_batch(self):
+        slugs = ",".join(p.slug for p in self.products)
+        self._assert_budget("batch", ProductBatchAPIView.as_view(), f"/api/products/batch/?slugs={slugs}")
+
+    def test_batch_polls_only(self):
+        # заголовок опроса берётся у родителя (polls_title) — без запроса на каждый продукт
+        slugs = ",".join(p.slug for p in self.products)
+        self._assert_budget(
+            "batch_polls", ProductBatchAPIView.as_view(), f"/api/products/batch/?slugs={slugs}&fields=polls",
+        )
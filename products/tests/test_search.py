@@ -0,0 +1,45 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from products.services import search
+from products.tests.factories import make_product
+from products.utils.sites import default_site
+
+
+@override_settings(API_CACHE_TIMEOUT=0)
+class SearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        site = default_site()
+        make_product(site, title="Dark Souls", review_headline="Hard as nails")
+        make_product(site, title="Stardew Valley", review_headline="A calm farm, far from dark dungeons")
+        make_product(site, title="Portal", review_headline="Puzzles", seo_description="not dark at all")
+        make_product(site, title="Doom", review_headline="Demons")
+
+    def _titles(self, query):
+        response = self.client.get("/api/products/", {"search": query})
+        self.assertEqual(response.status_code, 200)
+        return [item["title"] for item in response.json()["results"]]
+
+    def test_title_match_ranks_first(self):
+        titles = self._titles("dark")
+        self.assertEqual(set(titles), {"Dark Souls", "Stardew Valley", "Portal"})
+        if search.is_available(connection.alias):
+            # title > review_headline > seo-поля
+            self.assertEqual(titles, ["Dark Souls", "Stardew Valley", "Portal"])
+
+    def test_all_terms_required(self):
+        self.assertEqual(self._titles("dark souls"), ["Dark Souls"])
+
+    def test_explicit_ordering_overrides_rank(self):
+        response = self.client.get("/api/products/", {"search": "dark", "ordering": "title"})
+        self.assertEqual([item["title"] for item in response.json()["results"]], ["Dark Souls", "Portal", "Stardew Valley"])
+
+    def test_no_match(self):
+        self.assertEqual(self._titles("zelda"), [])
+
+    def test_update_reindexes(self):
+        product = make_product(default_site(), title="Untitled")
+        product.title = "Hollow Knight"
+        product.save()
+        self.assertEqual(self._titles("hollow"), ["Hollow Knight"])
@@ -0,0 +1,107 @@
+import threading
+from unittest import mock
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from products.models import SteamLock
+from products.services import steam_inflight
+from products.utils.db import DBThreadPoolExecutor
+
+
+class LockTableTests(TestCase):
+    def test_claim_hands_each_key_to_one_owner(self):
+        self.assertEqual(steam_inflight.claim(["a", "b"], "one"), {"a", "b"})
+        self.assertEqual(steam_inflight.claim(["b", "c"], "two"), {"c"})
+        self.assertFalse(steam_inflight.claim_one("a", "two"))
+        self.assertTrue(steam_inflight.is_locked("a"))
+
+    def test_release_frees_only_own_keys(self):
+        steam_inflight.claim(["a"], "one")
+        steam_inflight.release(["a"], "two")
+        self.assertTrue(steam_inflight.is_locked("a"))
+        steam_inflight.release(["a"], "one")
+        self.assertFalse(steam_inflight.is_locked("a"))
+        self.assertTrue(steam_inflight.claim_one("a", "two"))
+
+    def test_expired_lock_can_be_taken_over(self):
+        steam_inflight.claim(["a"], "one", seconds=-1)
+        self.assertFalse(steam_inflight.is_locked("a"))
+        self.assertTrue(steam_inflight.claim_one("a", "two"))
+
+    def test_coalesce_releases_its_db_lock(self):
+        self.assertEqual(steam_inflight.coalesce("k", lambda: "done", lambda: None), "done")
+        self.assertFalse(SteamLock.objects.filter(key="k").exists())
+
+
+@override_settings(STEAM_INFLIGHT_DB_LOCKS=False, STEAM_INFLIGHT_TTL=5)
+class CoalesceThreadsTests(TestCase):
+    def test_concurrent_callers_share_one_produce(self):
+        calls = 8
+        started = threading.Barrier(calls)
+        release = threading.Event()
+        produced = []
+        store = {}
+
+        def produce():
+            produced.append(threading.get_ident())
+            release.wait(5)
+            store["k"] = "value"
+            return "value"
+
+        def call(_):
+            started.wait(5)
+            return steam_inflight.coalesce("k", produce, lambda: store.get("k"))
+
+        with ThreadPoolExecutor(max_workers=calls) as pool:
+            futures = [pool.submit(call, i) for i in range(calls)]
+            while not produced:
+                threading.Event().wait(0.01)
+            release.set()
+            results = [f.result(5) for f in futures]
+
+        self.assertEqual(results, ["value"] * calls)
+        self.assertEqual(len(produced), 1)
+
+    def test_failed_leader_lets_a_waiter_produce(self):
+        store = {}
+        attempts = []
+
+        def produce():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError("boom")
+            store["k"] = "value"
+            return "value"
+
+        with self.assertRaises(RuntimeError):
+            steam_inflight.coalesce("k", produce, lambda: store.get("k"))
+        self.assertEqual(steam_inflight.coalesce("k", produce, lambda: store.get("k")), "value")
+        self.assertEqual(len(attempts), 2)
+
+
+class DBThreadPoolExecutorTests(TransactionTestCase):
+    def test_thread_connections_closed_once_at_shutdown(self):
+        seen = []
+
+        def query(_):
+            SteamLock.objects.exists()
+            wrapper = connections[DEFAULT_DB_ALIAS]
+            seen.append((threading.get_ident(), wrapper, id(wrapper.connection)))
+
+        backend = type(connections[DEFAULT_DB_ALIAS])
+        with mock.patch.object(backend, "close", autospec=True) as close:
+            with DBThreadPoolExecutor(max_workers=2) as pool:
+                list(pool.map(query, range(6)))
+                self.assertFalse(close.called)  # не после каждой задачи
+
+        # соединение потока живёт между задачами, а не открывается заново на каждую
+        raw_by_thread = {}
+        for ident, _, raw in seen:
+            raw_by_thread.setdefault(ident, set()).add(raw)
+        self.assertTrue(all(len(raws) == 1 for raws in raw_by_thread.values()))
+        # и закрывается один раз на поток — в shutdown
+        closed = [c.args[0] for c in close.call_args_list]
+        self.assertEqual(len(closed), len(raw_by_thread))
+        self.assertEqual({id(w) for w in closed}, {id(w) for _, w, _ in seen})
@@ -0,0 +1,98 @@
+from django.contrib.sites.models import Site
+from django.test import TestCase
+
+from products.models import BackgroundTask, Product
+from products.services.steam_transform import normalize_steam_game
+from products.services.steam_writer import SteamProductWriter, flush_sites
+from products.tests.factories import make_product
+from products.utils.sites import default_site
+
+
+def steam_record(steam_id, name, genre="Action", **extra):
+    game = {
+        "name": name,
+        "genres": [{"description": genre}],
+        "publishers": ["Publisher"],
+        "developers": ["Developer"],
+        "header_image": f"https://cdn.example/{steam_id}/header.jpg",
+        "screenshots": [{"path_full": f"https://cdn.example/{steam_id}/ss_{n}.jpg"} for n in range(2)],
+        "release_date": {"date": "Jan 1, 2020"},
+        **extra,
+    }
+    return normalize_steam_game(steam_id, game)
+
+
+class SteamProductWriterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.site = default_site()
+
+    def _flush(self, *records, site=None, force=False):
+        writer = SteamProductWriter(site or self.site, force=force)
+        for steam_id, record in records:
+            writer.add(steam_id, record)
+        return {result.steam_id: result for result in writer.flush()}
+
+    def test_inserts_new_products(self):
+        results = self._flush(("10", steam_record("10", "Alpha")), ("20", steam_record("20", "Beta", genre="RPG")))
+
+        self.assertTrue(all(r.changed and r.error is None for r in results.values()))
+        alpha = Product.objects.get(site=self.site, steam_id="10")
+        self.assertEqual((alpha.id, alpha.title, alpha.slug), (results["10"].product_id, "Alpha", "alpha"))
+        self.assertTrue(alpha.is_active)
+        self.assertEqual(alpha.category.name, "Action")
+        self.assertEqual(Product.objects.get(steam_id="20").category.name, "RPG")
+
+    def test_unchanged_payload_is_not_rewritten(self):
+        self._flush(("10", steam_record("10", "Alpha")))
+        updated_at = Product.objects.get(steam_id="10").updated_at
+
+        results = self._flush(("10", steam_record("10", "Alpha")))
+        self.assertFalse(results["10"].changed)
+        self.assertEqual(Product.objects.get(steam_id="10").updated_at, updated_at)
+
+        self.assertTrue(self._flush(("10", steam_record("10", "Alpha")), force=True)["10"].changed)
+
+    def test_changed_payload_updates_in_place(self):
+        first = self._flush(("10", steam_record("10", "Alpha")))["10"]
+        second = self._flush(("10", steam_record("10", "Alpha Remastered")))["10"]
+
+        self.assertTrue(second.changed)
+        self.assertEqual(second.product_id, first.product_id)
+        product = Product.objects.get(pk=first.product_id)
+        self.assertEqual((product.title, product.slug), ("Alpha Remastered", "alpha"))  # слаг не меняется
+        self.assertEqual(Product.objects.filter(steam_id="10").count(), 1)
+
+    def test_keeps_deactivated_products_inactive(self):
+        self._flush(("10", steam_record("10", "Alpha")))
+        Product.objects.filter(steam_id="10").update(is_active=False)
+
+        self.assertTrue(self._flush(("10", steam_record("10", "Alpha 2")))["10"].changed)
+        self.assertFalse(Product.objects.get(steam_id="10").is_active)
+
+    def test_slugs_are_unique_per_site(self):
+        other = Site.objects.create(domain="other.test", name="Other")
+        make_product(self.site, title="Taken", slug="alpha")
+
+        self._flush(("10", steam_record("10", "Alpha")), ("11", steam_record("11", "Alpha")))
+        self._flush(("10", steam_record("10", "Alpha")), site=other)
+
+        self.assertEqual(
+            sorted(Product.objects.filter(site=self.site, steam_id__isnull=False).values_list("slug", flat=True)),
+            ["alpha-2", "alpha-3"],
+        )
+        self.assertEqual(Product.objects.get(site=other, steam_id="10").slug, "alpha")
+
+    def test_enqueues_one_asset_task_per_flush(self):
+        other = Site.objects.create(domain="other.test", name="Other")
+        writers = [SteamProductWriter(self.site), SteamProductWriter(other)]
+        for writer in writers:
+            writer.add("10", steam_record("10", "Alpha"))
+            writer.add("20", steam_record("20", "Beta"))
+
+        results = flush_sites(writers)
+
+        self.assertEqual(sorted(len(r) for r in results.values()), [2, 2])
+        task = BackgroundTask.objects.get(name="convert_assets")
+        self.assertEqual(len(task.payload["items"]), 4)
+        self.assertEqual(task.payload["items"][0][2], ["https://cdn.example/10/ss_0.jpg", "https://cdn.example/10/ss_1.jpg"])
@@ -0,0 +1,125 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from products.models import BackgroundTask, ParseJob
+from products.services import progress, steam_parser, tasks
+
+CALLS = []
+
+
+def record_handler(payload):
+    CALLS.append((payload, tasks.current().attempts, tasks.is_last_attempt()))
+
+
+def failing_handler(payload):
+    raise RuntimeError("boom")
+
+
+TEST_HANDLERS = {
+    "record": "products.tests.test_tasks.record_handler",
+    "fail": "products.tests.test_tasks.failing_handler",
+}
+
+
+@override_settings(TASKS_RETRY_BACKOFF=30, TASKS_VISIBILITY_TIMEOUT=300)
+@mock.patch.dict(tasks.HANDLERS, TEST_HANDLERS)
+class TaskQueueTests(TestCase):
+    def setUp(self):
+        CALLS.clear()
+
+    def test_claim_hands_each_task_out_once(self):
+        first = tasks.enqueue("record", {"n": 1})
+        second = tasks.enqueue("record", {"n": 2})
+
+        claimed = tasks.claim("worker-a", limit=1)
+        self.assertEqual([t.pk for t in claimed], [first.pk])
+        self.assertEqual((claimed[0].status, claimed[0].attempts, claimed[0].locked_by),
+                         (BackgroundTask.STATUS_RUNNING, 1, "worker-a"))
+        self.assertEqual([t.pk for t in tasks.claim("worker-b", limit=5)], [second.pk])
+        self.assertEqual(tasks.claim("worker-c", limit=5), [])
+
+    def test_delayed_task_waits(self):
+        tasks.enqueue("record", delay=60)
+        self.assertEqual(tasks.claim("worker", limit=5), [])
+
+    def test_names_filter(self):
+        tasks.enqueue("fail")
+        wanted = tasks.enqueue("record")
+        self.assertEqual([t.pk for t in tasks.claim("worker", limit=5, names=["record"])], [wanted.pk])
+
+    def test_run_completes_and_exposes_current_task(self):
+        tasks.enqueue("record", {"n": 1}, max_attempts=3)
+        task, = tasks.claim("worker")
+
+        self.assertTrue(tasks.run(task))
+        self.assertEqual(CALLS, [({"n": 1}, 1, False)])
+        self.assertIsNone(tasks.current())
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.locked_until), (BackgroundTask.STATUS_DONE, None))
+
+    def test_failure_retries_with_backoff_then_fails(self):
+        tasks.enqueue("fail", max_attempts=2)
+
+        task, = tasks.claim("worker")
+        started = timezone.now()
+        self.assertFalse(tasks.run(task))
+        task.refresh_from_db()
+        self.assertEqual(task.status, BackgroundTask.STATUS_QUEUED)
+        self.assertIn("boom", task.last_error)
+        self.assertGreaterEqual(task.run_after, started + timedelta(seconds=29))
+
+        BackgroundTask.objects.filter(pk=task.pk).update(run_after=timezone.now())
+        task, = tasks.claim("worker")
+        self.assertEqual(task.attempts, 2)
+        self.assertFalse(tasks.run(task))
+        task.refresh_from_db()
+        self.assertEqual(task.status, BackgroundTask.STATUS_FAILED)
+        self.assertEqual(tasks.claim("worker"), [])
+
+    def test_abandoned_task_is_reclaimed_while_attempts_remain(self):
+        tasks.enqueue("record", max_attempts=2)
+        tasks.claim("dead-worker")
+        BackgroundTask.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+
+        task, = tasks.claim("worker")
+        self.assertEqual((task.locked_by, task.attempts), ("worker", 2))
+
+    def test_abandoned_task_without_attempts_is_failed(self):
+        tasks.enqueue("record", max_attempts=1)
+        tasks.claim("dead-worker")
+        BackgroundTask.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+
+        self.assertEqual(tasks.claim("worker"), [])
+        task = BackgroundTask.objects.get()
+        self.assertEqual(task.status, BackgroundTask.STATUS_FAILED)
+        self.assertTrue(task.last_error)
+
+
+class ParseTaskFailureTests(TestCase):
+    """Ошибка импорта доходит до очереди: повтор, а на последней попытке — задача failed."""
+
+    def _enqueue(self, max_attempts):
+        job_id = progress.new_job(total=1)
+        tasks.enqueue("steam_import", {"job_id": job_id, "parse_mode": "manual", "steam_ids": "10"},
+                      max_attempts=max_attempts)
+        return job_id
+
+    @mock.patch.object(steam_parser, "fetch_steam_ids_by_mode", side_effect=RuntimeError("steam down"))
+    def test_retry_then_failed(self, _fetch):
+        job_id = self._enqueue(max_attempts=2)
+
+        task, = tasks.claim("worker")
+        self.assertFalse(tasks.run(task))
+        task.refresh_from_db()
+        self.assertEqual(task.status, BackgroundTask.STATUS_QUEUED)
+        self.assertFalse(ParseJob.objects.get(pk=job_id).done)
+
+        BackgroundTask.objects.filter(pk=task.pk).update(run_after=timezone.now())
+        task, = tasks.claim("worker")
+        self.assertFalse(tasks.run(task))
+        job = ParseJob.objects.get(pk=job_id)
+        self.assertEqual((job.done, job.status), (True, ParseJob.STATUS_FAILED))
+        self.assertTrue(any("steam down" in text for text in progress.get(job_id)["items"]))
@@ -0,0 +1,35 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connections
+
+
+class DBThreadPoolExecutor(ThreadPoolExecutor):
+    """
+    ThreadPoolExecutor для задач, которые (иногда) ходят в БД: у каждого потока своё
+    соединение Django. Закрываем их один раз — в shutdown(), когда потоки отработали,
+    а не после каждой задачи (иначе на каждый вызов — новое подключение).
+    """
+
+    def __init__(self, *args, initializer=None, initargs=(), **kwargs):
+        self._connections = []
+        self._thread_initializer = (initializer, initargs)
+        super().__init__(*args, initializer=self._init_thread, **kwargs)
+
+    def _init_thread(self):
+        # обёртки соединений этого потока (само подключение — лениво, при первом запросе)
+        self._connections.extend(connections[alias] for alias in connections)
+        initializer, initargs = self._thread_initializer
+        if initializer:
+            initializer(*initargs)
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        super().shutdown(wait=wait, cancel_futures=cancel_futures)
+        if not wait:
+            return  # потоки ещё работают — их соединения закроет сборщик мусора
+        for connection in self._connections:
+            connection.inc_thread_sharing()  # поток завершён — закрываем его соединение отсюда
+            try:
+                connection.close()
+            finally:
+                connection.dec_thread_sharing()
+        self._connections.clear()
@@ -1,3 +1,4 @@
+import hashlib
 import os
 import re
 from io import BytesIO
@@ -72,8 +73,50 @@ def save_upload_as_webp(upload, base_dir: str = 'uploads') -> dict:
     return {"path": saved_path, "url": default_storage.url(saved_path)}
 
 
-def save_url_as_webp(url: str, base_dir: str = 'uploads', base_name: str | None = None, timeout: int = 8):
-    resp = requests.get(url, stream=True, timeout=timeout)
+def shared_webp_path(url: str, base_dir: str) -> str:
+    """
+    Путь webp по адресу источника: {base_dir}/shared/{ab}/{sha1}.webp.
+    Одна и та же картинка (напр. скриншот одной игры на разных сайтах)
+    конвертируется один раз и дальше только переиспользуется.
+    """
+    digest = hashlib.sha1(url.encode('utf-8')).hexdigest()
+    return os.path.join(base_dir, 'shared', digest[:2], f'{digest}.webp')
+
+
+def _is_shared_path(name: str) -> bool:
+    return '/shared/' in f"/{name.replace(os.sep, '/')}"
+
+
+def shared_file_in_use(name: str) -> bool:
+    """Ссылается ли ещё какой-нибудь продукт на файл — логотипом или скриншотом."""
+    from products.models import Product  # utils импортируются из моделей
+
+    return (
+        Product.objects.filter(logo_file=name).exists()
+        or Product.objects.filter(screenshots__icontains=default_storage.url(name)).exists()
+    )
+
+
+def delete_stored_file(name: str | None):
+    """
+    Удаляет файл из storage (ошибки игнорируются, как и раньше в местах очистки).
+    Общие webp импорта Steam ({base_dir}/shared/...) не трогаем, пока ими
+    пользуются продукты других сайтов.
+    """
+    if not name:
+        return
+    if _is_shared_path(name) and shared_file_in_use(name):
+        return
+    try:
+        default_storage.delete(name)
+    except Exception:
+        pass
+
+
+def save_url_as_webp(url: str, base_dir: str = 'uploads', base_name: str | None = None, timeout: int = 8,
+                     target_path: str | None = None, get=requests.get):
+    # get — чем качать: импорт из Steam передаёт свой клиент (сессия, лимиты, повторы)
+    resp = get(url, stream=True, timeout=timeout)
     resp.raise_for_status()
     content = resp.content
 
@@ -84,7 +127,7 @@ def save_url_as_webp(url: str, base_dir: str = 'uploads', base_name: str | None
     safe_base = _safe_base_from_name(base_name)
 
     webp_bytes = _ensure_webp_bytes(content)
-    target_path = _unique_target_path(base_dir, safe_base)
+    target_path = target_path or _unique_target_path(base_dir, safe_base)
 
     saved_path = default_storage.save(target_path, ContentFile(webp_bytes))
     return {"path": saved_path, "url": default_storage.url(saved_path)}
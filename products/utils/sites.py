@@ -1,11 +1,98 @@
+import threading
+import time
+from typing import NamedTuple
+
 from django.contrib.sites.models import Site
 from django.conf import settings
 
+from products.models import CacheVersion
+
+# Карта host → Site в памяти процесса. Сигналы Site (products/signals.py) сбрасывают
+# её локально и поднимают общую версию в БД (CacheVersion, не LocMem-кэш — он у
+# каждого процесса свой) — остальные процессы увидят её не позже чем через
+# SITE_CACHE_CHECK_INTERVAL секунд.
+VERSION_SCOPE = "sites"
+
+
+class _Snapshot(NamedTuple):
+    version: int
+    by_host: dict
+    by_id: dict
+    ordered: list
+
+
+_lock = threading.Lock()
+_snapshot: _Snapshot | None = None
+_checked_at = 0.0
+
+
+def _check_interval() -> float:
+    return float(getattr(settings, "SITE_CACHE_CHECK_INTERVAL", 5))
+
+
+def _shared_version() -> int:
+    return CacheVersion.current(VERSION_SCOPE)[VERSION_SCOPE]
+
+
+def _sites() -> _Snapshot:
+    global _snapshot, _checked_at
+    snapshot = _snapshot
+    now = time.monotonic()
+    if snapshot is not None and now - _checked_at < _check_interval():
+        return snapshot
+
+    version = _shared_version()
+    if snapshot is None or snapshot.version != version:
+        ordered = list(Site.objects.order_by("id"))
+        snapshot = _Snapshot(
+            version=version,
+            by_host={site.domain.lower().rstrip("/"): site for site in ordered},
+            by_id={site.id: site for site in ordered},
+            ordered=ordered,
+        )
+    with _lock:
+        _snapshot, _checked_at = snapshot, now
+    return snapshot
+
+
+def invalidate():
+    """Сбросить карту сайтов во всех процессах."""
+    global _snapshot
+    CacheVersion.bump(VERSION_SCOPE)
+    with _lock:
+        _snapshot = None
+
+
+def all_sites() -> list:
+    return list(_sites().ordered)
+
+
+def get_site_by_id(site_id):
+    if site_id is None or not str(site_id).isdigit():
+        return None
+    return _sites().by_id.get(int(site_id))
+
+
+def first_site():
+    sites = _sites()
+    return sites.ordered[0] if sites.ordered else None
+
+
+def default_site():
+    sites = _sites()
+    default_id = getattr(settings, "SITE_ID", None)
+    return sites.by_id.get(default_id) or (sites.ordered[0] if sites.ordered else None)
+
+
 def resolve_site_by_host(request):
-    host = request.get_host().split(':', 1)[0]  # без порта
-    site = Site.objects.filter(domain__iexact=host).first()
+    host = request.get_host().split(':', 1)[0].lower()  # без порта
+    site = _sites().by_host.get(host)
     if site:
         return site
     # запасной вариант — дефолтный SITE_ID (на всякий случай)
-    default_id = getattr(settings, "SITE_ID", None)
-    return Site.objects.filter(id=default_id).first() or Site.objects.first()
+    return default_site()
+
+
+def current_site(request):
+    """request.site из CurrentSiteMiddleware; без middleware — резолвим по host."""
+    return getattr(request, "site", None) or resolve_site_by_host(request)
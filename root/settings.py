@@ -79,6 +79,7 @@ MIDDLEWARE = [
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'products.middleware.CurrentSiteMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
@@ -157,3 +158,63 @@ MEDIA_ROOT = BASE_DIR / 'media'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Как часто (сек) процесс сверяет свою карту host → Site с общей версией в кэше
+SITE_CACHE_CHECK_INTERVAL = env.int('SITE_CACHE_CHECK_INTERVAL', default=5)
+
+# Кэш ответов API (products/services/api_cache.py), секунды; 0 — выключен
+API_CACHE_TIMEOUT = env.int('API_CACHE_TIMEOUT', default=60 * 10)
+# Сколько секунд процесс верит прочитанным версиям кэша API (CacheVersion) без запроса в БД:
+# изменения из других процессов (админка, run_tasks) видны в API с такой задержкой; 0 — каждый раз
+API_CACHE_VERSION_CHECK_INTERVAL = env.int('API_CACHE_VERSION_CHECK_INTERVAL', default=5)
+# TTL приблизительного total для keyset-пагинации (?with_total=1)
+API_APPROX_COUNT_TIMEOUT = env.int('API_APPROX_COUNT_TIMEOUT', default=60 * 5)
+# Конфигурация PostgreSQL full-text search для ?search= (products/services/search.py)
+PRODUCT_SEARCH_CONFIG = env('PRODUCT_SEARCH_CONFIG', default='simple')
+# Максимум продуктов в одном /api/products/batch/
+PRODUCT_BATCH_MAX_SIZE = env.int('PRODUCT_BATCH_MAX_SIZE', default=50)
+# Параллельные загрузки appdetails при импорте из Steam (запись в БД — в одном потоке)
+STEAM_IMPORT_WORKERS = env.int('STEAM_IMPORT_WORKERS', default=8)
+# HTTP к Steam (products/services/steam_client.py): запросов/сек и burst на хост *.steampowered.com,
+# повторы на 429/5xx, размер пула keep-alive соединений
+STEAM_RATE_LIMIT = env.float('STEAM_RATE_LIMIT', default=4)
+STEAM_RATE_BURST = env.int('STEAM_RATE_BURST', default=8)
+STEAM_HTTP_RETRIES = env.int('STEAM_HTTP_RETRIES', default=4)
+STEAM_HTTP_POOL_SIZE = env.int('STEAM_HTTP_POOL_SIZE', default=16)
+# Зеркало каталога Steam (manage.py sync_steam_catalog) и ключ Web API для инкрементальных обновлений
+STEAM_CATALOG_DIR = env('STEAM_CATALOG_DIR', default=str(BASE_DIR / 'var' / 'steam_catalog'))
+STEAM_WEB_API_KEY = env('STEAM_WEB_API_KEY', default='')
+# Через сколько дней перепроверять appid с плохим вердиктом (SteamAppVerdict)
+STEAM_VERDICT_RECHECK_DAYS = env.int('STEAM_VERDICT_RECHECK_DAYS', default=30)
+# Дисковый кэш ответов appdetails (manage.py steam_appdetails_cache): каталог, TTL (сек), только кэш без сети
+STEAM_APPDETAILS_CACHE_DIR = env('STEAM_APPDETAILS_CACHE_DIR', default=str(BASE_DIR / 'var' / 'steam_appdetails'))
+STEAM_APPDETAILS_TTL = env.int('STEAM_APPDETAILS_TTL', default=60 * 60 * 24 * 7)
+STEAM_APPDETAILS_OFFLINE = env.bool('STEAM_APPDETAILS_OFFLINE', default=False)
+# Сколько продуктов из Steam копить перед одной пакетной записью (steam_writer.SteamProductWriter)
+STEAM_IMPORT_BATCH_SIZE = env.int('STEAM_IMPORT_BATCH_SIZE', default=50)
+# Очередь фоновых задач (products/services/tasks.py, manage.py run_tasks): потоков на воркер,
+# опрос пустой очереди (сек), visibility timeout (сек), попыток и базовая задержка повтора (сек)
+TASKS_WORKER_CONCURRENCY = env.int('TASKS_WORKER_CONCURRENCY', default=4)
+TASKS_POLL_INTERVAL = env.float('TASKS_POLL_INTERVAL', default=2)
+TASKS_VISIBILITY_TIMEOUT = env.int('TASKS_VISIBILITY_TIMEOUT', default=300)
+TASKS_MAX_ATTEMPTS = env.int('TASKS_MAX_ATTEMPTS', default=5)
+TASKS_RETRY_BACKOFF = env.int('TASKS_RETRY_BACKOFF', default=30)
+# Прогресс импорта в БД (products/services/progress.py): сколько часов хранить задачи и сколько строк лога на задачу
+PARSE_JOB_RETENTION_HOURS = env.int('PARSE_JOB_RETENTION_HOURS', default=24)
+PARSE_JOB_MESSAGE_LIMIT = env.int('PARSE_JOB_MESSAGE_LIMIT', default=500)
+# SSE-поток прогресса импорта (иначе — короткий poll статуса). Каждое открытое окно держит
+# поток веб-воркера: включать только с gthread/async-воркерами gunicorn, не с sync из Procfile
+PARSE_EVENTS_ENABLED = env.bool('PARSE_EVENTS_ENABLED', default=False)
+# SSE: как часто проверять задачу (сек) и сколько держать одно соединение (сек)
+PARSE_EVENTS_INTERVAL = env.float('PARSE_EVENTS_INTERVAL', default=0.5)
+PARSE_EVENTS_MAX_SECONDS = env.int('PARSE_EVENTS_MAX_SECONDS', default=60)
+# Базовые URL Steam (витрина, Web API, CDN картинок) — для локальной подмены manage.py fake_steam_server;
+# пустой STEAM_CDN_BASE_URL — картинки качаются с исходных хостов
+STEAM_STORE_BASE_URL = env('STEAM_STORE_BASE_URL', default='https://store.steampowered.com')
+STEAM_WEB_API_BASE_URL = env('STEAM_WEB_API_BASE_URL', default='https://api.steampowered.com')
+STEAM_CDN_BASE_URL = env('STEAM_CDN_BASE_URL', default='')
+STEAM_FAKE_CORPUS_DIR = env('STEAM_FAKE_CORPUS_DIR', default=str(BASE_DIR / 'var' / 'steam_fake_corpus'))
+# Слияние одинаковой работы между импортами (products/services/steam_inflight.py): блокировки в таблице SteamLock
+# и сколько секунд держать блокировку appdetails (картинки — втрое дольше), пока её не сочтут брошенной
+STEAM_INFLIGHT_DB_LOCKS = env.bool('STEAM_INFLIGHT_DB_LOCKS', default=True)
+STEAM_INFLIGHT_TTL = env.int('STEAM_INFLIGHT_TTL', default=120)